@@ -11,6 +11,8 @@ from models.company_brief import (
     CompanyBriefResponse,
     CompanyBriefSummary,
 )
+from services.model_router import model_router, parse_ladder
+from services.response_cache import cache_key, company_brief_cache
 
 router = APIRouter()
 
@@ -19,6 +21,20 @@ COMPANY_BRIEF_MODEL = os.getenv("OPENAI_COMPANY_BRIEF_MODEL", "gpt-5-mini")
 COMPANY_BRIEF_MAX_OUTPUT_TOKENS_DEFAULT = 1600
 COMPANY_BRIEF_LIST_LIMIT_DEFAULT = 6
 
+COMPANY_BRIEF_SYSTEM_PROMPT = (
+    "You are a concise research assistant. Use web search to gather company context from "
+    "official sources (homepage, about, product, pricing, docs, newsroom) using the provided "
+    "company URL and user notes. Do not invent facts. If information is missing or uncertain, "
+    "place it in `unknowns`. Return ONLY valid JSON matching the required schema."
+)
+
+model_router.register(
+    "company_brief",
+    parse_ladder(
+        os.getenv("OPENAI_COMPANY_BRIEF_MODEL_LADDER"), [COMPANY_BRIEF_MODEL, "gpt-5"]
+    ),
+)
+
 
 def _get_int_env(name: str, default: int, *, min_value: int, max_value: int) -> int:
     raw = os.getenv(name)
@@ -122,19 +138,9 @@ async def create_company_brief(request: CompanyBriefRequest):
         max_value=4000,
     )
 
-    system_prompt = (
-        "You are a concise research assistant. Use web search to gather company context from "
-        "official sources (homepage, about, product, pricing, docs, newsroom) using the provided "
-        "company URL and user notes. Do not invent facts. If information is missing or uncertain, "
-        "place it in `unknowns`. Return ONLY valid JSON matching the required schema."
-    )
-
-    user_prompt = f"""Company URL: {company_url}
-
-User notes (optional):
-{notes or "None"}
-
-Return JSON with keys:
+    # Static instructions first, request inputs last, so the prompt prefix is
+    # identical across requests and upstream prefix caching can apply.
+    task_prompt = f"""Return JSON with keys:
 - one_liner (string)
 - products_services (string[], max {list_limit} items)
 - customers_users (string[], max {list_limit} items)
@@ -148,10 +154,38 @@ Style constraints:
 - Each list item should be a short phrase (prefer <= 12 words).
 """
 
+    inputs_prompt = f"""Company URL: {company_url}
+
+User notes (optional):
+{notes or "None"}
+"""
+
+    brief_key = cache_key(task_prompt, inputs_prompt)
+    cached = await company_brief_cache.get(brief_key)
+    if cached is not None:
+        return CompanyBriefResponse(
+            company_brief_summary=CompanyBriefSummary.model_validate(cached)
+        )
+
+    def _input(*suffix: str) -> list[dict[str, Any]]:
+        return [
+            {
+                "role": "system",
+                "content": [{"type": "input_text", "text": COMPANY_BRIEF_SYSTEM_PROMPT}],
+            },
+            {
+                "role": "user",
+                "content": [
+                    {"type": "input_text", "text": task_prompt},
+                    {"type": "input_text", "text": inputs_prompt},
+                    *({"type": "input_text", "text": text} for text in suffix),
+                ],
+            },
+        ]
+
     try:
         async with httpx.AsyncClient(timeout=60.0) as client:
             payload = {
-                "model": COMPANY_BRIEF_MODEL,
                 "tools": [{"type": "web_search"}],
                 "tool_choice": "auto",
                 "reasoning": {"effort": "low"},
@@ -195,27 +229,22 @@ Style constraints:
                         },
                     }
                 },
-                "input": [
-                    {
-                        "role": "system",
-                        "content": [{"type": "input_text", "text": system_prompt}],
-                    },
-                    {
-                        "role": "user",
-                        "content": [{"type": "input_text", "text": user_prompt}],
-                    },
-                ],
+                "input": _input(),
+                "prompt_cache_key": "company-brief",
                 "max_output_tokens": max_output_tokens,
                 "store": False,
             }
 
-            response = await client.post(
-                OPENAI_RESPONSES_URL,
+            response, model = await model_router.post(
+                client,
+                "company_brief",
+                model_router.candidates("company_brief"),
+                url=OPENAI_RESPONSES_URL,
                 headers={
                     "Authorization": f"Bearer {openai_api_key}",
                     "Content-Type": "application/json",
                 },
-                json=payload,
+                payload=payload,
             )
 
             if response.status_code != 200:
@@ -233,27 +262,25 @@ Style constraints:
                 if reason == "max_output_tokens":
                     retry_limit = max(2, min(4, list_limit - 2))
                     retry_max_output_tokens = min(4000, max_output_tokens * 2)
-                    retry_user_prompt = user_prompt.replace(
-                        f"max {list_limit} items", f"max {retry_limit} items"
-                    ) + "\nIf you are at risk of running out of tokens, shorten list items further."
+                    retry_hint = (
+                        f"Override: return at most {retry_limit} items per list. "
+                        "If you are at risk of running out of tokens, shorten list items further."
+                    )
 
                     retry_payload = dict(payload)
                     retry_payload["max_output_tokens"] = retry_max_output_tokens
-                    retry_payload["input"] = [
-                        payload["input"][0],
-                        {
-                            "role": "user",
-                            "content": [{"type": "input_text", "text": retry_user_prompt}],
-                        },
-                    ]
+                    retry_payload["input"] = _input(retry_hint)
 
-                    retry_response = await client.post(
-                        OPENAI_RESPONSES_URL,
+                    retry_response, _ = await model_router.post(
+                        client,
+                        "company_brief",
+                        [model],
+                        url=OPENAI_RESPONSES_URL,
                         headers={
                             "Authorization": f"Bearer {openai_api_key}",
                             "Content-Type": "application/json",
                         },
-                        json=retry_payload,
+                        payload=retry_payload,
                     )
 
                     if retry_response.status_code != 200:
@@ -286,6 +313,7 @@ Style constraints:
                 )
             summary = coerce_summary(summary_data)
             summary.generated_at = datetime.now(timezone.utc).isoformat()
+            await company_brief_cache.set(brief_key, summary.model_dump())
 
             return CompanyBriefResponse(company_brief_summary=summary)
     except (KeyError, json.JSONDecodeError) as exc:
@@ -1,12 +1,19 @@
 import json
 import os
+import time
 from typing import Any
 
 import httpx
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
 
-from prompts.face_nudge import PHRASE_SYSTEM_PROMPT, VERIFY_SYSTEM_PROMPT
+from prompts.face_nudge import (
+    FACE_NUDGE_INPUT_GUIDE,
+    PHRASE_SYSTEM_PROMPT,
+    VERIFY_SYSTEM_PROMPT,
+)
+from services.latency_slo import DegradationLevel, LatencySLOController
+from services.model_router import model_router, parse_ladder
 
 router = APIRouter()
 
@@ -15,6 +22,70 @@ PHRASE_MODEL = os.getenv("OPENAI_FACE_PHRASE_MODEL", "gpt-4o-mini")
 VERIFY_MODEL = os.getenv("OPENAI_FACE_VERIFY_MODEL", PHRASE_MODEL)
 DEFAULT_COOLDOWN_MS = int(os.getenv("FACE_NUDGE_DEFAULT_COOLDOWN_MS", "12000"))
 
+# Latency-SLO degradation: NORMAL -> FAST_MODEL -> FALLBACK_ONLY (no upstream call).
+PHRASE_FAST_MODEL = os.getenv("OPENAI_FACE_PHRASE_FAST_MODEL", "gpt-4.1-nano")
+VERIFY_FAST_MODEL = os.getenv("OPENAI_FACE_VERIFY_FAST_MODEL", PHRASE_FAST_MODEL)
+LATENCY_SLO_MS = float(os.getenv("FACE_NUDGE_LATENCY_SLO_MS", "2500"))
+LATENCY_WINDOW = int(os.getenv("FACE_NUDGE_LATENCY_WINDOW", "50"))
+LATENCY_MIN_SAMPLES = int(os.getenv("FACE_NUDGE_LATENCY_MIN_SAMPLES", "10"))
+LATENCY_RECOVERY_RATIO = float(os.getenv("FACE_NUDGE_LATENCY_RECOVERY_RATIO", "0.7"))
+PROBE_INTERVAL_MS = int(os.getenv("FACE_NUDGE_PROBE_INTERVAL_MS", "15000"))
+
+# Model ladders (smallest first). Strong local signals start at the smallest model.
+STRONG_SIGNAL_THRESHOLD = float(os.getenv("FACE_NUDGE_STRONG_SIGNAL_THRESHOLD", "0.8"))
+model_router.register(
+    "face_phrase",
+    parse_ladder(
+        os.getenv("OPENAI_FACE_PHRASE_MODEL_LADDER"), [PHRASE_FAST_MODEL, PHRASE_MODEL]
+    ),
+    latency_target_ms=LATENCY_SLO_MS,
+)
+model_router.register(
+    "face_verify",
+    parse_ladder(
+        os.getenv("OPENAI_FACE_VERIFY_MODEL_LADDER"), [VERIFY_FAST_MODEL, VERIFY_MODEL]
+    ),
+    latency_target_ms=LATENCY_SLO_MS,
+)
+
+
+def _slo_controller(name: str) -> LatencySLOController:
+    return LatencySLOController(
+        name,
+        slo_ms=LATENCY_SLO_MS,
+        window_size=LATENCY_WINDOW,
+        min_samples=LATENCY_MIN_SAMPLES,
+        recovery_ratio=LATENCY_RECOVERY_RATIO,
+        probe_interval_s=PROBE_INTERVAL_MS / 1000,
+    )
+
+
+phrase_slo = _slo_controller("phrase")
+verify_slo = _slo_controller("verify")
+
+PHRASE_RESPONSE_SCHEMA: dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "abstain": {"type": "boolean"},
+        "text": {"type": "string"},
+        "cooldown_ms": {"type": "integer", "minimum": 0},
+    },
+    "required": ["abstain", "text"],
+    "additionalProperties": False,
+}
+
+VERIFY_RESPONSE_SCHEMA: dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "verified": {"type": "boolean"},
+        "abstain": {"type": "boolean"},
+        "text": {"type": "string"},
+        "cooldown_ms": {"type": "integer", "minimum": 0},
+    },
+    "required": ["verified", "abstain", "text"],
+    "additionalProperties": False,
+}
+
 
 class FaceNudgeContext(BaseModel):
     scenario_id: str | None = None
@@ -65,6 +136,20 @@ class FaceNudgeVerifyResponse(BaseModel):
     cooldown_ms: int | None = None
 
 
+class FaceNudgeDegradationStatus(BaseModel):
+    level: int
+    level_name: str
+    models: list[str] | None
+    p95_ms: float | None = None
+    samples: int
+    slo_ms: float
+
+
+class FaceNudgeStatusResponse(BaseModel):
+    phrase: FaceNudgeDegradationStatus
+    verify: FaceNudgeDegradationStatus
+
+
 def _clamp_phrase(text: str, max_words: int = 10, max_chars: int = 80) -> str:
     cleaned = " ".join((text or "").strip().split())
     if not cleaned:
@@ -105,11 +190,13 @@ def _extract_json_payload(data: dict[str, Any]) -> dict[str, Any] | None:
 
 
 async def _call_responses_api(
-    model: str,
+    route: str,
+    models: list[str],
     system_prompt: str,
     user_payload: dict[str, Any],
     response_schema: dict[str, Any],
     image: FaceNudgeImage | None = None,
+    slo: LatencySLOController | None = None,
 ) -> dict[str, Any]:
     openai_api_key = os.getenv("OPENAI_API_KEY")
     if not openai_api_key:
@@ -118,15 +205,17 @@ async def _call_responses_api(
             detail="OpenAI API key not configured. Set OPENAI_API_KEY environment variable.",
         )
 
+    # Static prefix (system prompt, input guide, schema) first; the per-request
+    # payload and image go last so upstream prefix caching can reuse the rest.
     user_content: list[dict[str, Any]] = [
-        {"type": "input_text", "text": json.dumps(user_payload)}
+        {"type": "input_text", "text": FACE_NUDGE_INPUT_GUIDE},
+        {"type": "input_text", "text": json.dumps(user_payload, separators=(",", ":"))},
     ]
     if image:
         data_url = f"data:{image.mime_type};base64,{image.base64}"
         user_content.append({"type": "input_image", "image_url": data_url})
 
     payload = {
-        "model": model,
         "input": [
             {
                 "role": "system",
@@ -143,19 +232,35 @@ async def _call_responses_api(
         },
         "temperature": 0.3,
         "max_output_tokens": 120,
+        "prompt_cache_key": route,
         "store": False,
     }
 
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            OPENAI_RESPONSES_URL,
-            headers={
-                "Authorization": f"Bearer {openai_api_key}",
-                "Content-Type": "application/json",
-            },
-            json=payload,
-            timeout=20.0,
+    # Only the upstream round trip feeds the SLO window; local failures such
+    # as a missing key would otherwise add near-zero samples and mask breaches.
+    started = time.perf_counter()
+    try:
+        async with httpx.AsyncClient() as client:
+            response, _ = await model_router.post(
+                client,
+                route,
+                models,
+                url=OPENAI_RESPONSES_URL,
+                headers={
+                    "Authorization": f"Bearer {openai_api_key}",
+                    "Content-Type": "application/json",
+                },
+                payload=payload,
+                timeout=20.0,
+            )
+    except httpx.RequestError as exc:
+        raise HTTPException(
+            status_code=503,
+            detail=f"Failed to connect to OpenAI API: {str(exc)}",
         )
+    finally:
+        if slo is not None:
+            slo.record((time.perf_counter() - started) * 1000)
 
     if response.status_code != 200:
         raise HTTPException(
@@ -173,31 +278,63 @@ async def _call_responses_api(
     return parsed
 
 
+def _signal_tier(signals: FaceNudgeSignals | None) -> int:
+    """Tier 0 (smallest model) when every reported signal is strong."""
+    values = [v for v in (signals.model_dump().values() if signals else []) if v is not None]
+    if values and min(values) >= STRONG_SIGNAL_THRESHOLD:
+        return 0
+    return 1
+
+
+def _models_for_level(level: DegradationLevel, route: str, tier: int) -> list[str] | None:
+    if level is DegradationLevel.FALLBACK_ONLY:
+        return None
+    if level is DegradationLevel.FAST_MODEL:
+        tier = 0
+    return model_router.candidates(route, tier)
+
+
+@router.get("/nudge/status", response_model=FaceNudgeStatusResponse)
+async def face_nudge_status():
+    """Current latency-driven degradation level of the face nudge endpoints."""
+    return FaceNudgeStatusResponse(
+        phrase=FaceNudgeDegradationStatus(
+            **phrase_slo.snapshot(),
+            models=_models_for_level(phrase_slo.level, "face_phrase", 1),
+        ),
+        verify=FaceNudgeDegradationStatus(
+            **verify_slo.snapshot(),
+            models=_models_for_level(verify_slo.level, "face_verify", 1),
+        ),
+    )
+
+
 @router.post("/nudge/phrase", response_model=FaceNudgePhraseResponse)
 async def phrase_face_nudge(request: FaceNudgePhraseRequest):
-    response_schema = {
-        "type": "object",
-        "properties": {
-            "abstain": {"type": "boolean"},
-            "text": {"type": "string"},
-            "cooldown_ms": {"type": "integer", "minimum": 0},
-        },
-        "required": ["abstain", "text"],
-        "additionalProperties": False,
-    }
+    models = _models_for_level(
+        phrase_slo.plan(), "face_phrase", _signal_tier(request.signals)
+    )
+    if models is None:
+        return FaceNudgePhraseResponse(
+            abstain=False,
+            text=_clamp_phrase(request.fallback_text),
+            cooldown_ms=DEFAULT_COOLDOWN_MS,
+        )
 
     parsed = await _call_responses_api(
-        model=PHRASE_MODEL,
+        "face_phrase",
+        models,
+        slo=phrase_slo,
         system_prompt=PHRASE_SYSTEM_PROMPT,
         user_payload={
-            "t_ms": request.t_ms,
             "reason": request.reason,
             "severity": request.severity,
-            "fallback_text": request.fallback_text,
             "context": request.context.model_dump() if request.context else None,
             "signals": request.signals.model_dump() if request.signals else None,
+            "fallback_text": request.fallback_text,
+            "t_ms": request.t_ms,
         },
-        response_schema=response_schema,
+        response_schema=PHRASE_RESPONSE_SCHEMA,
     )
 
     abstain = bool(parsed.get("abstain", False))
@@ -218,29 +355,31 @@ async def phrase_face_nudge(request: FaceNudgePhraseRequest):
 
 @router.post("/nudge/verify", response_model=FaceNudgeVerifyResponse)
 async def verify_face_nudge(request: FaceNudgeVerifyRequest):
-    response_schema = {
-        "type": "object",
-        "properties": {
-            "verified": {"type": "boolean"},
-            "abstain": {"type": "boolean"},
-            "text": {"type": "string"},
-            "cooldown_ms": {"type": "integer", "minimum": 0},
-        },
-        "required": ["verified", "abstain", "text"],
-        "additionalProperties": False,
-    }
+    models = _models_for_level(
+        verify_slo.plan(), "face_verify", _signal_tier(request.signals)
+    )
+    if models is None:
+        # The nudge was already triggered locally; without a verifier, trust it.
+        return FaceNudgeVerifyResponse(
+            verified=True,
+            abstain=False,
+            text=_clamp_phrase(request.fallback_text),
+            cooldown_ms=DEFAULT_COOLDOWN_MS,
+        )
 
     parsed = await _call_responses_api(
-        model=VERIFY_MODEL,
+        "face_verify",
+        models,
+        slo=verify_slo,
         system_prompt=VERIFY_SYSTEM_PROMPT,
         user_payload={
-            "t_ms": request.t_ms,
             "reason": request.reason,
             "severity": request.severity,
-            "fallback_text": request.fallback_text,
             "signals": request.signals.model_dump() if request.signals else None,
+            "fallback_text": request.fallback_text,
+            "t_ms": request.t_ms,
         },
-        response_schema=response_schema,
+        response_schema=VERIFY_RESPONSE_SCHEMA,
         image=request.image,
     )
 
@@ -0,0 +1,81 @@
+from fastapi import APIRouter
+
+from api.realtime import token_pool
+from api.sessions import transcription_jobs
+from prompts.instructions_builder import instructions_cache_info
+from services.audio_processing import normalization_summary
+from services.live_sessions import live_sessions
+from services.model_router import model_router
+from services.response_cache import company_brief_cache, scenario_cache, transcription_cache
+from services.resumable_uploads import resumable_uploads
+from services.session_store import session_store
+from services.transcription_engine import transcription_engine
+
+router = APIRouter()
+
+
+@router.get("/routing")
+async def routing_metrics():
+    """Per-route, per-model latency, error and cost stats for Responses calls."""
+    return model_router.snapshot()
+
+
+@router.get("/instructions")
+async def instructions_metrics():
+    """Hit/miss counters for the realtime instructions cache."""
+    return instructions_cache_info()
+
+
+@router.get("/token_pool")
+async def token_pool_metrics():
+    """Pre-minted realtime token pool hit rate and waste."""
+    return token_pool.stats()
+
+
+@router.get("/session_store")
+async def session_store_metrics():
+    """Session store entry count, estimated bytes and evictions."""
+    return await session_store.stats()
+
+
+@router.get("/transcript_index")
+async def transcript_index_metrics():
+    """Sessions and terms in the transcript search index, re-index and query counts."""
+    return session_store.transcript_index.stats()
+
+
+@router.get("/response_cache")
+async def response_cache_metrics():
+    """Hit rates for the company brief, scenario and transcription caches."""
+    caches = (company_brief_cache, scenario_cache, transcription_cache)
+    return {cache.name: cache.stats() for cache in caches}
+
+
+@router.get("/transcription_jobs")
+async def transcription_jobs_metrics():
+    """Transcription queue depth, worker utilization and wait/run times."""
+    return transcription_jobs.stats()
+
+
+@router.get("/audio_normalization")
+async def audio_normalization_metrics():
+    """Bytes and seconds of audio saved by pre-transcription normalization."""
+    return normalization_summary()
+
+
+@router.get("/uploads")
+async def upload_metrics():
+    """Resumable uploads in progress, buffered bytes and retried (duplicate) bytes."""
+    return resumable_uploads.stats()
+
+
+@router.get("/transcription_models")
+async def transcription_model_metrics():
+    """Per-model transcription calls, timeouts, speed and word-timing availability."""
+    return transcription_engine.stats()
+
+
+@router.get("/live_sessions")
+async def live_session_metrics():
+    """Live sessions being ingested, batches applied and resent duplicates."""
+    return live_sessions.stats()
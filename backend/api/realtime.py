@@ -1,20 +1,42 @@
+import logging
 import os
+from typing import Hashable
+
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 import httpx
 
+from prompts.instructions_builder import (
+    BudgetedInstructions,
+    budgeted_instructions_cached,
+    instructions_cache_key,
+)
+from prompts.nudge_tools import NUDGE_TOOL
+from prompts.scenario_library import JOURNALIST_SCENARIOS
+from services.token_pool import PooledToken, TokenPool
+
 router = APIRouter()
+logger = logging.getLogger("kawkai")
 
 OPENAI_REALTIME_URL = "https://api.openai.com/v1/realtime/sessions"
 REALTIME_MODEL = os.getenv("OPENAI_REALTIME_MODEL", "gpt-4o-realtime-preview-2024-12-17")
 TRANSCRIPTION_MODEL = os.getenv("OPENAI_TRANSCRIPTION_MODEL", "gpt-4o-mini-transcribe")
 
+TOKEN_POOL_ENABLED = os.getenv("REALTIME_TOKEN_POOL_ENABLED", "").lower() in ("1", "true", "yes")
+TOKEN_POOL_SIZE = int(os.getenv("REALTIME_TOKEN_POOL_SIZE", "1"))
+TOKEN_POOL_MIN_TTL_S = float(os.getenv("REALTIME_TOKEN_POOL_MIN_TTL_S", "20"))
+TOKEN_POOL_REFILL_INTERVAL_S = float(os.getenv("REALTIME_TOKEN_POOL_REFILL_INTERVAL_S", "5"))
+# Comma-separated built-in scenario ids to pool ("default" = no scenario); "*" = all.
+TOKEN_POOL_SCENARIOS = os.getenv("REALTIME_TOKEN_POOL_SCENARIOS", "*")
+
 
 class TokenResponse(BaseModel):
     """Response model for ephemeral token endpoint."""
     client_secret: str
     expires_at: int
     model: str
+    instructions_tokens: int | None = None
+    instructions_tokens_before_trim: int | None = None
 
 
 class TokenRequest(BaseModel):
@@ -29,23 +51,31 @@ class TokenRequest(BaseModel):
     company_brief_summary: dict | None = None
 
 
-@router.post("/token", response_model=TokenResponse)
-async def create_ephemeral_token(request: TokenRequest = TokenRequest()):
-    """
-    Generate an ephemeral token for client-side WebRTC connection.
-    The token expires in 60 seconds.
-    """
-    from prompts.instructions_builder import build_instructions
-    from prompts.nudge_tools import NUDGE_TOOL
-
-    openai_api_key = os.getenv("OPENAI_API_KEY")
-    if not openai_api_key:
-        raise HTTPException(
-            status_code=500,
-            detail="OpenAI API key not configured. Set OPENAI_API_KEY environment variable."
+def _budgeted_instructions(request: TokenRequest) -> BudgetedInstructions:
+    instructions = budgeted_instructions_cached(
+        mode=request.mode,
+        scenario_id=request.scenario_id,
+        counterparty=request.counterparty,
+        situation=request.situation,
+        company_url=request.company_url,
+        company_notes=request.company_notes,
+        company_brief_summary=request.company_brief_summary,
+        scenario_override=request.scenario,
+    )
+    if instructions.trimmed:
+        logger.info(
+            "Realtime instructions %s trimmed %d -> %d tokens (budget %d): %s",
+            instructions.fingerprint[:12],
+            instructions.tokens_before,
+            instructions.tokens_after,
+            instructions.budget,
+            ", ".join(instructions.trimmed),
         )
+    return instructions
 
-    system_prompt = build_instructions(
+
+def _instructions_key(request: TokenRequest) -> tuple:
+    return instructions_cache_key(
         mode=request.mode,
         scenario_id=request.scenario_id,
         counterparty=request.counterparty,
@@ -55,6 +85,17 @@ async def create_ephemeral_token(request: TokenRequest = TokenRequest()):
         company_brief_summary=request.company_brief_summary,
         scenario_override=request.scenario,
     )
+
+
+async def _mint_token(request: TokenRequest) -> TokenResponse:
+    openai_api_key = os.getenv("OPENAI_API_KEY")
+    if not openai_api_key:
+        raise HTTPException(
+            status_code=500,
+            detail="OpenAI API key not configured. Set OPENAI_API_KEY environment variable."
+        )
+
+    instructions = _budgeted_instructions(request)
     tools = [NUDGE_TOOL] if request.mode == "coach" else []
 
     try:
@@ -68,7 +109,7 @@ async def create_ephemeral_token(request: TokenRequest = TokenRequest()):
                 json={
                     "model": REALTIME_MODEL,
                     "voice": "alloy",
-                    "instructions": system_prompt,
+                    "instructions": instructions.text,
                     "tools": tools,
                     "input_audio_transcription": {
                         "model": TRANSCRIPTION_MODEL,
@@ -94,9 +135,74 @@ async def create_ephemeral_token(request: TokenRequest = TokenRequest()):
                 client_secret=data["client_secret"]["value"],
                 expires_at=data["client_secret"]["expires_at"],
                 model=REALTIME_MODEL,
+                instructions_tokens=instructions.tokens_after,
+                instructions_tokens_before_trim=instructions.tokens_before,
             )
     except httpx.RequestError as e:
         raise HTTPException(
             status_code=503,
             detail=f"Failed to connect to OpenAI API: {str(e)}"
         )
+
+
+def _pool_configurations() -> dict[Hashable, TokenRequest]:
+    """Common configurations: built-in scenarios x mode, default counterparty/situation."""
+    if TOKEN_POOL_SCENARIOS.strip() == "*":
+        scenario_ids = [None, *JOURNALIST_SCENARIOS]
+    else:
+        scenario_ids = [
+            None if s.strip() == "default" else s.strip()
+            for s in TOKEN_POOL_SCENARIOS.split(",")
+            if s.strip() == "default" or s.strip() in JOURNALIST_SCENARIOS
+        ]
+    configurations: dict[Hashable, TokenRequest] = {}
+    for mode in ("coach", "journalist"):
+        for scenario_id in scenario_ids:
+            request = TokenRequest(mode=mode, scenario_id=scenario_id)
+            configurations[_instructions_key(request)] = request
+    return configurations
+
+
+_pool_configs = _pool_configurations()
+
+
+async def _mint_pooled(key: Hashable) -> PooledToken:
+    token = await _mint_token(_pool_configs[key])
+    return PooledToken(
+        client_secret=token.client_secret,
+        expires_at=token.expires_at,
+        model=token.model,
+    )
+
+
+token_pool = TokenPool(
+    _mint_pooled,
+    list(_pool_configs) if TOKEN_POOL_ENABLED else [],
+    size_per_key=TOKEN_POOL_SIZE,
+    min_ttl_s=TOKEN_POOL_MIN_TTL_S,
+    refill_interval_s=TOKEN_POOL_REFILL_INTERVAL_S,
+)
+
+
+@router.post("/token", response_model=TokenResponse)
+async def create_ephemeral_token(request: TokenRequest = TokenRequest()):
+    """
+    Generate an ephemeral token for client-side WebRTC connection.
+    The token expires in 60 seconds. Common configurations are served from a
+    pre-minted pool when REALTIME_TOKEN_POOL_ENABLED is set.
+    """
+    pooled = (
+        token_pool.take(_instructions_key(request))
+        if request.mode in ("coach", "journalist")
+        else None
+    )
+    if pooled is not None:
+        instructions = _budgeted_instructions(request)
+        return TokenResponse(
+            client_secret=pooled.client_secret,
+            expires_at=pooled.expires_at,
+            model=pooled.model,
+            instructions_tokens=instructions.tokens_after,
+            instructions_tokens_before_trim=instructions.tokens_before,
+        )
+    return await _mint_token(request)
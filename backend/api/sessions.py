@@ -1,15 +1,62 @@
+import asyncio
+import base64
+import hashlib
+import json
+import logging
 import os
-import tempfile
+import re
+import time
 from pathlib import Path
 
-from fastapi import APIRouter, HTTPException, UploadFile, File, Form
-from pydantic import BaseModel
+from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Query, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel, Field
 
-from models.session import Session, SessionMetadata, AnalysisStatus
+from models.metric_series import METRICS, MetricSeries
+from models.session import (
+    AnalysisResult,
+    AnalysisStatus,
+    NudgeEvent,
+    Session,
+    SessionMetadata,
+    TranscriptSegment,
+)
+from models.word_timings import WordColumns
+from services.audio_spool import AudioSpool, UploadTooLarge
+from services.delivery_metrics import analyze_delivery
+from services.downsampling import downsample_series
+from prompts.scenario_library import get_journalist_scenario
+from services.live_sessions import LiveBatchOutOfOrder, TooManyLiveSessions, live_sessions
+from services.phrase_matcher import match_phrases
+from services.resumable_uploads import (
+    UPLOAD_CHUNK_MAX_BYTES,
+    ResumableUpload,
+    TooManyUploads,
+    UploadOffsetMismatch,
+    UploadRejected,
+    resumable_uploads,
+)
+from services.session_analysis import analyze_transcript, build_exchanges
+from services.session_index import WORD_FIELDS, query_range, session_indexes
 from services.session_store import session_store
-from services.transcription import transcribe_audio
+from services.transcription import (
+    TranscriptionResult,
+    cache_transcription,
+    cached_transcription,
+    transcribe_audio,
+)
+from services.transcription_jobs import TranscriptionJob, TranscriptionJobQueue
 
 router = APIRouter()
+logger = logging.getLogger("kawkai")
+
+TRANSCRIPTION_WORKERS = int(os.getenv("KAWKAI_TRANSCRIPTION_WORKERS", "2"))
+TRANSCRIPTION_QUEUE_SIZE = int(os.getenv("KAWKAI_TRANSCRIPTION_QUEUE_SIZE", "32"))
+# SSE streams wake immediately for jobs run by this instance; polling the
+# store covers jobs running elsewhere when the session backend is shared.
+SESSION_EVENTS_POLL_S = 2.0
+SESSION_EVENTS_HEARTBEAT_S = 15.0
+TERMINAL_STATUSES = (AnalysisStatus.COMPLETE, AnalysisStatus.ERROR)
 
 
 class UploadSessionResponse(BaseModel):
@@ -19,87 +66,732 @@ class UploadSessionResponse(BaseModel):
     word_timings: list[dict] | None = None
 
 
-@router.post("", response_model=UploadSessionResponse)
+def _word_timings_payload(session: Session) -> list[dict] | None:
+    # Sessions keep word timings column-wise; dicts exist only in responses.
+    if session.word_timings is None:
+        return None
+    return session.word_timings.to_dicts()
+
+
+def _upload_response(session: Session) -> UploadSessionResponse:
+    return UploadSessionResponse(
+        session_id=session.id,
+        status=session.status.value,
+        transcript_text=session.transcript_text,
+        word_timings=_word_timings_payload(session),
+    )
+
+
+async def _update(session_id: str, **fields) -> Session | None:
+    session = await session_store.update(session_id, **fields)
+    transcription_jobs.notify(session_id)
+    return session
+
+
+def _keep_audio() -> bool:
+    return os.getenv("KAWKAI_KEEP_SESSION_AUDIO", "").lower() in ("1", "true", "yes")
+
+
+def _completed_fields(result: TranscriptionResult) -> dict:
+    return {
+        "transcript_text": result.text,
+        "word_timings": WordColumns.from_dicts(result.words),
+        "status": AnalysisStatus.COMPLETE,
+    }
+
+
+async def _transcribe_session(session_id: str, audio: AudioSpool) -> Session | None:
+    """
+    Transcribe a stored session's audio and record each status transition.
+    Only the transcription fields are written, so an analysis running
+    meanwhile keeps its own status.
+    """
+    await _update(session_id, status=AnalysisStatus.PROCESSING)
+    try:
+        result = await transcribe_audio(audio)
+        await cache_transcription(audio, result)
+        return await _update(session_id, **_completed_fields(result))
+    except Exception as e:
+        await _update(session_id, status=AnalysisStatus.ERROR, error=str(e))
+        raise
+
+
+async def _run_transcription_job(job: TranscriptionJob) -> None:
+    try:
+        if await session_store.get(job.session_id) is None:
+            return  # evicted while queued; nothing left to report to
+        await _transcribe_session(job.session_id, job.audio)
+    finally:
+        await job.audio.aclose()
+
+
+async def _abandon_transcription_job(job: TranscriptionJob) -> None:
+    # Shutting down: fail the session now instead of leaving it pending forever.
+    await _update(
+        job.session_id,
+        status=AnalysisStatus.ERROR,
+        error="Server restarted before transcription finished; upload the recording again.",
+    )
+
+
+transcription_jobs = TranscriptionJobQueue(
+    _run_transcription_job,
+    abandon=_abandon_transcription_job,
+    workers=TRANSCRIPTION_WORKERS,
+    max_pending=TRANSCRIPTION_QUEUE_SIZE,
+)
+
+
+@router.post(
+    "",
+    response_model=UploadSessionResponse,
+    responses={202: {"model": UploadSessionResponse}},
+)
 async def upload_session(
     audio: UploadFile = File(...),
     metadata: str = Form(...),
+    run_async: bool = Query(False, alias="async"),
 ):
     """
     Upload a completed session recording and metadata, then transcribe the audio.
     Returns the transcript text and word-level timestamps.
+
+    With `?async=true` the upload returns 202 as soon as the audio is stored
+    and a background worker transcribes it; poll
+    `GET /api/sessions/{id}/transcript` or stream `GET /api/sessions/{id}/events`.
+
+    Audio byte-identical to an earlier upload reuses that transcript and
+    completes immediately (200) in either mode.
     """
     try:
         metadata_obj = SessionMetadata.model_validate_json(metadata)
     except Exception:
         raise HTTPException(status_code=400, detail="Invalid metadata JSON")
 
-    suffix = Path(audio.filename or "session.webm").suffix or ".webm"
     try:
-        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-            audio_path = tmp.name
-            while True:
-                chunk = await audio.read(1024 * 1024)
-                if not chunk:
-                    break
-                tmp.write(chunk)
+        spool = await AudioSpool.from_upload(audio)
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to persist audio: {str(e)}")
     finally:
         await audio.close()
 
+    try:
+        return await _start_session(metadata_obj, spool, run_async)
+    except BaseException:
+        await spool.aclose()
+        raise
+
+
+async def _start_session(metadata_obj: SessionMetadata, spool: AudioSpool, run_async: bool):
+    """
+    Create the session for a fully received recording and transcribe it.
+    Segments streamed live fill in an empty metadata transcript, and the
+    running live metrics are kept on the session.
+
+    Once this returns, the spool belongs to the session (closed, or handed
+    to a transcription job); if it raises, the caller still owns it.
+    """
+    live = live_sessions.get(metadata_obj.sessionId)
+    if live is not None and not metadata_obj.transcript:
+        metadata_obj.transcript = list(live.segments)
+
+    audio_path = None
+    if _keep_audio():
+        suffix = Path(spool.filename or "session.webm").suffix or ".webm"
+        audio_path = await spool.persist(suffix)
+
     session = Session(
         id=metadata_obj.sessionId,
         metadata=metadata_obj,
         audio_path=audio_path,
-        status=AnalysisStatus.PROCESSING,
+        live_metrics=live.aggregates.summary() if live is not None else None,
+        metric_series=live.metrics if live is not None and len(live.metrics) else None,
+        status=AnalysisStatus.PENDING if run_async else AnalysisStatus.PROCESSING,
     )
-    session_store.save(session)
 
-    try:
-        result = await transcribe_audio(
-            audio_path,
-            mime_type=audio.content_type,
-            filename=audio.filename,
-        )
-        session.transcript_text = result.text
-        session.word_timings = result.words
-        session.status = AnalysisStatus.COMPLETE
-        session_store.save(session)
-        return UploadSessionResponse(
-            session_id=session.id,
-            status=session.status.value,
-            transcript_text=session.transcript_text,
-            word_timings=session.word_timings,
+    cached = await cached_transcription(spool)
+    if cached is not None:
+        for name, value in _completed_fields(cached).items():
+            setattr(session, name, value)
+        await session_store.save(session)
+        await spool.aclose()
+        live_sessions.finish(session.id)
+        return _upload_response(session)
+
+    await session_store.save(session)
+
+    if run_async:
+        if not transcription_jobs.submit(TranscriptionJob(session.id, spool)):
+            await session_store.delete(session.id)
+            raise HTTPException(
+                status_code=503,
+                detail="Transcription queue is full. Retry shortly.",
+                headers={"Retry-After": "5"},
+            )
+        live_sessions.finish(session.id)
+        return JSONResponse(
+            status_code=202,
+            content=UploadSessionResponse(
+                session_id=session.id, status=session.status.value
+            ).model_dump(),
+            headers={"Location": f"/api/sessions/{session.id}/transcript"},
         )
+
+    live_sessions.finish(session.id)
+    try:
+        transcribed = await _transcribe_session(session.id, spool)
     except Exception as e:
-        session.status = AnalysisStatus.ERROR
-        session.error = str(e)
-        session_store.save(session)
         raise HTTPException(status_code=500, detail=f"Transcription failed: {str(e)}")
-    finally:
-        keep_audio = os.getenv("KAWKAI_KEEP_SESSION_AUDIO", "").lower() in ("1", "true", "yes")
-        if not keep_audio and audio_path:
-            try:
-                os.unlink(audio_path)
-            except FileNotFoundError:
-                pass
-            except Exception:
-                pass
+    if transcribed is None:
+        raise HTTPException(status_code=404, detail="Session expired during transcription")
+    await spool.aclose()
+    return _upload_response(transcribed)
+
+
+class LiveBatchRequest(BaseModel):
+    seq: int = Field(ge=0)  # 0 for the first batch, +1 for each one after
+    segments: list[TranscriptSegment] = []
+    nudges: list[NudgeEvent] = []
+
+
+class LiveSessionResponse(BaseModel):
+    session_id: str
+    live: bool
+    next_seq: int | None = None
+    metrics: dict
+
+
+@router.post("/{session_id}/live", response_model=LiveSessionResponse)
+async def append_live_batch(session_id: str, body: LiveBatchRequest):
+    """
+    Append transcript segments and nudge events while the session is still
+    running; returns the running metrics. A resent batch is acknowledged
+    without being applied twice; a skipped one gets 409 with `Live-Next-Seq`.
+    Upload the recording as usual when the session ends (the metadata
+    transcript may then be empty).
+    """
+    if live_sessions.get(session_id) is None and await session_store.get(session_id) is not None:
+        raise HTTPException(status_code=409, detail="Session recording already uploaded")
+    try:
+        live = live_sessions.append(session_id, body.seq, body.segments, body.nudges)
+    except LiveBatchOutOfOrder as e:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Batch out of order; resend from seq {e.expected_seq}.",
+            headers={"Live-Next-Seq": str(e.expected_seq)},
+        )
+    except TooManyLiveSessions as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "30"})
+    return LiveSessionResponse(
+        session_id=session_id, live=True, next_seq=live.next_seq, metrics=live.aggregates.summary()
+    )
+
+
+@router.get("/{session_id}/live", response_model=LiveSessionResponse)
+async def get_live_metrics(session_id: str):
+    """Running metrics of a live session, or the final ones once its recording is uploaded."""
+    live = live_sessions.get(session_id)
+    if live is not None:
+        return LiveSessionResponse(
+            session_id=session_id,
+            live=True,
+            next_seq=live.next_seq,
+            metrics=live.aggregates.summary(),
+        )
+    session = await session_store.get(session_id)
+    if session is None or session.live_metrics is None:
+        raise HTTPException(status_code=404, detail="No live metrics for this session")
+    return LiveSessionResponse(session_id=session_id, live=False, metrics=session.live_metrics)
+
+
+class MetricSample(BaseModel):
+    t: int = Field(ge=0)  # ms since the session started
+    wpm: float | None = None
+    filler_rate: float | None = None
+    prosody_variance: float | None = None
+
+
+class MetricSamplesRequest(BaseModel):
+    samples: list[MetricSample] = Field(max_length=3600)
+
+
+@router.post("/{session_id}/metrics")
+async def append_metric_samples(session_id: str, body: MetricSamplesRequest):
+    """
+    Store HUD metric samples (WPM, filler rate, prosody variance) for the
+    replay timeline. Samples at or before the newest stored one are dropped,
+    so a resent batch is harmless. Samples sent after the recording was
+    uploaded go onto the stored session.
+    """
+    samples = [sample.model_dump(exclude_none=True) for sample in body.samples]
+    session = (
+        None if live_sessions.get(session_id) is not None else await session_store.get(session_id)
+    )
+    if session is not None:
+        series = session.metric_series or MetricSeries()
+        stored = series.append(samples)
+        if stored:
+            await _update(session_id, metric_series=series)
+        return {"session_id": session_id, "live": False, "stored": stored, "samples": len(series)}
+    try:
+        live, stored = live_sessions.append_metrics(session_id, samples)
+    except TooManyLiveSessions as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "30"})
+    return {
+        "session_id": session_id,
+        "live": True,
+        "stored": stored,
+        "samples": len(live.metrics),
+    }
+
+
+@router.get("/{session_id}/metrics")
+async def get_metric_series(
+    session_id: str,
+    points: int = Query(300, ge=3, le=5000),
+    metrics: str = Query(",".join(METRICS)),
+    t0_ms: int | None = Query(None, ge=0),
+    t1_ms: int | None = Query(None, ge=0),
+):
+    """
+    Metric series for timeline charts, LTTB-downsampled to at most `points`
+    samples per metric so the payload does not grow with session length.
+    `t0_ms`/`t1_ms` narrow the window when zooming in.
+    """
+    names = [name for name in metrics.split(",") if name]
+    if not names or any(name not in METRICS for name in names):
+        raise HTTPException(
+            status_code=400, detail=f"metrics must be a subset of {','.join(METRICS)}"
+        )
+    if t0_ms is not None and t1_ms is not None and t1_ms < t0_ms:
+        raise HTTPException(status_code=400, detail="t1_ms must not be before t0_ms")
+    live = live_sessions.get(session_id)
+    if live is not None:
+        series = live.metrics
+    else:
+        session = await session_store.get(session_id)
+        if session is None or session.metric_series is None:
+            raise HTTPException(status_code=404, detail="No metric samples for this session")
+        series = session.metric_series
+    return {
+        "session_id": session_id,
+        "live": live is not None,
+        "points": points,
+        "series": downsample_series(series, names, points, t0_ms, t1_ms),
+    }
+
+
+class CreateUploadRequest(BaseModel):
+    filename: str | None = None
+    content_type: str | None = None
+    size: int | None = Field(default=None, ge=0)  # total bytes, if known
+    sha256: str | None = None  # hex digest of the whole file, checked on finalize
+
 
-            if session.audio_path == audio_path:
-                session.audio_path = None
-                session_store.save(session)
+class UploadStatusResponse(BaseModel):
+    upload_id: str
+    offset: int
+    size: int | None = None
+
+
+class FinalizeUploadRequest(BaseModel):
+    metadata: SessionMetadata
+    sha256: str | None = None
+
+
+_CONTENT_RANGE = re.compile(r"bytes (\d+)-(\d+)/(\d+|\*)")
+_SHA256_DIGEST = re.compile(r"sha-256=:([A-Za-z0-9+/]+=*):")
+
+
+def _upload_status(upload: ResumableUpload) -> JSONResponse:
+    return JSONResponse(
+        UploadStatusResponse(
+            upload_id=upload.id, offset=upload.offset, size=upload.size
+        ).model_dump(),
+        headers={"Upload-Offset": str(upload.offset)},
+    )
+
+
+def _get_upload(upload_id: str) -> ResumableUpload:
+    upload = resumable_uploads.get(upload_id)
+    if upload is None:
+        raise HTTPException(status_code=404, detail="Upload not found or expired")
+    return upload
+
+
+def _offset_conflict(offset: int) -> HTTPException:
+    return HTTPException(
+        status_code=409,
+        detail=f"Upload offset mismatch; resume from byte {offset}.",
+        headers={"Upload-Offset": str(offset)},
+    )
+
+
+@router.post("/uploads", status_code=201, response_model=UploadStatusResponse)
+async def create_upload(body: CreateUploadRequest):
+    """
+    Start a resumable upload. Send the audio with `PUT /api/sessions/uploads/{id}`
+    in order, one `Content-Range: bytes start-end/total` chunk at a time;
+    after a failure, `GET` the upload for the offset to resume from, then
+    finalize with `POST /api/sessions/uploads/{id}/finalize`.
+    """
+    try:
+        upload = await resumable_uploads.create(
+            filename=body.filename,
+            content_type=body.content_type,
+            size=body.size,
+            sha256=body.sha256,
+        )
+    except UploadRejected as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except TooManyUploads as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "30"})
+    response = _upload_status(upload)
+    response.status_code = 201
+    response.headers["Location"] = f"/api/sessions/uploads/{upload.id}"
+    return response
+
+
+@router.get("/uploads/{upload_id}", response_model=UploadStatusResponse)
+async def get_upload(upload_id: str):
+    """Bytes received so far: the next chunk should start at `offset`."""
+    return _upload_status(_get_upload(upload_id))
+
+
+@router.put("/uploads/{upload_id}", response_model=UploadStatusResponse)
+async def put_upload_chunk(upload_id: str, request: Request):
+    """
+    Append one chunk. Chunks that overlap bytes already received (a retry
+    after a lost response) must repeat them exactly; only their new tail is
+    stored.
+    An optional `Content-Digest: sha-256=:<base64>:` header is verified
+    before anything is written.
+    """
+    upload = _get_upload(upload_id)
+    match = _CONTENT_RANGE.fullmatch(request.headers.get("content-range", ""))
+    if match is None:
+        raise HTTPException(
+            status_code=400, detail="Content-Range: bytes start-end/total is required"
+        )
+    start, end = int(match.group(1)), int(match.group(2))
+    total = None if match.group(3) == "*" else int(match.group(3))
+    if end < start or end - start + 1 > UPLOAD_CHUNK_MAX_BYTES:
+        raise HTTPException(status_code=400, detail="Invalid or oversized Content-Range")
+    if total is not None and upload.size is not None and total != upload.size:
+        raise HTTPException(status_code=400, detail="Content-Range total does not match upload size")
+    if start > upload.offset:
+        raise _offset_conflict(upload.offset)
+
+    parts = []
+    received = 0
+    async for part in request.stream():
+        received += len(part)
+        if received > end - start + 1:
+            raise HTTPException(status_code=400, detail="Body is longer than Content-Range")
+        parts.append(part)
+    data = b"".join(parts)
+    if len(data) != end - start + 1:
+        # Interrupted body: nothing was written, the client resends the chunk.
+        raise HTTPException(status_code=400, detail="Body length does not match Content-Range")
+
+    digest = request.headers.get("content-digest")
+    if digest is not None:
+        expected = _SHA256_DIGEST.search(digest)
+        if expected is None or base64.b64decode(expected.group(1)) != hashlib.sha256(data).digest():
+            raise HTTPException(status_code=400, detail="Chunk digest mismatch")
+
+    try:
+        await resumable_uploads.append(upload, start, data)
+    except UploadOffsetMismatch as e:
+        raise _offset_conflict(e.offset)
+    except UploadRejected as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    return _upload_status(upload)
+
+
+@router.post(
+    "/uploads/{upload_id}/finalize",
+    response_model=UploadSessionResponse,
+    responses={202: {"model": UploadSessionResponse}},
+)
+async def finalize_upload(
+    upload_id: str,
+    body: FinalizeUploadRequest,
+    run_async: bool = Query(False, alias="async"),
+):
+    """
+    Check the upload is complete (declared size and sha256, when given) and
+    start transcription exactly as `POST /api/sessions` does. If that fails
+    (queue full, transcription error) the upload is kept, so finalize can be
+    retried without sending the audio again.
+    """
+    upload = _get_upload(upload_id)
+    if body.sha256 is not None:
+        upload.sha256 = body.sha256.lower()
+    try:
+        async with resumable_uploads.finalize(upload) as spool:
+            return await _start_session(body.metadata, spool, run_async)
+    except UploadOffsetMismatch as e:
+        raise _offset_conflict(e.offset)
+    except UploadRejected as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+
+@router.delete("/uploads/{upload_id}", status_code=204)
+async def abort_upload(upload_id: str):
+    if not await resumable_uploads.abort(upload_id):
+        raise HTTPException(status_code=404, detail="Upload not found or expired")
+
+
+@router.get("/search")
+async def search_transcripts(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(50, ge=1, le=500),
+    hits: int = Query(20, ge=1, le=200),
+):
+    """
+    Sessions whose spokesperson said the phrase `q`, most hits first, with
+    each hit's word position and time in ms. A word ending in `*` matches
+    any word it prefixes, e.g. `compet*`.
+    """
+    return await session_store.search(q, limit=limit, max_hits=hits)
 
 
 @router.get("/{session_id}/transcript", response_model=UploadSessionResponse)
 async def get_transcript(session_id: str):
-    session = session_store.get(session_id)
+    session = await session_store.get(session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    return UploadSessionResponse(
+    return _upload_response(session)
+
+
+@router.get("/{session_id}/range")
+async def get_session_range(
+    session_id: str,
+    t0: float = Query(0.0, ge=0),
+    t1: float | None = Query(None, ge=0),
+    fields: str = Query("word,start,end"),
+    include: str = Query("words,flags"),
+    limit: int = Query(500, ge=1, le=5000),
+    cursor: int | None = Query(None, ge=0),
+):
+    """
+    Words and analysis flags overlapping `[t0, t1]` seconds, for rendering a
+    window of a long session without fetching the whole transcript. `fields`
+    projects word fields (`word,start,end,index`), `include` picks `words`
+    and/or `flags`; words are paged `limit` at a time via `next_cursor`.
+    """
+    if t1 is not None and t1 < t0:
+        raise HTTPException(status_code=400, detail="t1 must not be before t0")
+    word_fields = [f for f in fields.split(",") if f]
+    unknown = [f for f in word_fields if f not in WORD_FIELDS]
+    if unknown or not word_fields:
+        raise HTTPException(
+            status_code=400, detail=f"fields must be a subset of {','.join(WORD_FIELDS)}"
+        )
+    parts = set(include.split(","))
+    session = await session_store.get(session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+    return {
+        "session_id": session.id,
+        **query_range(
+            session_indexes.get(session),
+            t0,
+            t1,
+            fields=word_fields,
+            limit=limit,
+            cursor=cursor,
+            include_words="words" in parts,
+            include_flags="flags" in parts,
+        ),
+    }
+
+
+def _require_word_timings(session: Session) -> None:
+    if session.word_timings:
+        return
+    if session.status != AnalysisStatus.COMPLETE:
+        raise HTTPException(
+            status_code=409, detail="Session has no word timings yet (transcription not complete)"
+        )
+    # Complete, but a text-only fallback model produced the transcript.
+    raise HTTPException(status_code=422, detail="No word timings for this transcript")
+
+
+@router.get("/{session_id}/delivery")
+async def get_delivery_metrics(session_id: str):
+    """
+    Pace, filler, pause and answer-length metrics computed from the stored
+    word timings, with NUDGE_THRESHOLDS breaches per spokesperson turn.
+    """
+    session = await session_store.get(session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+    _require_word_timings(session)
+    transcript = [segment.model_dump() for segment in session.metadata.transcript]
+    return {"session_id": session.id, **analyze_delivery(session.word_timings, transcript)}
+
+
+class PhraseMatchRequest(BaseModel):
+    keyMessages: list[str] = Field(default_factory=list, max_length=2000)
+    redLines: list[str] = Field(default_factory=list, max_length=2000)
+    fillers: list[str] | None = Field(default=None, max_length=2000)  # default: the HUD's list
+
+
+@router.post("/{session_id}/phrases")
+async def match_session_phrases(session_id: str, body: PhraseMatchRequest):
+    """
+    Which key messages the spokesperson landed and which red lines or risky
+    phrases they crossed, as timestamped flags, plus filler counts; one pass
+    over the stored word timings.
+    """
+    session = await session_store.get(session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+    _require_word_timings(session)
+    columns = session.word_timings
+    return {
+        "session_id": session.id,
+        **match_phrases(
+            columns.words,
+            [ms / 1000 for ms in columns.start_ms],
+            [ms / 1000 for ms in columns.end_ms],
+            key_messages=body.keyMessages,
+            red_lines=body.redLines,
+            fillers=body.fillers,
+        ),
+    }
+
+
+class AnalysisResponse(BaseModel):
+    session_id: str
+    status: str
+    analysis: AnalysisResult | None = None
+    error: str | None = None
+
+
+def _analysis_response(session: Session) -> AnalysisResponse:
+    return AnalysisResponse(
         session_id=session.id,
-        status=session.status.value,
-        transcript_text=session.transcript_text,
-        word_timings=session.word_timings,
+        status=session.analysis_status.value,
+        analysis=session.analysis,
+        error=session.analysis_error,
+    )
+
+
+# Strong references to running analyses so they are not garbage collected.
+_analysis_tasks: set[asyncio.Task] = set()
+
+
+async def _run_analysis(session: Session) -> None:
+    transcript = [segment.model_dump() for segment in session.metadata.transcript]
+    delivery = None
+    if session.word_timings:
+        metrics = analyze_delivery(session.word_timings, transcript)
+        delivery = {
+            "wpm": metrics["wpm"],
+            "fillers_per_min": metrics["fillers_per_min"],
+            "longest_answer_s": metrics["longest_answer"]["answer_s"],
+            "longest_pause_s": metrics["pauses"]["longest_s"],
+        }
+    scenario = get_journalist_scenario(session.metadata.scenarioId)
+    try:
+        analysis = await analyze_transcript(
+            transcript,
+            mode=session.metadata.mode,
+            scenario_context=scenario["context"] if scenario else None,
+            delivery=delivery,
+        )
+    except Exception as e:
+        logger.warning("Analysis of session %s failed: %s", session.id, e)
+        await session_store.update_analysis_status(session.id, AnalysisStatus.ERROR, str(e))
+    else:
+        await session_store.update_analysis(session.id, analysis)
+    transcription_jobs.notify(session.id)
+
+
+@router.post(
+    "/{session_id}/analysis",
+    response_model=AnalysisResponse,
+    responses={202: {"model": AnalysisResponse}},
+)
+async def start_analysis(session_id: str):
+    """
+    Score the session's answers, flag problems with timestamps, and write
+    rewrites and drills (LLM, map-reduce over the transcript). Returns 202
+    and runs in the background; poll `GET /api/sessions/{id}/analysis`.
+    A running or finished analysis is returned as is; a failed one is retried.
+    """
+    session = await session_store.get(session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+    if session.analysis_status in (AnalysisStatus.PROCESSING, AnalysisStatus.COMPLETE):
+        return _analysis_response(session)
+    transcript = [segment.model_dump() for segment in session.metadata.transcript]
+    if not build_exchanges(transcript):
+        raise HTTPException(status_code=422, detail="Transcript has no spokesperson answers")
+
+    session.analysis_status = AnalysisStatus.PROCESSING
+    session.analysis_error = None
+    await _update(session.id, analysis_status=AnalysisStatus.PROCESSING, analysis_error=None)
+    task = asyncio.create_task(_run_analysis(session))
+    _analysis_tasks.add(task)
+    task.add_done_callback(_analysis_tasks.discard)
+    return JSONResponse(
+        status_code=202,
+        content=_analysis_response(session).model_dump(),
+        headers={"Location": f"/api/sessions/{session.id}/analysis"},
+    )
+
+
+@router.get("/{session_id}/analysis", response_model=AnalysisResponse)
+async def get_analysis(session_id: str):
+    session = await session_store.get(session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+    return _analysis_response(session)
+
+
+@router.get("/{session_id}/events")
+async def session_events(session_id: str, request: Request):
+    """
+    Server-sent events stream of a session's status. Emits a `status` event
+    on every transition and closes after `complete` or `error`.
+    """
+    if await session_store.get(session_id) is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    async def _stream():
+        last = None
+        last_sent = time.monotonic()
+        while True:
+            session = await session_store.get(session_id)
+            if session is None:
+                yield "event: expired\ndata: {}\n\n"
+                return
+            current = {
+                "session_id": session.id,
+                "status": session.status.value,
+                "error": session.error,
+            }
+            if current != last:
+                yield f"event: status\ndata: {json.dumps(current)}\n\n"
+                last, last_sent = current, time.monotonic()
+            elif time.monotonic() - last_sent >= SESSION_EVENTS_HEARTBEAT_S:
+                yield ": keep-alive\n\n"
+                last_sent = time.monotonic()
+            if session.status in TERMINAL_STATUSES or await request.is_disconnected():
+                return
+            await transcription_jobs.wait_for_change(session_id, SESSION_EVENTS_POLL_S)
+
+    return StreamingResponse(
+        _stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
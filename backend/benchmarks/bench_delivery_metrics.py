@@ -0,0 +1,84 @@
+"""
+Benchmark `analyze_delivery` on an hour-long session (~6,500 words, 120
+spokesperson turns) against a straightforward per-word Python loop
+computing the same windowed WPM/filler counts and per-turn sums.
+
+Run from `backend/`:
+    python benchmarks/bench_delivery_metrics.py
+"""
+
+import random
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from models.word_timings import WordColumns  # noqa: E402
+from services.delivery_metrics import (  # noqa: E402
+    FILLER_WORDS,
+    HOP_S,
+    WINDOW_S,
+    analyze_delivery,
+)
+
+SESSION_S = 3600
+TURNS = 120
+VOCABULARY = ["the", "we", "customers", "growth", "um", "so", "like", "plan", "you", "know"]
+
+
+def _segment(speaker: str, start_s: float, end_s: float) -> dict:
+    return {"speaker": speaker, "text": "", "startTime": start_s * 1000, "endTime": end_s * 1000}
+
+
+def _session() -> tuple[WordColumns, list[dict]]:
+    rng = random.Random(11)
+    words, transcript = [], []
+    turn_s = SESSION_S / TURNS
+    for turn in range(TURNS):
+        question_end = turn * turn_s + 5
+        transcript.append(_segment("ai", turn * turn_s, question_end))
+        t = question_end + 0.5
+        answer_end = (turn + 1) * turn_s - 1
+        while t < answer_end:
+            length = rng.uniform(0.15, 0.45)
+            words.append({"word": " " + rng.choice(VOCABULARY), "start": t, "end": t + length})
+            t += length + (rng.uniform(0.4, 2.0) if rng.random() < 0.08 else 0.05)
+        transcript.append(_segment("user", question_end + 0.5, answer_end))
+    return WordColumns.from_dicts(words), transcript
+
+
+def _python_loop(columns: WordColumns, transcript: list[dict]) -> None:
+    single = {f for f in FILLER_WORDS if " " not in f}
+    words = [
+        (w.strip(" ,.?!").lower(), s / 1000, e / 1000)
+        for w, s, e in zip(columns.words, columns.start_ms, columns.end_ms)
+    ]
+    t = HOP_S
+    while t <= words[-1][2] + HOP_S:
+        inside = [w for w in words if t - WINDOW_S <= w[1] < t]
+        speaking = sum(min(1.0, max(0.05, e - s)) for _, s, e in inside)
+        _ = (len(inside) / speaking * 60 if speaking else 0, sum(w in single for w, _, _ in inside))
+        t += HOP_S
+    for seg in transcript:
+        if seg["speaker"] != "user":
+            continue
+        inside = [w for w in words if seg["startTime"] / 1000 <= w[1] <= seg["endTime"] / 1000]
+        _ = sum(w in single for w, _, _ in inside)
+
+
+def _ms(fn, number: int) -> float:
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1000
+
+
+def main() -> None:
+    columns, transcript = _session()
+    print(f"session: {len(columns)} words, {TURNS} answers, {SESSION_S / 60:.0f} min")
+    vectorized = _ms(lambda: analyze_delivery(columns, transcript), number=20)
+    loop = _ms(lambda: _python_loop(columns, transcript), number=1)
+    print(f"analyze_delivery (NumPy): {vectorized:8.2f} ms")
+    print(f"per-word Python loop:     {loop:8.2f} ms ({loop / vectorized:.0f}x slower)")
+
+
+if __name__ == "__main__":
+    main()
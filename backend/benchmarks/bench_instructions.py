@@ -0,0 +1,71 @@
+"""
+Benchmark realtime instruction assembly per token mint: uncached
+`build_budgeted_instructions` (assembly + token estimation/trimming) vs
+`build_instructions_cached` (precomputed built-ins and LRU hits for
+company-specific inputs).
+
+Run from `backend/`:
+    python benchmarks/bench_instructions.py
+"""
+
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from prompts.instructions_builder import (  # noqa: E402
+    build_budgeted_instructions,
+    build_instructions_cached,
+    precompute_builtin_instructions,
+)
+
+BUILTIN = dict(
+    mode="journalist",
+    scenario_id="crisis-security",
+    counterparty="journalist",
+    situation="crisis",
+    company_url=None,
+    company_notes=None,
+    company_brief_summary=None,
+)
+
+CUSTOM = dict(
+    mode="coach",
+    scenario_id="product-launch",
+    counterparty="customer",
+    situation="demo",
+    company_url="https://example.com",
+    company_notes="We sell B2B analytics software. " * 40,
+    company_brief_summary={
+        "one_liner": "ExampleCo builds analytics for retailers.",
+        "products_services": ["Dashboards", "Forecasting", "Alerts"],
+        "customers_users": ["Mid-market retailers", "Category managers"],
+        "positioning_claims": ["Fastest time to insight"],
+        "risk_areas": ["Data privacy", "Pricing changes"],
+        "unknowns": ["Headcount", "Revenue"],
+    },
+)
+
+
+def _per_call_us(fn, kwargs, number: int) -> float:
+    return min(timeit.repeat(lambda: fn(**kwargs), number=number, repeat=5)) / number * 1e6
+
+
+def main() -> None:
+    number = 2000
+    count = precompute_builtin_instructions()
+    print(f"precomputed variants: {count}")
+
+    for label, kwargs in (("built-in", BUILTIN), ("custom brief", CUSTOM)):
+        uncached = _per_call_us(build_budgeted_instructions, kwargs, number)
+        build_instructions_cached(**kwargs)
+        cached = _per_call_us(build_instructions_cached, kwargs, number)
+        print(
+            f"{label:>12}: uncached {uncached:7.2f} us  cached {cached:7.2f} us  "
+            f"saved {uncached - cached:7.2f} us/mint ({uncached / cached:4.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark session store backends: save (one at a time and batched with
+`save_many`), update and get throughput for the in-memory backend vs the
+SQLite (WAL) backend, with sessions carrying ~5000 word timings (a ~30
+minute recording).
+
+Run from `backend/`:
+    python benchmarks/bench_session_store.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from models.session import AnalysisStatus, Session, SessionMetadata  # noqa: E402
+from services.session_store import MemorySessionBackend  # noqa: E402
+from services.sqlite_session_backend import SQLiteSessionBackend  # noqa: E402
+
+SESSIONS = 200
+WORDS = 5000
+
+
+def _session(session_id: str) -> Session:
+    return Session(
+        id=session_id,
+        metadata=SessionMetadata(sessionId=session_id, mode="coach", transcript=[]),
+        transcript_text="word " * WORDS,
+        word_timings=[
+            {"word": "word", "start": i * 0.36, "end": i * 0.36 + 0.3} for i in range(WORDS)
+        ],
+    )
+
+
+def _rate(fn, count: int) -> float:
+    started = time.perf_counter()
+    fn()
+    return count / (time.perf_counter() - started)
+
+
+def _run(label: str, backend) -> None:
+    sessions = [_session(f"s{i}") for i in range(SESSIONS)]
+    save = _rate(lambda: [backend.save(s) for s in sessions], SESSIONS)
+    save_many = _rate(lambda: backend.save_many(sessions), SESSIONS)
+    update = _rate(
+        lambda: [backend.update(s.id, {"status": AnalysisStatus.COMPLETE}) for s in sessions],
+        SESSIONS,
+    )
+    get = _rate(lambda: [backend.get(s.id) for s in sessions], SESSIONS)
+    print(
+        f"{label:>7}: save {save:8.0f}/s  save_many {save_many:8.0f}/s  "
+        f"update {update:8.0f}/s  get {get:8.0f}/s"
+    )
+
+
+def main() -> None:
+    _run("memory", MemorySessionBackend(max_entries=0, max_bytes=0, ttl_s=0))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.sqlite3")
+        backend = SQLiteSessionBackend(path, max_entries=0, ttl_s=0)
+        _run("sqlite", backend)
+        stats = backend.stats()
+        print(
+            f"sqlite db: {stats['db_bytes'] / 1024 / 1024:.1f} MiB for {stats['entries']} "
+            f"sessions ({stats['db_bytes'] / stats['entries'] / WORDS:.1f} bytes/word)"
+        )
+
+
+if __name__ == "__main__":
+    main()
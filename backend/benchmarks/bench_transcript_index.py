@@ -0,0 +1,92 @@
+"""
+Benchmark `TranscriptIndex` over 2,000 stored sessions of 5,000 words each
+(10M words): indexing cost per session, phrase and prefix query latency,
+and a scan of every session's transcript text for comparison.
+
+Run from `backend/`:
+    python benchmarks/bench_transcript_index.py
+"""
+
+import random
+import re
+import sys
+import timeit
+from itertools import accumulate
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from models.session import Session, SessionMetadata  # noqa: E402
+from models.word_timings import WordColumns  # noqa: E402
+from services.transcript_index import TranscriptIndex  # noqa: E402
+
+SESSIONS = 2_000
+SESSION_WORDS = 5_000
+
+
+def _vocabulary(rng: random.Random, size: int) -> list[str]:
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return ["".join(rng.choice(letters) for _ in range(rng.randint(3, 10))) for _ in range(size)]
+
+
+def _session(
+    rng: random.Random, session_id: str, vocabulary: list[str], cum_weights: list[float]
+) -> Session:
+    # Zipf word frequencies (~2,000 distinct words per session), and the odd "no comment".
+    words = rng.choices(vocabulary, cum_weights=cum_weights, k=SESSION_WORDS)
+    if rng.random() < 0.05:
+        at = rng.randrange(SESSION_WORDS - 1)
+        words[at : at + 2] = ["no", "comment"]
+    starts = [i * 0.35 for i in range(len(words))]
+    return Session(
+        id=session_id,
+        metadata=SessionMetadata(sessionId=session_id, mode="coach"),
+        transcript_text=" ".join(words),
+        word_timings=WordColumns.from_dicts(
+            {"word": w, "start": s, "end": s + 0.3} for w, s in zip(words, starts)
+        ),
+    )
+
+
+def _ms(fn, number: int) -> float:
+    return min(timeit.repeat(fn, number=number, repeat=3)) / number * 1000
+
+
+def main() -> None:
+    rng = random.Random(7)
+    vocabulary = _vocabulary(rng, 20_000) + ["no", "comment"]
+    cum_weights = list(accumulate(1 / rank for rank in range(1, len(vocabulary) + 1)))
+    sessions = [_session(rng, f"s{i}", vocabulary, cum_weights) for i in range(SESSIONS)]
+    print(f"{SESSIONS} sessions x {SESSION_WORDS} words")
+
+    def build() -> TranscriptIndex:
+        index = TranscriptIndex(max_sessions=0)
+        for session in sessions:
+            index.add(session)
+        return index
+
+    index_ms = _ms(build, number=1)
+    index = build()
+    resave_ms = _ms(lambda: index.add(sessions[0]), number=1000)
+    phrase = index.search("no comment")
+    print(f"index all sessions:       {index_ms:8.1f} ms ({index_ms / SESSIONS:.2f} ms/session)")
+    print(f"re-save, unchanged:       {resave_ms * 1000:8.1f} us")
+    print(f"terms:                    {index.stats()['terms']:8d}")
+
+    phrase_ms = _ms(lambda: index.search("no comment"), number=20)
+    prefix = vocabulary[0][:2] + "*"
+    prefix_ms = _ms(lambda: index.search(prefix), number=20)
+    common_ms = _ms(lambda: index.search(f"{vocabulary[0]} {vocabulary[1]}"), number=5)
+    pattern = re.compile(r"\bno comment\b")
+    scan_ms = _ms(
+        lambda: [s.id for s in sessions if pattern.search(s.transcript_text.lower())], number=1
+    )
+    print(f'phrase "no comment":      {phrase_ms:8.2f} ms ({phrase["total_sessions"]} sessions)')
+    terms = len(index.search(prefix)["terms"][0])
+    print(f"prefix {prefix:<18} {prefix_ms:8.2f} ms ({terms} terms)")
+    print(f"phrase of common words:   {common_ms:8.2f} ms")
+    print(f"regex over every session: {scan_ms:8.1f} ms ({scan_ms / phrase_ms:.0f}x slower)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Measure event-loop blocking while an upload is persisted and then read back
+for the upstream request: the previous pipeline (synchronous writes to a
+NamedTemporaryFile, then a blocking `open()` + reads) vs `AudioSpool`
+(adopting the parsed upload's spooled body, disk I/O in worker threads).
+
+A ticker task sleeps 1 ms in a loop; any extra delay it sees is time the loop
+was blocked.
+
+Run from `backend/`:
+    python benchmarks/bench_upload_spool.py
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from starlette.datastructures import Headers, UploadFile  # noqa: E402
+
+from services.audio_spool import AudioSpool  # noqa: E402
+
+CHUNK = 1024 * 1024
+
+
+async def _parsed_upload(size: int) -> UploadFile:
+    """Body as Starlette's multipart parser leaves it: spooled, rolled past 1 MB."""
+    upload = UploadFile(
+        tempfile.SpooledTemporaryFile(max_size=CHUNK),
+        filename="session.webm",
+        headers=Headers({"content-type": "audio/webm"}),
+    )
+    chunk = os.urandom(CHUNK)
+    for offset in range(0, size, CHUNK):
+        await upload.write(chunk[: size - offset])
+    await upload.seek(0)
+    return upload
+
+
+async def _legacy(size: int) -> None:
+    upload = await _parsed_upload(size)
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".webm") as tmp:
+        path = tmp.name
+        while chunk := await upload.read(CHUNK):
+            tmp.write(chunk)
+    with open(path, "rb") as f:
+        while f.read(64 * 1024):
+            await asyncio.sleep(0)  # httpx reads file parts synchronously between sends
+    os.unlink(path)
+    await upload.close()
+
+
+async def _spooled(size: int) -> None:
+    upload = await _parsed_upload(size)
+    spool = await AudioSpool.from_upload(upload)
+    await upload.close()
+    async for _ in spool.iter_bytes():
+        await asyncio.sleep(0)
+    await spool.aclose()
+
+
+async def _measure(pipeline, size: int) -> tuple[float, float, float]:
+    stalls: list[float] = []
+    done = False
+
+    async def ticker():
+        while not done:
+            started = time.perf_counter()
+            await asyncio.sleep(0.001)
+            stalls.append(max(0.0, time.perf_counter() - started - 0.001))
+
+    task = asyncio.create_task(ticker())
+    await asyncio.sleep(0.01)
+    started = time.perf_counter()
+    await pipeline(size)
+    elapsed = time.perf_counter() - started
+    done = True
+    await task
+    blocked = [s for s in stalls if s > 0.002]
+    return elapsed * 1000, sum(blocked) * 1000, max(stalls, default=0.0) * 1000
+
+
+async def main() -> None:
+    for size_mb in (2, 25, 100):
+        size = size_mb * 1024 * 1024
+        for label, pipeline in (("legacy", _legacy), ("spooled", _spooled)):
+            elapsed, blocked, worst = await _measure(pipeline, size)
+            print(
+                f"{size_mb:>4} MB {label:>8}: total {elapsed:8.1f} ms  "
+                f"loop blocked {blocked:7.1f} ms  worst stall {worst:6.1f} ms"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
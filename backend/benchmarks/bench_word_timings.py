@@ -0,0 +1,71 @@
+"""
+Benchmark word timing layouts for a ~30 minute session (5000 words): resident
+memory of the list-of-dicts form returned by the transcription API vs
+`WordColumns`, plus conversion costs at the store/API boundary.
+
+Run from `backend/`:
+    python benchmarks/bench_word_timings.py
+"""
+
+import random
+import sys
+import timeit
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from models.word_timings import WordColumns  # noqa: E402
+from services.word_timings import decode_word_timings, encode_word_timings  # noqa: E402
+
+WORDS = 5000
+VOCABULARY = [f" word{i}" for i in range(800)]
+
+
+def _api_words() -> list[dict]:
+    rng = random.Random(7)
+    # Parsed from JSON, so every dict holds its own str and float objects.
+    return [
+        {"word": "".join(list(rng.choice(VOCABULARY))), "start": i * 0.36, "end": i * 0.36 + 0.3}
+        for i in range(WORDS)
+    ]
+
+
+def _retained_bytes(build) -> int:
+    """Bytes still allocated once `build` returns (its temporaries freed)."""
+    tracemalloc.start()
+    value = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del value
+    return size
+
+
+def _ms(fn, number: int = 50) -> float:
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1000
+
+
+def main() -> None:
+    dict_bytes = _retained_bytes(_api_words)
+    # Warm the interpreter's intern table so its one-off resize isn't counted;
+    # a long-running server has seen the common vocabulary already.
+    WordColumns.from_dicts(_api_words())
+    # What a session retains after conversion: the API dicts are dropped.
+    column_bytes = _retained_bytes(lambda: WordColumns.from_dicts(_api_words()))
+    print(f"list of dicts: {dict_bytes / 1024:8.1f} KiB")
+    print(
+        f"WordColumns:   {column_bytes / 1024:8.1f} KiB "
+        f"({dict_bytes / column_bytes:.0f}x smaller)"
+    )
+
+    words = _api_words()
+    columns = WordColumns.from_dicts(words)
+    blob = encode_word_timings(columns)
+    print(f"from_dicts {_ms(lambda: WordColumns.from_dicts(words)):6.2f} ms  "
+          f"to_dicts {_ms(columns.to_dicts):6.2f} ms  "
+          f"encode {_ms(lambda: encode_word_timings(columns)):6.2f} ms  "
+          f"decode {_ms(lambda: decode_word_timings(blob)):6.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 import os
@@ -11,16 +12,40 @@ load_dotenv(Path(__file__).resolve().parents[1] / ".env")
 
 logger = logging.getLogger("kawkai")
 
-from api.realtime import router as realtime_router
+from api.realtime import router as realtime_router, token_pool
 from api.company_brief import router as company_brief_router
-from api.sessions import router as sessions_router
+from api.sessions import router as sessions_router, transcription_jobs
 from api.face_nudge import router as face_nudge_router
 from api.scenario import router as scenario_router
+from api.metrics import router as metrics_router
+from prompts.instructions_builder import precompute_builtin_instructions
+from services.audio_spool import UploadSizeLimitMiddleware
+from services.session_store import session_store
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    count = precompute_builtin_instructions()
+    logger.info("Precomputed %d built-in realtime instruction variants", count)
+    token_pool.start()
+    transcription_jobs.start()
+    try:
+        indexed = await session_store.rebuild_index()
+        logger.info("Indexed %d stored session transcripts for search", indexed)
+    except Exception:
+        logger.exception("Could not index stored sessions; search covers new sessions only")
+    session_store.start_sweeper(float(os.getenv("KAWKAI_SESSION_SWEEP_INTERVAL_S", "60")))
+    yield
+    await transcription_jobs.stop()
+    await session_store.stop_sweeper()
+    await token_pool.stop()
+
 
 app = FastAPI(
     title="Kawkai API",
     description="AI Media Training Coach Backend",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 def _normalize_origin(origin: str) -> str:
@@ -44,6 +69,10 @@ cors_allow_origins = [
 
 cors_allow_credentials = "*" not in cors_allow_origins
 
+# Reject oversized session uploads from Content-Length before reading the body.
+# Added before CORS so CORS stays outermost and the 413 carries its headers.
+app.add_middleware(UploadSizeLimitMiddleware)
+
 # CORS middleware for frontend
 app.add_middleware(
     CORSMiddleware,
@@ -67,6 +96,7 @@ app.include_router(company_brief_router, prefix="/api", tags=["company"])
 app.include_router(scenario_router, prefix="/api", tags=["scenario"])
 app.include_router(sessions_router, prefix="/api/sessions", tags=["sessions"])
 app.include_router(face_nudge_router, prefix="/api/face", tags=["face"])
+app.include_router(metrics_router, prefix="/api/metrics", tags=["metrics"])
 
 
 @app.get("/health")
@@ -1,6 +1,7 @@
 from .session import (
     AnalysisStatus,
     TranscriptSegment,
+    NudgeEvent,
     SessionMetadata,
     SectionScores,
     TimestampedFlag,
@@ -9,10 +10,13 @@ from .session import (
     AnalysisResult,
     Session,
 )
+from .metric_series import MetricSeries
+from .word_timings import WordColumns
 
 __all__ = [
     "AnalysisStatus",
     "TranscriptSegment",
+    "NudgeEvent",
     "SessionMetadata",
     "SectionScores",
     "TimestampedFlag",
@@ -20,4 +24,6 @@ __all__ = [
     "Drill",
     "AnalysisResult",
     "Session",
+    "WordColumns",
+    "MetricSeries",
 ]
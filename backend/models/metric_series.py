@@ -0,0 +1,122 @@
+import os
+from typing import Iterable, Optional
+
+import numpy as np
+
+METRICS = ("wpm", "filler_rate", "prosody_variance")
+# Samples kept per session; the oldest are overwritten past this. Two hours
+# at the HUD's one sample per second.
+METRIC_BUFFER_SIZE = int(os.getenv("KAWKAI_METRIC_BUFFER_SIZE", "7200"))
+_INITIAL_SIZE = 256
+
+
+class MetricSeries:
+    """
+    Fixed-size ring buffer of live HUD metric samples: an int64 millisecond
+    time column and one float32 column per metric (NaN when a sample did not
+    carry it). Columns start small and double up to `capacity`; from then
+    on the oldest samples are overwritten. Appends are vectorized.
+    """
+
+    __slots__ = ("capacity", "t_ms", "values", "head", "count")
+
+    def __init__(self, capacity: int = METRIC_BUFFER_SIZE):
+        self.capacity = max(1, capacity)
+        self.head = 0  # next write position
+        self.count = 0
+        self._allocate(min(self.capacity, _INITIAL_SIZE))
+
+    def _allocate(self, size: int) -> None:
+        t_ms = np.zeros(size, dtype=np.int64)
+        values = {name: np.full(size, np.nan, dtype=np.float32) for name in METRICS}
+        if self.count:
+            # Only called before the buffer first wraps: samples sit at [0, count).
+            t_ms[: self.count] = self.t_ms[: self.count]
+            for name in METRICS:
+                values[name][: self.count] = self.values[name][: self.count]
+        self.t_ms, self.values = t_ms, values
+        self.head = self.count
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def last_t_ms(self) -> Optional[int]:
+        return int(self.t_ms[(self.head - 1) % len(self.t_ms)]) if self.count else None
+
+    def append(self, samples: Iterable[dict]) -> int:
+        """
+        Append `{t, <metric>: value, ...}` samples (t in ms). Samples not
+        after the newest one already stored are dropped, so a resent batch
+        is harmless. Returns how many were stored.
+        """
+        rows = sorted(samples, key=lambda s: s["t"])
+        last = self.last_t_ms
+        if last is not None:
+            rows = [r for r in rows if r["t"] > last]
+        deduped = {int(r["t"]): r for r in rows}  # one sample per millisecond
+        if not deduped:
+            return 0
+        times = np.fromiter(deduped, dtype=np.int64, count=len(deduped))
+        columns = {
+            name: np.array(
+                [r.get(name) if r.get(name) is not None else np.nan for r in deduped.values()],
+                dtype=np.float32,
+            )
+            for name in METRICS
+        }
+        if len(times) > self.capacity:
+            times = times[-self.capacity :]
+            columns = {name: col[-self.capacity :] for name, col in columns.items()}
+        size = len(self.t_ms)
+        needed = self.count + len(times)
+        if size < self.capacity and needed > size:
+            self._allocate(min(self.capacity, max(needed, 2 * size)))
+            size = len(self.t_ms)
+        positions = (self.head + np.arange(len(times))) % size
+        self.t_ms[positions] = times
+        for name, col in columns.items():
+            self.values[name][positions] = col
+        self.head = int((self.head + len(times)) % size)
+        self.count = min(size, self.count + len(times))
+        return len(times)
+
+    def _chronological(self, array: np.ndarray) -> np.ndarray:
+        if self.count < len(array):
+            return array[: self.count]
+        return np.concatenate((array[self.head :], array[: self.head]))
+
+    def series(self, name: str) -> tuple[np.ndarray, np.ndarray]:
+        """(t_ms, values) of one metric in time order, samples without it dropped."""
+        times = self._chronological(self.t_ms)
+        values = self._chronological(self.values[name])
+        present = ~np.isnan(values)
+        return times[present], values[present]
+
+    def to_dict(self) -> dict:
+        return {
+            "capacity": self.capacity,
+            "t_ms": self._chronological(self.t_ms).tolist(),
+            **{
+                name: [
+                    None if np.isnan(v) else round(float(v), 3)
+                    for v in self._chronological(self.values[name])
+                ]
+                for name in METRICS
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "MetricSeries":
+        series = cls(int(data.get("capacity", METRIC_BUFFER_SIZE)))
+        series.append(
+            {"t": t, **{name: data.get(name, [None] * len(data["t_ms"]))[i] for name in METRICS}}
+            for i, t in enumerate(data.get("t_ms", []))
+        )
+        return series
+
+    def nbytes(self) -> int:
+        return self.t_ms.nbytes + sum(col.nbytes for col in self.values.values())
+
+    def __repr__(self) -> str:
+        return f"MetricSeries({self.count}/{self.capacity} samples)"
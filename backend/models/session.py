@@ -1,7 +1,10 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, field_serializer, field_validator
 from typing import Optional, Literal
 from enum import Enum
 
+from .metric_series import MetricSeries
+from .word_timings import WordColumns
+
 
 class AnalysisStatus(str, Enum):
     PENDING = "pending"
@@ -17,11 +20,19 @@ class TranscriptSegment(BaseModel):
     endTime: float
 
 
+class NudgeEvent(BaseModel):
+    text: str
+    severity: Literal["gentle", "firm", "urgent"]
+    reason: str = ""
+    timestamp: float  # milliseconds
+
+
 class SessionMetadata(BaseModel):
     sessionId: str
     scenarioId: Optional[str] = None
     mode: Literal["coach", "journalist"]
-    transcript: list[TranscriptSegment]
+    # May be left empty when the segments were streamed live.
+    transcript: list[TranscriptSegment] = []
 
 
 class SectionScores(BaseModel):
@@ -63,11 +74,44 @@ class AnalysisResult(BaseModel):
 
 
 class Session(BaseModel):
+    model_config = ConfigDict(arbitrary_types_allowed=True, validate_assignment=True)
+
     id: str
     metadata: SessionMetadata
     audio_path: Optional[str] = None
     transcript_text: Optional[str] = None
-    word_timings: Optional[list[dict]] = None
+    # Stored column-wise; lists of `{word, start, end}` dicts are converted on
+    # construction/assignment and produced again when serializing.
+    word_timings: Optional[WordColumns] = None
     analysis: Optional[AnalysisResult] = None
+    # `status` tracks transcription; the LLM analysis runs afterwards on request.
+    analysis_status: AnalysisStatus = AnalysisStatus.PENDING
+    analysis_error: Optional[str] = None
+    # Running metrics from live ingestion, frozen when the recording arrived.
+    live_metrics: Optional[dict] = None
+    # HUD samples (wpm, filler rate, prosody variance) for timeline replay.
+    metric_series: Optional[MetricSeries] = None
     status: AnalysisStatus = AnalysisStatus.PENDING
     error: Optional[str] = None
+
+    @field_validator("word_timings", mode="before")
+    @classmethod
+    def _columnar_word_timings(cls, value):
+        if isinstance(value, list):
+            return WordColumns.from_dicts(value)
+        return value
+
+    @field_serializer("word_timings")
+    def _serialize_word_timings(self, value: Optional[WordColumns]):
+        return value.to_dicts() if value is not None else None
+
+    @field_validator("metric_series", mode="before")
+    @classmethod
+    def _ring_metric_series(cls, value):
+        if isinstance(value, dict):
+            return MetricSeries.from_dict(value)
+        return value
+
+    @field_serializer("metric_series")
+    def _serialize_metric_series(self, value: Optional[MetricSeries]):
+        return value.to_dict() if value is not None else None
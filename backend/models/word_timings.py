@@ -0,0 +1,61 @@
+import sys
+from array import array
+from typing import Iterable
+
+_intern = sys.intern
+
+
+class WordColumns:
+    """
+    Word timings stored column-wise: interned word strings plus int32
+    millisecond start/end arrays. A 30-minute session is ~5,000 words; as
+    `{word, start, end}` dicts that is over 1 MB resident, as columns about a
+    tenth of that. Materialize with `to_dicts()` only at the API boundary.
+    """
+
+    __slots__ = ("words", "start_ms", "end_ms")
+
+    def __init__(self, words: list[str], start_ms: array, end_ms: array):
+        if not len(words) == len(start_ms) == len(end_ms):
+            raise ValueError("Word timing columns must have equal length")
+        self.words = words
+        self.start_ms = start_ms
+        self.end_ms = end_ms
+
+    @classmethod
+    def from_dicts(cls, items: Iterable[dict]) -> "WordColumns":
+        items = list(items)
+        return cls(
+            [_intern(str(w["word"])) for w in items],
+            array("i", [round(w["start"] * 1000) for w in items]),
+            array("i", [round(w["end"] * 1000) for w in items]),
+        )
+
+    def to_dicts(self) -> list[dict]:
+        return [
+            {"word": word, "start": start / 1000, "end": end / 1000}
+            for word, start, end in zip(self.words, self.start_ms, self.end_ms)
+        ]
+
+    def nbytes(self) -> int:
+        """Approximate resident size; interned strings are shared and not counted."""
+        return (
+            sys.getsizeof(self.words)
+            + self.start_ms.buffer_info()[1] * self.start_ms.itemsize
+            + self.end_ms.buffer_info()[1] * self.end_ms.itemsize
+        )
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, WordColumns):
+            return NotImplemented
+        return (
+            self.words == other.words
+            and self.start_ms == other.start_ms
+            and self.end_ms == other.end_ms
+        )
+
+    def __repr__(self) -> str:
+        return f"WordColumns({len(self)} words)"
@@ -23,3 +23,12 @@ Rules:
 - If the image is unclear or ambiguous, set verified=false.
 - Keep the nudge under 10 words.
 """
+
+FACE_NUDGE_INPUT_GUIDE = """The next block is a compact JSON object describing one nudge:
+- reason: local trigger category (e.g. faceMissing, framing, lighting).
+- severity: gentle | firm | urgent.
+- context: optional scenario_id, user_goal and mode.
+- signals: optional 0-1 scores (face_present, framing, lighting, tracking_confidence); higher is better.
+- fallback_text: the locally generated nudge; rephrase it, do not change its intent.
+- t_ms: session time in milliseconds (informational only).
+"""
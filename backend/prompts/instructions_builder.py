@@ -1,5 +1,10 @@
 from __future__ import annotations
 
+import hashlib
+import os
+import re
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from typing import Optional
 
 from prompts.coach_system import COACH_SYSTEM_PROMPT
@@ -8,9 +13,32 @@ from prompts.journalist_system import (
     DEFAULT_JOURNALIST_QUESTIONS,
     create_journalist_prompt,
 )
-from prompts.scenario_library import get_journalist_scenario
-from prompts.counterparty_profiles import get_counterparty_profile
-from prompts.situation_modifiers import get_situation_modifier
+from prompts.scenario_library import JOURNALIST_SCENARIOS, get_journalist_scenario
+from prompts.counterparty_profiles import (
+    COUNTERPARTY_PROFILES,
+    get_counterparty_profile,
+    normalize_counterparty,
+)
+from prompts.situation_modifiers import (
+    SITUATION_MODIFIERS,
+    get_situation_modifier,
+    normalize_situation,
+)
+
+INSTRUCTIONS_CACHE_SIZE = int(os.getenv("REALTIME_INSTRUCTIONS_CACHE_SIZE", "256"))
+# Approximate token budget for realtime instructions; 0 disables trimming.
+INSTRUCTIONS_TOKEN_BUDGET = int(os.getenv("REALTIME_INSTRUCTIONS_TOKEN_BUDGET", "2500"))
+
+# Company brief fields dropped, in order, once user notes are gone and the
+# prompt is still over budget. Scenario questions are never trimmed.
+BRIEF_TRIM_ORDER = (
+    "unknowns",
+    "positioning_claims",
+    "customers_users",
+    "products_services",
+    "risk_areas",
+)
+TRUNCATION_MARKER = " [truncated]"
 
 
 def _field(summary, key: str):
@@ -146,3 +174,294 @@ def build_instructions(
         return COACH_SYSTEM_PROMPT
 
     return f"{COACH_SYSTEM_PROMPT}\n\n" + "\n\n".join(coach_blocks)
+
+
+# Word runs and single punctuation marks; long runs count as several tokens.
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+
+def estimate_tokens(text: Optional[str]) -> int:
+    """
+    Cheap approximation of BPE token count: one token per short word or
+    punctuation mark, more for long runs. Good enough for budgeting, not billing.
+    """
+    if not text:
+        return 0
+    return sum(1 + (len(piece) - 1) // 6 for piece in _TOKEN_PATTERN.findall(text))
+
+
+@dataclass
+class BudgetedInstructions:
+    text: str
+    tokens_before: int
+    tokens_after: int
+    budget: int
+    trimmed: list[str] = field(default_factory=list)
+    fingerprint: str = ""
+
+    @property
+    def over_budget(self) -> bool:
+        return bool(self.budget) and self.tokens_after > self.budget
+
+
+def _summary_dict(company_brief_summary) -> Optional[dict]:
+    if company_brief_summary is None:
+        return None
+    if hasattr(company_brief_summary, "model_dump"):
+        return company_brief_summary.model_dump()
+    if isinstance(company_brief_summary, dict):
+        return dict(company_brief_summary)
+    return None
+
+
+def _truncate_notes(notes: str, keep_ratio: float) -> str:
+    cut = max(0, int(len(notes) * keep_ratio))
+    truncated = notes[:cut]
+    if cut < len(notes) and " " in truncated:
+        truncated = truncated[: truncated.rfind(" ")]
+    return truncated.rstrip() + TRUNCATION_MARKER
+
+
+def build_budgeted_instructions(
+    mode: str,
+    scenario_id: Optional[str],
+    counterparty: Optional[str],
+    situation: Optional[str],
+    company_url: Optional[str],
+    company_notes: Optional[str],
+    company_brief_summary,
+    scenario_override: Optional[dict] = None,
+    budget: int = INSTRUCTIONS_TOKEN_BUDGET,
+) -> BudgetedInstructions:
+    """
+    `build_instructions`, then trim company context until the estimated
+    token count fits `budget`: user notes are truncated and then dropped,
+    followed by brief fields in BRIEF_TRIM_ORDER.
+    """
+    notes = company_notes
+    summary = company_brief_summary
+
+    def render() -> str:
+        return build_instructions(
+            mode=mode,
+            scenario_id=scenario_id,
+            counterparty=counterparty,
+            situation=situation,
+            company_url=company_url,
+            company_notes=notes,
+            company_brief_summary=summary,
+            scenario_override=scenario_override,
+        )
+
+    text = render()
+    tokens_before = tokens = estimate_tokens(text)
+    trimmed: list[str] = []
+
+    if budget and tokens > budget and notes:
+        notes_text = str(notes)
+        notes_tokens = estimate_tokens(notes_text)
+        keep_ratio = (notes_tokens - (tokens - budget)) / max(1, notes_tokens)
+        # Estimation is not exactly linear in length; shrink a few times before dropping.
+        for _ in range(3):
+            if keep_ratio <= 0 or len(notes_text) * keep_ratio < 40:
+                break
+            notes = _truncate_notes(notes_text, keep_ratio)
+            text = render()
+            tokens = estimate_tokens(text)
+            if tokens <= budget:
+                break
+            keep_ratio *= 0.8
+        if tokens <= budget:
+            trimmed.append("company_notes:truncated")
+        else:
+            notes = None
+            text = render()
+            tokens = estimate_tokens(text)
+            trimmed.append("company_notes")
+
+    if budget and tokens > budget:
+        summary_dict = _summary_dict(summary)
+        for key in BRIEF_TRIM_ORDER:
+            if tokens <= budget or summary_dict is None:
+                break
+            if not summary_dict.get(key):
+                continue
+            summary_dict[key] = []
+            summary = summary_dict
+            text = render()
+            tokens = estimate_tokens(text)
+            trimmed.append(key)
+
+    return BudgetedInstructions(
+        text=text,
+        tokens_before=tokens_before,
+        tokens_after=tokens,
+        budget=budget,
+        trimmed=trimmed,
+    )
+
+
+# Built-in (no company context) combinations, filled once at startup.
+_precomputed_instructions: dict[tuple, BudgetedInstructions] = {}
+# Bounded LRU for everything else (custom scenarios, company briefs, notes).
+_instructions_cache: OrderedDict[tuple, BudgetedInstructions] = OrderedDict()
+_instructions_cache_stats = {"hits": 0, "misses": 0, "evictions": 0, "trimmed": 0}
+
+
+def _freeze(value):
+    kind = type(value)
+    if kind is str or value is None:
+        return value
+    if kind is dict:
+        return tuple(sorted([(str(k), _freeze(v)) for k, v in value.items()]))
+    if kind is list or kind is tuple:
+        return tuple([_freeze(v) for v in value])
+    if hasattr(value, "model_dump"):
+        return _freeze(value.model_dump())
+    return value
+
+
+def instructions_cache_key(
+    mode: str,
+    scenario_id: Optional[str],
+    counterparty: Optional[str],
+    situation: Optional[str],
+    company_url: Optional[str],
+    company_notes: Optional[str],
+    company_brief_summary,
+    scenario_override: Optional[dict] = None,
+) -> tuple:
+    """
+    Hashable key over the inputs after the same normalization
+    `build_instructions` applies, so equivalent requests share one entry.
+    """
+    has_override = isinstance(scenario_override, dict) and bool(scenario_override)
+    return (
+        "journalist" if mode == "journalist" else "coach",
+        None if has_override else (scenario_id or None),
+        _freeze(scenario_override) if has_override else None,
+        normalize_counterparty(counterparty),
+        normalize_situation(situation),
+        company_url or None,
+        company_notes or None,
+        _freeze(company_brief_summary) or None,
+    )
+
+
+def instructions_fingerprint(key: tuple) -> str:
+    """Stable (cross-process) hex digest of an `instructions_cache_key`."""
+    return hashlib.sha256(repr(key).encode("utf-8")).hexdigest()
+
+
+def budgeted_instructions_cached(
+    mode: str,
+    scenario_id: Optional[str],
+    counterparty: Optional[str],
+    situation: Optional[str],
+    company_url: Optional[str],
+    company_notes: Optional[str],
+    company_brief_summary,
+    scenario_override: Optional[dict] = None,
+) -> BudgetedInstructions:
+    """Memoized `build_budgeted_instructions` at INSTRUCTIONS_TOKEN_BUDGET."""
+    key = instructions_cache_key(
+        mode,
+        scenario_id,
+        counterparty,
+        situation,
+        company_url,
+        company_notes,
+        company_brief_summary,
+        scenario_override,
+    )
+
+    precomputed = _precomputed_instructions.get(key)
+    if precomputed is not None:
+        _instructions_cache_stats["hits"] += 1
+        return precomputed
+
+    cached = _instructions_cache.get(key)
+    if cached is not None:
+        _instructions_cache.move_to_end(key)
+        _instructions_cache_stats["hits"] += 1
+        return cached
+
+    _instructions_cache_stats["misses"] += 1
+    result = build_budgeted_instructions(
+        mode=mode,
+        scenario_id=scenario_id,
+        counterparty=counterparty,
+        situation=situation,
+        company_url=company_url,
+        company_notes=company_notes,
+        company_brief_summary=company_brief_summary,
+        scenario_override=scenario_override,
+    )
+    result.fingerprint = instructions_fingerprint(key)
+    if result.trimmed:
+        _instructions_cache_stats["trimmed"] += 1
+    if INSTRUCTIONS_CACHE_SIZE > 0:
+        _instructions_cache[key] = result
+        while len(_instructions_cache) > INSTRUCTIONS_CACHE_SIZE:
+            _instructions_cache.popitem(last=False)
+            _instructions_cache_stats["evictions"] += 1
+    return result
+
+
+def build_instructions_cached(
+    mode: str,
+    scenario_id: Optional[str],
+    counterparty: Optional[str],
+    situation: Optional[str],
+    company_url: Optional[str],
+    company_notes: Optional[str],
+    company_brief_summary,
+    scenario_override: Optional[dict] = None,
+) -> str:
+    """Memoized, budgeted `build_instructions` text."""
+    return budgeted_instructions_cached(
+        mode,
+        scenario_id,
+        counterparty,
+        situation,
+        company_url,
+        company_notes,
+        company_brief_summary,
+        scenario_override,
+    ).text
+
+
+def precompute_builtin_instructions() -> int:
+    """
+    Build every built-in mode x scenario x counterparty x situation combination
+    (without company context). Returns the number of entries.
+    """
+    for mode in ("coach", "journalist"):
+        for scenario_id in [None, *JOURNALIST_SCENARIOS]:
+            for counterparty in [None, *COUNTERPARTY_PROFILES]:
+                for situation in [None, *SITUATION_MODIFIERS]:
+                    key = instructions_cache_key(
+                        mode, scenario_id, counterparty, situation, None, None, None
+                    )
+                    result = build_budgeted_instructions(
+                        mode=mode,
+                        scenario_id=scenario_id,
+                        counterparty=counterparty,
+                        situation=situation,
+                        company_url=None,
+                        company_notes=None,
+                        company_brief_summary=None,
+                    )
+                    result.fingerprint = instructions_fingerprint(key)
+                    _precomputed_instructions[key] = result
+    return len(_precomputed_instructions)
+
+
+def instructions_cache_info() -> dict:
+    return {
+        **_instructions_cache_stats,
+        "size": len(_instructions_cache),
+        "max_size": INSTRUCTIONS_CACHE_SIZE,
+        "precomputed": len(_precomputed_instructions),
+        "token_budget": INSTRUCTIONS_TOKEN_BUDGET,
+    }
@@ -6,7 +6,16 @@ import unittest
 # Ensure `prompts.*` imports work when running from repo root.
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
-from prompts.instructions_builder import build_instructions, format_company_brief  # noqa: E402
+from prompts.instructions_builder import (  # noqa: E402
+    build_budgeted_instructions,
+    build_instructions,
+    build_instructions_cached,
+    estimate_tokens,
+    format_company_brief,
+    instructions_cache_key,
+    precompute_builtin_instructions,
+)
+from prompts.scenario_library import JOURNALIST_SCENARIOS, get_journalist_scenario  # noqa: E402
 
 
 class TestInstructionsBuilder(unittest.TestCase):
@@ -70,6 +79,89 @@ class TestInstructionsBuilder(unittest.TestCase):
         self.assertIn("Override context", prompt)
         self.assertIn("Override question", prompt)
 
+    def test_get_journalist_scenario_returns_a_copy(self):
+        scenario = get_journalist_scenario("crisis-layoffs")
+        scenario["questions"].clear()
+        scenario["context"] = "mutated"
+        self.assertEqual(len(JOURNALIST_SCENARIOS["crisis-layoffs"]["questions"]), 3)
+        self.assertEqual(get_journalist_scenario("crisis-layoffs")["questions"][0]["text"][:7], "Can you")
+
+    def test_cache_key_normalizes_equivalent_inputs(self):
+        args = dict(
+            scenario_id=None,
+            company_url=None,
+            company_notes=None,
+            company_brief_summary=None,
+        )
+        self.assertEqual(
+            instructions_cache_key(mode="coach", counterparty="Stake Holder", situation=" Crisis ", **args),
+            instructions_cache_key(mode="other", counterparty="stakeholder", situation="crisis", **args),
+        )
+        self.assertNotEqual(
+            instructions_cache_key(mode="journalist", counterparty=None, situation=None, **args),
+            instructions_cache_key(mode="coach", counterparty=None, situation=None, **args),
+        )
+
+    def test_cached_build_matches_uncached(self):
+        self.assertGreater(precompute_builtin_instructions(), 0)
+        for kwargs in (
+            dict(
+                mode="journalist",
+                scenario_id="crisis-layoffs",
+                counterparty="customer",
+                situation="crisis",
+                company_url=None,
+                company_notes=None,
+                company_brief_summary=None,
+            ),
+            dict(
+                mode="coach",
+                scenario_id=None,
+                counterparty=None,
+                situation=None,
+                company_url="https://example.com",
+                company_notes="Notes",
+                company_brief_summary={"one_liner": "ExampleCo", "unknowns": ["a", "b"]},
+            ),
+        ):
+            expected = build_instructions(**kwargs)
+            self.assertEqual(build_instructions_cached(**kwargs), expected)
+            self.assertEqual(build_instructions_cached(**kwargs), expected)
+
+    def test_budget_trims_notes_before_brief_fields(self):
+        kwargs = dict(
+            mode="coach",
+            scenario_id=None,
+            counterparty=None,
+            situation=None,
+            company_url="https://example.com",
+            company_notes="Background detail about the company roadmap. " * 300,
+            company_brief_summary={
+                "one_liner": "ExampleCo",
+                "unknowns": ["Headcount"],
+                "risk_areas": ["Data privacy"],
+            },
+        )
+        untrimmed = build_budgeted_instructions(**kwargs, budget=0)
+        self.assertEqual(untrimmed.trimmed, [])
+        self.assertEqual(untrimmed.tokens_before, untrimmed.tokens_after)
+
+        base = estimate_tokens(
+            build_instructions(**{**kwargs, "company_notes": None})
+        )
+        result = build_budgeted_instructions(**kwargs, budget=base + 100)
+        self.assertEqual(result.trimmed, ["company_notes:truncated"])
+        self.assertLessEqual(result.tokens_after, base + 100)
+        self.assertGreater(result.tokens_before, result.tokens_after)
+        self.assertIn("[truncated]", result.text)
+        self.assertIn("Unknowns: Headcount", result.text)
+
+        result = build_budgeted_instructions(**kwargs, budget=base - 2)
+        self.assertEqual(result.trimmed[:2], ["company_notes", "unknowns"])
+        self.assertNotIn("<user_notes>", result.text)
+        self.assertNotIn("Unknowns:", result.text)
+        self.assertIn("Risk Areas: Data privacy", result.text)
+
 
 if __name__ == "__main__":
     unittest.main()
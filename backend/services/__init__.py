@@ -1,3 +1,4 @@
 from .session_store import session_store
+from .model_router import model_router
 
-__all__ = ["session_store"]
+__all__ = ["session_store", "model_router"]
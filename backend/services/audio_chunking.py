@@ -0,0 +1,205 @@
+import io
+import logging
+import re
+import shutil
+import subprocess
+import wave
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+logger = logging.getLogger("kawkai")
+
+_FRAME_MS = 30
+_FFMPEG_SAMPLE_RATE = 16000
+# Words from neighbouring chunks closer than this with the same text are one word.
+_SEAM_DUPLICATE_S = 0.3
+_WORD_KEY = re.compile(r"[^\w']+")
+
+
+@dataclass
+class PcmAudio:
+    samples: np.ndarray  # int16, mono
+    sample_rate: int
+
+    @property
+    def duration_s(self) -> float:
+        return len(self.samples) / self.sample_rate
+
+
+@dataclass
+class AudioChunk:
+    index: int
+    start_s: float  # audio sent upstream, including overlap
+    end_s: float
+    own_start_s: float  # words whose midpoint falls here belong to this chunk
+    own_end_s: float
+
+
+def _decode_wav(data: bytes) -> Optional[PcmAudio]:
+    try:
+        with wave.open(io.BytesIO(data)) as wav:
+            if wav.getsampwidth() != 2:
+                return None
+            channels = wav.getnchannels()
+            rate = wav.getframerate()
+            frames = wav.readframes(wav.getnframes())
+    except (wave.Error, EOFError):
+        return None
+    samples = np.frombuffer(frames, dtype="<i2")
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1).astype(np.int16)
+    return PcmAudio(samples, rate)
+
+
+def _decode_ffmpeg(data: bytes) -> Optional[PcmAudio]:
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None:
+        return None
+    try:
+        result = subprocess.run(
+            [
+                ffmpeg, "-v", "error", "-i", "pipe:0",
+                "-ac", "1", "-ar", str(_FFMPEG_SAMPLE_RATE), "-f", "s16le", "pipe:1",
+            ],
+            input=data,
+            capture_output=True,
+            timeout=120,
+            check=True,
+        )
+    except (OSError, subprocess.SubprocessError) as exc:
+        logger.warning("ffmpeg decode failed: %s", exc)
+        return None
+    return PcmAudio(np.frombuffer(result.stdout, dtype="<i2"), _FFMPEG_SAMPLE_RATE)
+
+
+def _is_wav(head: bytes) -> bool:
+    return head[:4] == b"RIFF" and head[8:12] == b"WAVE"
+
+
+def can_decode(head: bytes) -> bool:
+    """Cheap pre-check from the first 12 bytes, before reading the whole file."""
+    return _is_wav(head) or shutil.which("ffmpeg") is not None
+
+
+def decode_pcm(data: bytes) -> Optional[PcmAudio]:
+    """
+    Decode to 16-bit mono PCM: WAV natively, anything else through ffmpeg
+    when it is installed. Returns None when the audio cannot be decoded.
+    """
+    if _is_wav(data):
+        return _decode_wav(data)
+    return _decode_ffmpeg(data)
+
+
+def encode_wav(samples: np.ndarray, sample_rate: int) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(samples.astype("<i2").tobytes())
+    return buffer.getvalue()
+
+
+def frame_energy(audio: PcmAudio, frame_ms: int = _FRAME_MS) -> np.ndarray:
+    """RMS energy per `frame_ms` frame."""
+    frame = max(1, audio.sample_rate * frame_ms // 1000)
+    count = len(audio.samples) // frame
+    frames = audio.samples[: count * frame].astype(np.float32).reshape(count, frame)
+    return np.sqrt(np.mean(frames * frames, axis=1))
+
+
+def find_split_points(
+    audio: PcmAudio,
+    *,
+    target_chunk_s: float,
+    search_window_s: float,
+    frame_ms: int = _FRAME_MS,
+) -> list[float]:
+    """
+    Cut points (seconds) roughly every `target_chunk_s`, each placed at the
+    quietest stretch within `search_window_s` before the target. Quietness is
+    a ~300 ms moving average of frame energy, so cuts land inside pauses
+    rather than on a single quiet frame between syllables.
+    """
+    energy = frame_energy(audio, frame_ms)
+    frames_per_s = 1000 / frame_ms
+    smooth = max(1, int(round(0.3 * frames_per_s)))
+    smoothed = np.convolve(energy, np.ones(smooth) / smooth, mode="same")
+
+    points: list[float] = []
+    last = 0.0
+    while audio.duration_s - last > target_chunk_s * 1.25:
+        target = last + target_chunk_s
+        lo = int(max(last + target_chunk_s / 2, target - search_window_s) * frames_per_s)
+        hi = int(target * frames_per_s)
+        window = smoothed[lo:hi]
+        cut = (lo + int(np.argmin(window))) / frames_per_s if len(window) else target
+        points.append(round(cut, 3))
+        last = cut
+    return points
+
+
+def plan_chunks(
+    duration_s: float, split_points: list[float], overlap_s: float
+) -> list[AudioChunk]:
+    bounds = [0.0, *split_points, duration_s]
+    return [
+        AudioChunk(
+            index=i,
+            start_s=max(0.0, bounds[i] - overlap_s),
+            end_s=min(duration_s, bounds[i + 1] + overlap_s),
+            own_start_s=bounds[i],
+            own_end_s=bounds[i + 1],
+        )
+        for i in range(len(bounds) - 1)
+    ]
+
+
+def chunk_wav(audio: PcmAudio, chunk: AudioChunk) -> bytes:
+    start = int(chunk.start_s * audio.sample_rate)
+    end = int(chunk.end_s * audio.sample_rate)
+    return encode_wav(audio.samples[start:end], audio.sample_rate)
+
+
+def owns(chunk: AudioChunk, start_s: float, end_s: float) -> bool:
+    """Whether a chunk-relative item (word or segment) is centred in the span the chunk owns."""
+    mid = chunk.start_s + (start_s + end_s) / 2
+    if mid < chunk.own_start_s:
+        return False
+    return mid < chunk.own_end_s or chunk.own_end_s >= chunk.end_s
+
+
+def _word_key(word: str) -> str:
+    return _WORD_KEY.sub("", word).lower()
+
+
+def stitch_words(results: list[tuple[AudioChunk, list[dict]]]) -> list[dict]:
+    """
+    Shift chunk-relative word times to absolute ones and merge chunks: each
+    chunk keeps the words centred in the span it owns. Only across a seam,
+    the first word of a chunk is dropped when it repeats the previous chunk's
+    last word within `_SEAM_DUPLICATE_S` inside the overlap window, so real
+    repeats within a chunk ("the the") survive.
+    """
+    words: list[dict] = []
+    for chunk, chunk_words in sorted(results, key=lambda item: item[0].index):
+        seam = len(words)  # words before this index came from earlier chunks
+        overlap_s = chunk.own_start_s - chunk.start_s
+        for w in chunk_words:
+            if not owns(chunk, w["start"], w["end"]):
+                continue
+            start = round(w["start"] + chunk.start_s, 3)
+            end = round(w["end"] + chunk.start_s, 3)
+            if (
+                seam
+                and len(words) == seam
+                and abs(start - chunk.own_start_s) <= overlap_s
+                and _word_key(words[-1]["word"]) == _word_key(w["word"])
+                and abs(words[-1]["start"] - start) < _SEAM_DUPLICATE_S
+            ):
+                continue
+            words.append({"word": w["word"], "start": start, "end": end})
+    return words
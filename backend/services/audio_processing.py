@@ -0,0 +1,278 @@
+import asyncio
+import logging
+import os
+import shutil
+import subprocess
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from services.audio_chunking import (
+    PcmAudio,
+    can_decode,
+    decode_pcm,
+    encode_wav,
+    frame_energy,
+)
+from services.audio_spool import AudioSpool
+
+logger = logging.getLogger("kawkai")
+
+# Upload audio is normalized (mono, 16 kHz, long pauses shortened) before it
+# is sent upstream. Off by default: it changes the audio the model hears.
+NORMALIZE_ENABLED = os.getenv("KAWKAI_AUDIO_NORMALIZE", "false").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+# Silences longer than this are shortened to this length.
+MAX_SILENCE_S = float(os.getenv("KAWKAI_AUDIO_MAX_SILENCE_S", "1.0"))
+TARGET_SAMPLE_RATE = 16000
+
+_FRAME_MS = 30
+# Speech frames are padded by this much on both sides so word onsets and
+# trailing consonants are never cut.
+_HANGOVER_S = 0.2
+# RMS floor (int16 scale, about -50 dBFS) below which a frame is always silence.
+_MIN_SPEECH_RMS = 100.0
+# Not worth swapping the upload for less than this.
+_MIN_SECONDS_SAVED = 0.5
+
+normalization_stats = {
+    "normalized": 0,
+    "skipped": 0,
+    "bytes_in": 0,
+    "bytes_out": 0,
+    "seconds_in": 0.0,
+    "seconds_out": 0.0,
+}
+
+
+@dataclass
+class OffsetMap:
+    """
+    Piecewise-linear map from processed time back to original time: kept
+    span i starts at `processed_starts[i]` in the processed audio and at
+    `original_starts[i]` in the upload.
+    """
+
+    processed_starts: np.ndarray
+    original_starts: np.ndarray
+
+    def to_original(self, times) -> np.ndarray:
+        times = np.asarray(times, dtype=np.float64)
+        span = np.searchsorted(self.processed_starts, times, side="right") - 1
+        span = np.clip(span, 0, len(self.processed_starts) - 1)
+        return self.original_starts[span] + (times - self.processed_starts[span])
+
+    def restore_words(self, words: list[dict]) -> list[dict]:
+        """Word timings on the processed audio → timings on the original upload."""
+        if not words:
+            return words
+        starts = self.to_original([w["start"] for w in words])
+        ends = self.to_original([w["end"] for w in words])
+        return [
+            {**w, "start": round(float(s), 3), "end": round(float(e), 3)}
+            for w, s, e in zip(words, starts, ends)
+        ]
+
+
+@dataclass
+class NormalizationReport:
+    original_bytes: int
+    processed_bytes: int
+    original_s: float
+    processed_s: float
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.original_bytes - self.processed_bytes
+
+    @property
+    def seconds_saved(self) -> float:
+        return round(self.original_s - self.processed_s, 3)
+
+
+@dataclass
+class NormalizedAudio:
+    audio: AudioSpool
+    offsets: OffsetMap
+    report: NormalizationReport
+
+
+def resample(samples: np.ndarray, from_rate: int, to_rate: int) -> np.ndarray:
+    """
+    Resample int16 audio. Integer ratios (48 kHz → 16 kHz) average each group
+    of samples, which doubles as a simple low-pass; other ratios interpolate.
+    """
+    if from_rate == to_rate or len(samples) == 0:
+        return samples
+    if from_rate % to_rate == 0:
+        factor = from_rate // to_rate
+        count = len(samples) // factor
+        grouped = samples[: count * factor].reshape(count, factor).astype(np.float32)
+        return np.rint(grouped.mean(axis=1)).astype(np.int16)
+    count = int(round(len(samples) * to_rate / from_rate))
+    positions = np.arange(count) * (from_rate / to_rate)
+    resampled = np.interp(positions, np.arange(len(samples)), samples.astype(np.float32))
+    return np.rint(resampled).astype(np.int16)
+
+
+def speech_frames(audio: PcmAudio, frame_ms: int = _FRAME_MS) -> np.ndarray:
+    """
+    Energy VAD: a frame is speech when its RMS clears both an absolute floor
+    and 3x the recording's noise floor (10th percentile), padded by
+    `_HANGOVER_S` on each side.
+    """
+    energy = frame_energy(audio, frame_ms)
+    if len(energy) == 0:
+        return np.zeros(0, dtype=bool)
+    threshold = max(_MIN_SPEECH_RMS, 3.0 * float(np.percentile(energy, 10)))
+    voiced = energy > threshold
+    pad = int(round(_HANGOVER_S * 1000 / frame_ms))
+    if pad:
+        voiced = np.convolve(voiced, np.ones(2 * pad + 1), mode="same") > 0
+    return voiced
+
+
+def kept_spans(
+    voiced: np.ndarray, frame_samples: int, total_samples: int, max_silence_s: float, rate: int
+) -> list[tuple[int, int]]:
+    """
+    Sample ranges to keep: everything except the middle of silent runs
+    longer than `max_silence_s`, which keep half that length on each side.
+    """
+    max_frames = max(1, int(max_silence_s * rate / frame_samples))
+    keep_each_side = max_frames // 2
+    spans: list[tuple[int, int]] = []
+    start = 0
+    # Boundaries of runs of equal values in `voiced`.
+    edges = np.flatnonzero(np.diff(voiced.astype(np.int8))) + 1
+    bounds = [0, *edges.tolist(), len(voiced)]
+    for a, b in zip(bounds, bounds[1:]):
+        if voiced[a] or b - a <= max_frames:
+            continue
+        cut_from = (a + keep_each_side) * frame_samples
+        cut_to = (b - keep_each_side) * frame_samples
+        if b == len(voiced):
+            cut_to = total_samples
+        if cut_from > start:
+            spans.append((start, cut_from))
+        start = cut_to
+    if start < total_samples:
+        spans.append((start, total_samples))
+    return spans
+
+
+def _encode_opus(samples: np.ndarray, rate: int) -> Optional[bytes]:
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None:
+        return None
+    try:
+        result = subprocess.run(
+            [
+                ffmpeg, "-v", "error", "-f", "s16le", "-ar", str(rate), "-ac", "1",
+                "-i", "pipe:0", "-c:a", "libopus", "-b:a", "24k",
+                "-application", "voip", "-f", "ogg", "pipe:1",
+            ],
+            input=samples.astype("<i2").tobytes(),
+            capture_output=True,
+            timeout=120,
+            check=True,
+        )
+    except (OSError, subprocess.SubprocessError) as exc:
+        logger.warning("ffmpeg encode failed: %s", exc)
+        return None
+    return result.stdout
+
+
+def normalize_pcm(
+    data: bytes, *, max_silence_s: float = MAX_SILENCE_S
+) -> Optional[tuple[bytes, str, OffsetMap, NormalizationReport]]:
+    """
+    Decode, downmix, resample to 16 kHz and shorten long silences. WAV
+    uploads come back as 16 kHz mono WAV; compressed uploads (decoded
+    through ffmpeg) are re-encoded as Opus so the result stays small.
+    Returns (audio bytes, content type, offset map, report), or None when the
+    audio cannot be decoded.
+    """
+    pcm = decode_pcm(data)
+    if pcm is None or len(pcm.samples) == 0:
+        return None
+    original_s = pcm.duration_s
+    samples = resample(pcm.samples, pcm.sample_rate, TARGET_SAMPLE_RATE)
+    audio = PcmAudio(samples, TARGET_SAMPLE_RATE)
+
+    frame_samples = TARGET_SAMPLE_RATE * _FRAME_MS // 1000
+    spans = kept_spans(
+        speech_frames(audio), frame_samples, len(samples), max_silence_s, TARGET_SAMPLE_RATE
+    )
+    if not spans:
+        spans = [(0, len(samples))]
+    lengths = np.array([b - a for a, b in spans])
+    offsets = OffsetMap(
+        processed_starts=np.concatenate(([0], np.cumsum(lengths)[:-1])) / TARGET_SAMPLE_RATE,
+        original_starts=np.array([a for a, _ in spans]) / TARGET_SAMPLE_RATE,
+    )
+    trimmed = np.concatenate([samples[a:b] for a, b in spans])
+
+    encoded, content_type = None, "audio/wav"
+    if not data.startswith(b"RIFF"):
+        encoded, content_type = _encode_opus(trimmed, TARGET_SAMPLE_RATE), "audio/ogg"
+    if encoded is None:
+        encoded, content_type = encode_wav(trimmed, TARGET_SAMPLE_RATE), "audio/wav"
+    report = NormalizationReport(
+        original_bytes=len(data),
+        processed_bytes=len(encoded),
+        original_s=round(original_s, 3),
+        processed_s=round(len(trimmed) / TARGET_SAMPLE_RATE, 3),
+    )
+    return encoded, content_type, offsets, report
+
+
+async def normalize_audio(audio: AudioSpool) -> Optional[NormalizedAudio]:
+    """
+    Normalized copy of a spooled upload, or None when it can't be decoded
+    here or normalizing would save neither upstream seconds nor bytes.
+    """
+    if not can_decode(await audio.read_head(12)):
+        normalization_stats["skipped"] += 1
+        return None
+    data = await audio.read_all()
+    processed = await asyncio.to_thread(normalize_pcm, data)
+    del data
+    if processed is None:
+        normalization_stats["skipped"] += 1
+        return None
+    encoded, content_type, offsets, report = processed
+    if report.seconds_saved < _MIN_SECONDS_SAVED and report.bytes_saved <= 0:
+        normalization_stats["skipped"] += 1
+        return None
+
+    extension = "wav" if content_type == "audio/wav" else "ogg"
+    spool = AudioSpool(filename=f"normalized.{extension}", content_type=content_type)
+    await spool.write(encoded)
+    normalization_stats["normalized"] += 1
+    normalization_stats["bytes_in"] += report.original_bytes
+    normalization_stats["bytes_out"] += report.processed_bytes
+    normalization_stats["seconds_in"] += report.original_s
+    normalization_stats["seconds_out"] += report.processed_s
+    logger.info(
+        "Normalized audio: %.1f s -> %.1f s, %d -> %d bytes",
+        report.original_s,
+        report.processed_s,
+        report.original_bytes,
+        report.processed_bytes,
+    )
+    return NormalizedAudio(spool, offsets, report)
+
+
+def normalization_summary() -> dict:
+    stats = dict(normalization_stats)
+    stats["seconds_in"] = round(stats["seconds_in"], 1)
+    stats["seconds_out"] = round(stats["seconds_out"], 1)
+    stats["bytes_saved"] = stats["bytes_in"] - stats["bytes_out"]
+    stats["seconds_saved"] = round(stats["seconds_in"] - stats["seconds_out"], 1)
+    stats["enabled"] = NORMALIZE_ENABLED
+    return stats
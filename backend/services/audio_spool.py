@@ -0,0 +1,223 @@
+import asyncio
+import hashlib
+import os
+import shutil
+import tempfile
+from typing import AsyncIterator, BinaryIO, Optional
+
+from fastapi import HTTPException
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+MAX_UPLOAD_BYTES = int(os.getenv("KAWKAI_MAX_UPLOAD_BYTES", str(100 * 1024 * 1024)))
+SPOOL_MEMORY_BYTES = int(os.getenv("KAWKAI_AUDIO_SPOOL_MEMORY_BYTES", str(4 * 1024 * 1024)))
+# Multipart framing and form fields around the audio part.
+_MULTIPART_OVERHEAD_BYTES = 64 * 1024
+_CHUNK_BYTES = 256 * 1024
+
+
+class UploadTooLarge(Exception):
+    pass
+
+
+class AudioSpool:
+    """
+    Upload body buffered in memory up to `memory_limit` bytes and rolled over
+    to a temporary file beyond that. Disk I/O runs in worker threads so the
+    event loop never blocks on it; in-memory reads and writes stay inline.
+    The body is SHA-256 hashed as it is written, so `sha256` is known as soon
+    as the upload finishes without a second pass.
+    """
+
+    def __init__(
+        self,
+        *,
+        filename: Optional[str] = None,
+        content_type: Optional[str] = None,
+        memory_limit: int = SPOOL_MEMORY_BYTES,
+        max_bytes: int = MAX_UPLOAD_BYTES,
+    ):
+        self.filename = filename
+        self.content_type = content_type
+        self.memory_limit = memory_limit
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._file: BinaryIO = tempfile.SpooledTemporaryFile(max_size=memory_limit)
+        self._on_disk = False
+        self._digest = hashlib.sha256()
+
+    @classmethod
+    async def from_path(
+        cls, path: str, *, filename: Optional[str] = None, content_type: Optional[str] = None
+    ) -> "AudioSpool":
+        """Wrap an existing file (read-only) so it can be streamed like a spool."""
+        spool = cls(filename=filename or os.path.basename(path), content_type=content_type)
+        spool._file.close()
+        spool._file = await asyncio.to_thread(open, path, "rb")
+        spool._on_disk = True
+        spool._digest = None  # not written through the spool
+        spool.size = await asyncio.to_thread(os.path.getsize, path)
+        return spool
+
+    @classmethod
+    async def from_upload(cls, upload, **kwargs) -> "AudioSpool":
+        """
+        Adopt a Starlette `UploadFile`'s already spooled body instead of copying
+        it: one read pass hashes it and enforces `max_bytes`. The upload is left
+        holding an empty buffer, so closing it does not close the adopted body.
+        """
+        spool = cls(filename=upload.filename, content_type=upload.content_type, **kwargs)
+        spool._file.close()
+        spool._file = upload.file
+        spool._on_disk = getattr(upload.file, "_rolled", True)
+        upload.file = tempfile.SpooledTemporaryFile()
+
+        def _scan() -> int:
+            spool._file.seek(0)
+            size = 0
+            while chunk := spool._file.read(_CHUNK_BYTES):
+                spool._digest.update(chunk)
+                size += len(chunk)
+            return size
+
+        try:
+            spool.size = await asyncio.to_thread(_scan) if spool._on_disk else _scan()
+            if spool.size > spool.max_bytes:
+                raise UploadTooLarge(f"Upload exceeds {spool.max_bytes} bytes")
+        except BaseException:
+            await spool.aclose()
+            raise
+        return spool
+
+    @property
+    def in_memory(self) -> bool:
+        return not self._on_disk
+
+    @property
+    def sha256(self) -> Optional[str]:
+        """Hex digest of everything written so far; None for `from_path` spools."""
+        return self._digest.hexdigest() if self._digest is not None else None
+
+    async def write(self, data: bytes) -> None:
+        if self.size + len(data) > self.max_bytes:
+            raise UploadTooLarge(f"Upload exceeds {self.max_bytes} bytes")
+        self.size += len(data)
+        if self._on_disk or self.size > self.memory_limit:
+            # This write rolls the buffer over (or appends to it) on disk;
+            # hashing large chunks releases the GIL, so it rides along.
+            await asyncio.to_thread(self._hash_and_write, data)
+            self._on_disk = True
+        else:
+            self._hash_and_write(data)
+
+    def _hash_and_write(self, data: bytes) -> None:
+        if self._digest is not None:
+            self._digest.update(data)
+        self._file.seek(0, os.SEEK_END)  # reads may have moved the position
+        self._file.write(data)
+
+    async def iter_bytes(self, chunk_size: int = _CHUNK_BYTES) -> AsyncIterator[bytes]:
+        """Yield the spooled body from the start, one pass, without copying it whole."""
+        if self.in_memory:
+            self._file.seek(0)
+            while chunk := self._file.read(chunk_size):
+                yield chunk
+            return
+        await asyncio.to_thread(self._file.seek, 0)
+        while chunk := await asyncio.to_thread(self._file.read, chunk_size):
+            yield chunk
+
+    async def read_head(self, size: int) -> bytes:
+        return await self._read(size)
+
+    async def read_all(self) -> bytes:
+        return await self._read(-1)
+
+    async def read_range(self, start: int, size: int) -> bytes:
+        return await self._read(size, start)
+
+    async def _read(self, size: int, start: int = 0) -> bytes:
+        def _read() -> bytes:
+            self._file.seek(start)
+            return self._file.read(size)
+
+        return _read() if self.in_memory else await asyncio.to_thread(_read)
+
+    async def persist(self, suffix: str = "") -> str:
+        """Copy the body to a new named temporary file (off the loop); returns its path."""
+
+        def _copy() -> str:
+            fd, path = tempfile.mkstemp(suffix=suffix)
+            self._file.seek(0)
+            with os.fdopen(fd, "wb") as out:
+                shutil.copyfileobj(self._file, out, _CHUNK_BYTES)
+            return path
+
+        return await asyncio.to_thread(_copy)
+
+    async def aclose(self) -> None:
+        if self.in_memory:
+            self._file.close()
+        else:
+            await asyncio.to_thread(self._file.close)
+
+
+def _too_large_detail(limit: int) -> str:
+    return f"Upload too large (limit {limit} bytes)."
+
+
+class UploadSizeLimitMiddleware:
+    """
+    Rejects oversized uploads before the body is parsed: requests whose
+    Content-Length is over the limit get 413 immediately, and bodies without
+    one (chunked) fail with 413 as soon as the running total crosses it.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        max_bytes: int = MAX_UPLOAD_BYTES,
+        path_prefixes: tuple[str, ...] = ("/api/sessions",),
+    ):
+        self.app = app
+        self.max_bytes = max_bytes + _MULTIPART_OVERHEAD_BYTES
+        self.path_prefixes = path_prefixes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] not in ("POST", "PUT", "PATCH")
+            or not scope["path"].startswith(self.path_prefixes)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        for name, value in scope["headers"]:
+            if name == b"content-length":
+                try:
+                    declared = int(value)
+                except ValueError:
+                    break
+                if declared > self.max_bytes:
+                    response = JSONResponse(
+                        {"detail": _too_large_detail(self.max_bytes)}, status_code=413
+                    )
+                    await response(scope, receive, send)
+                    return
+                break
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    raise HTTPException(
+                        status_code=413, detail=_too_large_detail(self.max_bytes)
+                    )
+            return message
+
+        await self.app(scope, limited_receive, send)
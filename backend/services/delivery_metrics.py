@@ -0,0 +1,221 @@
+import re
+from functools import lru_cache
+from typing import Optional
+
+import numpy as np
+
+from models.word_timings import WordColumns
+from prompts.nudge_tools import NUDGE_THRESHOLDS
+from services.turn_alignment import align_words
+
+# Same list as the browser HUD (src/lib/analysis/voiceMetrics.ts).
+FILLER_WORDS = [
+    "um",
+    "uh",
+    "like",
+    "you know",
+    "basically",
+    "actually",
+    "literally",
+    "so",
+    "well",
+    "kind of",
+    "sort of",
+    "i mean",
+    "right",
+]
+WINDOW_S = 30.0  # NUDGE_THRESHOLDS filler counts are per 30 s
+HOP_S = 10.0
+MIN_PAUSE_S = 0.3
+PAUSE_BUCKETS_S = (0.3, 0.5, 1.0, 2.0, 3.0, 5.0)
+# Per-word speaking time is clamped so pauses encoded into a word's
+# duration don't drag WPM down (mirrors the browser calculation).
+_WORD_MIN_S = 0.05
+_WORD_MAX_S = 1.0
+
+_NON_WORD = re.compile(r"[^\w'-]+")
+_FILLER_TOKENS = [f.split() for f in FILLER_WORDS]
+_VOCAB = {token: i for i, token in enumerate(dict.fromkeys(t for f in _FILLER_TOKENS for t in f))}
+_SINGLE_IDS = np.array([_VOCAB[f[0]] for f in _FILLER_TOKENS if len(f) == 1])
+_PAIR_IDS = [(_VOCAB[f[0]], _VOCAB[f[1]]) for f in _FILLER_TOKENS if len(f) == 2]
+
+
+@lru_cache(maxsize=16384)
+def _token_id(word: str) -> int:
+    return _VOCAB.get(_NON_WORD.sub("", word.lower()), -1)
+
+
+def filler_mask(words: list[str]) -> np.ndarray:
+    """True at the first word of every filler (single words and two-word phrases)."""
+    ids = np.fromiter((_token_id(w) for w in words), dtype=np.int16, count=len(words))
+    mask = np.isin(ids, _SINGLE_IDS)
+    for first, second in _PAIR_IDS:
+        mask[:-1] |= (ids[:-1] == first) & (ids[1:] == second)
+    return mask
+
+
+def _wpm(word_count: np.ndarray, speaking_s: np.ndarray) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        wpm = np.where(speaking_s > 0.25, word_count / speaking_s * 60.0, 0.0)
+    return np.rint(wpm)
+
+
+def _breaches(duration_s: float, wpm: float, max_window_fillers: int) -> list[dict]:
+    pace = NUDGE_THRESHOLDS["pace"]
+    filler = NUDGE_THRESHOLDS["filler"]
+    length = NUDGE_THRESHOLDS["answer_length"]
+    breaches = []
+    if wpm > pace["too_fast"]:
+        breaches.append({"type": "pace_fast", "value": wpm, "threshold": pace["too_fast"]})
+    elif 0 < wpm < pace["too_slow"]:
+        breaches.append({"type": "pace_slow", "value": wpm, "threshold": pace["too_slow"]})
+    for level in ("intervention", "warning"):
+        if max_window_fillers >= filler[level]:
+            breaches.append(
+                {"type": f"filler_{level}", "value": max_window_fillers, "threshold": filler[level]}
+            )
+            break
+    for level in ("max", "intervention", "warning"):
+        if duration_s >= length[level]:
+            breaches.append(
+                {"type": f"answer_length_{level}", "value": duration_s, "threshold": length[level]}
+            )
+            break
+    return breaches
+
+
+def analyze_delivery(
+    columns: WordColumns, transcript: Optional[list[dict]] = None
+) -> dict:
+    """
+    Delivery metrics for a whole session in one vectorized pass over the
+    word columns: sliding-window WPM and filler counts, the pause
+    distribution, and per-turn pace, fillers, answer length and
+    NUDGE_THRESHOLDS breaches for the spokesperson's turns. Raises
+    ValueError when there are no words.
+    """
+    n = len(columns)
+    if n == 0:
+        raise ValueError("No word timings to analyze")
+    starts = np.frombuffer(columns.start_ms, dtype=np.int32).astype(np.float64) / 1000
+    ends = np.frombuffer(columns.end_ms, dtype=np.int32).astype(np.float64) / 1000
+    order = np.argsort(starts, kind="stable")
+    if np.any(order != np.arange(n)):
+        starts, ends = starts[order], ends[order]
+        words = [columns.words[i] for i in order]
+    else:
+        words = columns.words
+    duration_s = float(ends.max())
+
+    fillers = filler_mask(words)
+    speaking = np.clip(ends - starts, _WORD_MIN_S, _WORD_MAX_S)
+    # Prefix sums: any [a, b) range of words costs two lookups.
+    speaking_cum = np.concatenate(([0.0], np.cumsum(speaking)))
+    filler_cum = np.concatenate(([0], np.cumsum(fillers)))
+
+    # Sliding windows ending every HOP_S seconds.
+    window_ends = np.arange(HOP_S, duration_s + HOP_S, HOP_S)
+    hi = np.searchsorted(starts, window_ends, side="left")
+    lo = np.searchsorted(starts, window_ends - WINDOW_S, side="left")
+    window_words = hi - lo
+    window_wpm = _wpm(window_words, speaking_cum[hi] - speaking_cum[lo])
+    window_fillers = filler_cum[hi] - filler_cum[lo]
+
+    # Pauses: silent gaps between consecutive words.
+    gaps = starts[1:] - ends[:-1]
+    pauses = gaps[gaps >= MIN_PAUSE_S]
+    bucket_counts = np.histogram(pauses, bins=[*PAUSE_BUCKETS_S, np.inf])[0]
+
+    # Spokesperson turns with their aligned word ranges; per-turn sums then
+    # come from the prefix arrays.
+    alignment = align_words(starts, ends, transcript or [])
+    user = [i for i, turn in enumerate(alignment.turns) if turn.speaker == "user"]
+    if user:
+        turns = alignment.turn_bounds()[user]
+        t_lo, t_hi = alignment.word_ranges[user, 0], alignment.word_ranges[user, 1]
+    else:
+        # No live transcript: the whole recording is one answer.
+        turns = np.array([[0.0, duration_s]])
+        t_lo, t_hi = np.array([0]), np.array([n])
+    turn_words = t_hi - t_lo
+    turn_wpm = _wpm(turn_words, speaking_cum[t_hi] - speaking_cum[t_lo])
+    turn_fillers = filler_cum[t_hi] - filler_cum[t_lo]
+    has_words = turn_words > 0
+    first_start = starts[np.minimum(t_lo, n - 1)]
+    last_end = ends[np.maximum(t_hi - 1, 0)]
+    answer_s = np.round(np.where(has_words, last_end - first_start, 0.0), 2)
+
+    # Most fillers in any WINDOW_S inside a turn: for each filler, count the
+    # fillers of the same turn starting within WINDOW_S of it.
+    filler_idx = np.flatnonzero(fillers)
+    filler_times = starts[filler_idx]
+    filler_turn = np.searchsorted(t_lo, filler_idx, side="right") - 1
+    in_turn = (filler_turn >= 0) & (filler_idx < t_hi[np.maximum(filler_turn, 0)])
+    filler_idx, filler_times, filler_turn = (
+        filler_idx[in_turn], filler_times[in_turn], filler_turn[in_turn]
+    )
+    in_window = np.searchsorted(filler_times, filler_times + WINDOW_S, side="left")
+    turn_fillers_end = np.searchsorted(filler_idx, t_hi[filler_turn], side="left")
+    burst = np.minimum(in_window, turn_fillers_end) - np.arange(len(filler_idx))
+    turn_max_fillers = np.zeros(len(turns), dtype=np.int64)
+    np.maximum.at(turn_max_fillers, filler_turn, burst)
+
+    # Longest pause inside each turn.
+    turn_longest_pause = np.zeros(len(turns))
+    after = np.arange(1, n)  # gap i sits between words i and i + 1
+    gap_turn = np.searchsorted(t_lo, after, side="right") - 1
+    owner = np.maximum(gap_turn, 0)
+    same_turn = (gap_turn >= 0) & (after - 1 >= t_lo[owner]) & (after < t_hi[owner])
+    np.maximum.at(turn_longest_pause, gap_turn[same_turn], np.maximum(gaps[same_turn], 0))
+
+    turn_rows = []
+    for i in range(len(turns)):
+        wpm = float(turn_wpm[i])
+        turn_rows.append(
+            {
+                "index": i,
+                "start_s": round(float(turns[i, 0]), 2),
+                "end_s": round(float(turns[i, 1]), 2),
+                "words": int(turn_words[i]),
+                "answer_s": float(answer_s[i]),
+                "wpm": wpm,
+                "fillers": int(turn_fillers[i]),
+                "max_fillers_per_window": int(turn_max_fillers[i]),
+                "longest_pause_s": round(float(turn_longest_pause[i]), 2),
+                "breaches": _breaches(float(answer_s[i]), wpm, int(turn_max_fillers[i])),
+            }
+        )
+
+    total_speaking = float(speaking_cum[-1])
+    longest = int(np.argmax(answer_s))
+    return {
+        "duration_s": round(duration_s, 2),
+        "clock_skew_s": alignment.skew_s,
+        "words": n,
+        "wpm": float(_wpm(np.array([n]), np.array([total_speaking]))[0]),
+        "fillers": int(filler_cum[-1]),
+        "fillers_per_min": round(float(filler_cum[-1]) / total_speaking * 60, 1)
+        if total_speaking > 0
+        else 0.0,
+        "windows": {
+            "window_s": WINDOW_S,
+            "hop_s": HOP_S,
+            "end_s": window_ends.round(2).tolist(),
+            "wpm": window_wpm.tolist(),
+            "fillers": window_fillers.tolist(),
+        },
+        "pauses": {
+            "count": int(len(pauses)),
+            "total_s": round(float(pauses.sum()), 2),
+            "longest_s": round(float(pauses.max()), 2) if len(pauses) else 0.0,
+            "p50_s": round(float(np.percentile(pauses, 50)), 2) if len(pauses) else None,
+            "p90_s": round(float(np.percentile(pauses, 90)), 2) if len(pauses) else None,
+            "histogram": {
+                "bucket_start_s": list(PAUSE_BUCKETS_S),
+                "counts": bucket_counts.tolist(),
+            },
+        },
+        "longest_answer": turn_rows[longest],
+        "turns": turn_rows,
+        "thresholds": NUDGE_THRESHOLDS,
+    }
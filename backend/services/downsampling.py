@@ -0,0 +1,61 @@
+from typing import Optional, Sequence
+
+import numpy as np
+
+from models.metric_series import MetricSeries
+
+
+def lttb(t: np.ndarray, v: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: indexes of `n_out` points that keep the
+    visual shape of the series (peaks and dips survive, unlike averaging or
+    striding). The first and last points are always kept; the rest are
+    split into n_out - 2 buckets, and each bucket keeps the point forming
+    the largest triangle with the point kept before it and the mean of the
+    next bucket. O(n).
+    """
+    n = len(t)
+    if n_out >= n:
+        return np.arange(n)
+    if n_out < 3:
+        raise ValueError("LTTB keeps at least 3 points")
+    x = t.astype(np.float64)
+    y = v.astype(np.float64)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)  # n_out - 2 buckets
+    kept = np.empty(n_out, dtype=np.int64)
+    kept[0], kept[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            next_lo, next_hi = edges[i + 1], edges[i + 2]
+        else:
+            next_lo, next_hi = n - 1, n
+        cx, cy = x[next_lo:next_hi].mean(), y[next_lo:next_hi].mean()
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(np.argmax(area))
+        kept[i + 1] = a
+    return kept
+
+
+def downsample_series(
+    series: MetricSeries,
+    metrics: Sequence[str],
+    points: int,
+    t0_ms: Optional[int] = None,
+    t1_ms: Optional[int] = None,
+) -> dict:
+    """Each metric within [t0_ms, t1_ms], LTTB-reduced to at most `points` samples."""
+    out = {}
+    for name in metrics:
+        t, v = series.series(name)
+        lo = 0 if t0_ms is None else int(np.searchsorted(t, t0_ms, side="left"))
+        hi = len(t) if t1_ms is None else int(np.searchsorted(t, t1_ms, side="right"))
+        t, v = t[lo:hi], v[lo:hi]
+        kept = lttb(t, v, points)
+        out[name] = {
+            "t": t[kept].tolist(),
+            "v": np.round(v[kept].astype(np.float64), 3).tolist(),
+            "total": len(t),
+        }
+    return out
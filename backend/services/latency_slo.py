@@ -0,0 +1,113 @@
+import math
+import time
+from collections import deque
+from enum import IntEnum
+from typing import Callable
+
+
+class DegradationLevel(IntEnum):
+    NORMAL = 0
+    FAST_MODEL = 1
+    FALLBACK_ONLY = 2
+
+
+class LatencySLOController:
+    """
+    Tracks a rolling latency window for one upstream call site and steps a
+    degradation level up when p95 breaches the SLO, and back down once it
+    recovers. At FALLBACK_ONLY no traffic reaches upstream, so a single probe
+    call is let through every `probe_interval_s` to measure recovery.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        slo_ms: float,
+        window_size: int = 50,
+        window_s: float = 120.0,
+        min_samples: int = 10,
+        min_probe_samples: int = 3,
+        recovery_ratio: float = 0.7,
+        probe_interval_s: float = 15.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.slo_ms = slo_ms
+        self.window_s = window_s
+        self.min_samples = max(1, min_samples)
+        self.min_probe_samples = max(1, min_probe_samples)
+        self.recovery_ratio = recovery_ratio
+        self.probe_interval_s = probe_interval_s
+        self._clock = clock
+        self._samples: deque[tuple[float, float]] = deque(maxlen=max(1, window_size))
+        self._level = DegradationLevel.NORMAL
+        self._changed_at = clock()
+        self._last_probe_at: float | None = None
+
+    @property
+    def level(self) -> DegradationLevel:
+        return self._level
+
+    def plan(self) -> DegradationLevel:
+        """
+        Level to serve the next request at. Returns FAST_MODEL instead of
+        FALLBACK_ONLY when a recovery probe is due.
+        """
+        if self._level is not DegradationLevel.FALLBACK_ONLY:
+            return self._level
+        now = self._clock()
+        last = self._last_probe_at if self._last_probe_at is not None else self._changed_at
+        if now - last >= self.probe_interval_s:
+            self._last_probe_at = now
+            return DegradationLevel.FAST_MODEL
+        return DegradationLevel.FALLBACK_ONLY
+
+    def record(self, latency_ms: float) -> None:
+        self._samples.append((self._clock(), float(latency_ms)))
+        self._evaluate()
+
+    def p95_ms(self) -> float | None:
+        self._expire()
+        if not self._samples:
+            return None
+        ordered = sorted(latency for _, latency in self._samples)
+        rank = max(1, math.ceil(0.95 * len(ordered)))
+        return ordered[rank - 1]
+
+    def snapshot(self) -> dict:
+        p95 = self.p95_ms()
+        return {
+            "level": int(self._level),
+            "level_name": self._level.name.lower(),
+            "p95_ms": round(p95, 1) if p95 is not None else None,
+            "samples": len(self._samples),
+            "slo_ms": self.slo_ms,
+        }
+
+    def _expire(self) -> None:
+        cutoff = self._clock() - self.window_s
+        while self._samples and self._samples[0][0] < cutoff:
+            self._samples.popleft()
+
+    def _set_level(self, level: DegradationLevel) -> None:
+        self._level = level
+        self._changed_at = self._clock()
+        self._last_probe_at = None
+        # Judge the new level on fresh samples only.
+        self._samples.clear()
+
+    def _evaluate(self) -> None:
+        needed = (
+            self.min_probe_samples
+            if self._level is DegradationLevel.FALLBACK_ONLY
+            else self.min_samples
+        )
+        p95 = self.p95_ms()
+        if p95 is None or len(self._samples) < needed:
+            return
+
+        if p95 > self.slo_ms and self._level < DegradationLevel.FALLBACK_ONLY:
+            self._set_level(DegradationLevel(self._level + 1))
+        elif p95 <= self.slo_ms * self.recovery_ratio and self._level > DegradationLevel.NORMAL:
+            self._set_level(DegradationLevel(self._level - 1))
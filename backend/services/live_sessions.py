@@ -0,0 +1,227 @@
+import os
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+from models.metric_series import MetricSeries
+from models.session import NudgeEvent, TranscriptSegment
+from prompts.nudge_tools import NUDGE_THRESHOLDS
+from services.delivery_metrics import WINDOW_S, filler_mask
+
+LIVE_SESSION_TTL_S = float(os.getenv("KAWKAI_LIVE_SESSION_TTL_S", "7200"))
+MAX_LIVE_SESSIONS = int(os.getenv("KAWKAI_MAX_LIVE_SESSIONS", "256"))
+
+
+class LiveBatchOutOfOrder(Exception):
+    """A batch skipped ahead of the next expected sequence number."""
+
+    def __init__(self, expected_seq: int):
+        super().__init__(f"Expected batch {expected_seq}")
+        self.expected_seq = expected_seq
+
+
+class TooManyLiveSessions(Exception):
+    pass
+
+
+@dataclass
+class LiveAggregates:
+    """
+    Running delivery metrics over the spokesperson's live transcript
+    segments. Each update costs O(segment length), independent of how much
+    of the session came before; consecutive user segments form one answer.
+    """
+
+    segments: int = 0
+    words: int = 0
+    speaking_ms: float = 0.0
+    fillers: int = 0
+    max_window_fillers: int = 0
+    answers: int = 0
+    answer_ms_total: float = 0.0
+    longest_answer_ms: float = 0.0
+    answer_start_ms: Optional[float] = None  # open answer, if the user spoke last
+    answer_end_ms: float = 0.0
+    nudges: dict[str, int] = field(default_factory=dict)
+    # (end_ms, fillers) of user segments inside the current answer and the
+    # last WINDOW_S; each segment enters and leaves once.
+    _window: deque = field(default_factory=deque)
+    _window_fillers: int = 0
+
+    def add_segment(self, segment: TranscriptSegment) -> None:
+        self.segments += 1
+        if segment.speaker != "user":
+            self._close_answer()
+            return
+        tokens = segment.text.split()
+        fillers = int(filler_mask(tokens).sum()) if tokens else 0
+        self.words += len(tokens)
+        self.speaking_ms += max(0.0, segment.endTime - segment.startTime)
+        self.fillers += fillers
+
+        if self.answer_start_ms is None:
+            self.answers += 1
+            self.answer_start_ms = segment.startTime
+            self.answer_end_ms = segment.endTime
+        self.answer_end_ms = max(self.answer_end_ms, segment.endTime)
+        self.longest_answer_ms = max(self.longest_answer_ms, self._open_answer_ms())
+
+        self._window.append((segment.endTime, fillers))
+        self._window_fillers += fillers
+        while self._window and self._window[0][0] <= segment.endTime - WINDOW_S * 1000:
+            self._window_fillers -= self._window.popleft()[1]
+        self.max_window_fillers = max(self.max_window_fillers, self._window_fillers)
+
+    def add_nudge(self, nudge: NudgeEvent) -> None:
+        self.nudges[nudge.severity] = self.nudges.get(nudge.severity, 0) + 1
+
+    def _open_answer_ms(self) -> float:
+        if self.answer_start_ms is None:
+            return 0.0
+        return max(0.0, self.answer_end_ms - self.answer_start_ms)
+
+    def _close_answer(self) -> None:
+        if self.answer_start_ms is None:
+            return
+        self.answer_ms_total += self._open_answer_ms()
+        self.answer_start_ms = None
+        self._window.clear()
+        self._window_fillers = 0
+
+    def summary(self) -> dict:
+        speaking_min = self.speaking_ms / 60000
+        answer_ms_total = self.answer_ms_total + self._open_answer_ms()
+        length = NUDGE_THRESHOLDS["answer_length"]
+        current_answer_s = round(self._open_answer_ms() / 1000, 1)
+        return {
+            "segments": self.segments,
+            "words": self.words,
+            "wpm": round(self.words / speaking_min) if self.speaking_ms > 250 else 0,
+            "fillers": self.fillers,
+            "fillers_per_min": round(self.fillers / speaking_min, 1) if speaking_min else 0.0,
+            "max_fillers_per_window": self.max_window_fillers,
+            "window_fillers": self._window_fillers,
+            "answers": self.answers,
+            "mean_answer_s": round(answer_ms_total / self.answers / 1000, 1)
+            if self.answers
+            else 0.0,
+            "longest_answer_s": round(self.longest_answer_ms / 1000, 1),
+            "current_answer_s": current_answer_s,
+            "current_answer_over": next(
+                (level for level in ("max", "intervention", "warning")
+                 if current_answer_s >= length[level]),
+                None,
+            ),
+            "nudges": dict(self.nudges),
+        }
+
+
+@dataclass
+class LiveSession:
+    session_id: str
+    updated_at: float
+    next_seq: int = 0
+    segments: list[TranscriptSegment] = field(default_factory=list)
+    nudges: list[NudgeEvent] = field(default_factory=list)
+    aggregates: LiveAggregates = field(default_factory=LiveAggregates)
+    metrics: MetricSeries = field(default_factory=MetricSeries)
+
+
+class LiveSessionRegistry:
+    """
+    Sessions still in progress, fed by small append-only batches. Batches
+    carry a sequence number: a resent batch (seq below the next expected)
+    is acknowledged without being applied again, and a gap is rejected so
+    the client resends from `expected_seq`. Idle sessions expire after
+    `ttl_s`. Per process, like the memory session backend.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl_s: float = LIVE_SESSION_TTL_S,
+        max_sessions: int = MAX_LIVE_SESSIONS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl_s = ttl_s
+        self.max_sessions = max_sessions
+        self._clock = clock
+        self._sessions: dict[str, LiveSession] = {}
+        self._stats = {"started": 0, "finished": 0, "expired": 0, "batches": 0, "duplicates": 0}
+
+    def get(self, session_id: str) -> Optional[LiveSession]:
+        live = self._sessions.get(session_id)
+        if live is None or self._expired(live):
+            return None
+        return live
+
+    def _get_or_start(self, session_id: str) -> LiveSession:
+        live = self.get(session_id)
+        if live is None:
+            self.sweep()
+            if len(self._sessions) >= self.max_sessions:
+                raise TooManyLiveSessions(f"{self.max_sessions} live sessions already in progress")
+            live = LiveSession(session_id, self._clock())
+            self._sessions[session_id] = live
+            self._stats["started"] += 1
+        return live
+
+    def append(
+        self,
+        session_id: str,
+        seq: int,
+        segments: list[TranscriptSegment],
+        nudges: list[NudgeEvent],
+    ) -> LiveSession:
+        live = self._get_or_start(session_id)
+        if seq > live.next_seq:
+            raise LiveBatchOutOfOrder(live.next_seq)
+        live.updated_at = self._clock()
+        if seq < live.next_seq:
+            self._stats["duplicates"] += 1
+            return live
+
+        for segment in segments:
+            live.segments.append(segment)
+            live.aggregates.add_segment(segment)
+        for nudge in nudges:
+            live.nudges.append(nudge)
+            live.aggregates.add_nudge(nudge)
+        live.next_seq += 1
+        self._stats["batches"] += 1
+        return live
+
+    def append_metrics(self, session_id: str, samples: list[dict]) -> tuple[LiveSession, int]:
+        """
+        Add HUD metric samples; returns the session and how many were kept.
+        Samples carry their own timestamps, so no sequence number is needed:
+        resent or late ones are dropped.
+        """
+        live = self._get_or_start(session_id)
+        live.updated_at = self._clock()
+        return live, live.metrics.append(samples)
+
+    def finish(self, session_id: str) -> Optional[LiveSession]:
+        """Stop tracking a session (its recording was uploaded) and return it."""
+        live = self.get(session_id)
+        self._sessions.pop(session_id, None)
+        if live is not None:
+            self._stats["finished"] += 1
+        return live
+
+    def sweep(self) -> int:
+        expired = [sid for sid, live in self._sessions.items() if self._expired(live)]
+        for session_id in expired:
+            del self._sessions[session_id]
+        self._stats["expired"] += len(expired)
+        return len(expired)
+
+    def _expired(self, live: LiveSession) -> bool:
+        return self.ttl_s > 0 and self._clock() - live.updated_at > self.ttl_s
+
+    def stats(self) -> dict:
+        return {**self._stats, "in_progress": len(self._sessions)}
+
+
+live_sessions = LiveSessionRegistry()
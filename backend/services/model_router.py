@@ -0,0 +1,300 @@
+import math
+import os
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any
+
+import httpx
+
+# Statuses worth retrying on the next model in a ladder.
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+# USD per 1M tokens: (input, output). Override with OPENAI_MODEL_PRICES.
+DEFAULT_MODEL_PRICES: dict[str, tuple[float, float]] = {
+    "gpt-4.1-nano": (0.10, 0.40),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-5-nano": (0.05, 0.40),
+    "gpt-5-mini": (0.25, 2.00),
+    "gpt-5": (1.25, 10.00),
+}
+
+
+def parse_ladder(raw: str | None, default: list[str]) -> list[str]:
+    """Parse a comma-separated model ladder (smallest first), de-duplicated."""
+    models = [m.strip() for m in (raw or "").split(",") if m.strip()] or default
+    ladder: list[str] = []
+    for model in models:
+        if model and model not in ladder:
+            ladder.append(model)
+    return ladder
+
+
+def _parse_prices(raw: str | None) -> dict[str, tuple[float, float]]:
+    """Parse `model:input:output,...` price overrides."""
+    prices = dict(DEFAULT_MODEL_PRICES)
+    for entry in (raw or "").split(","):
+        parts = [p.strip() for p in entry.split(":")]
+        if len(parts) != 3 or not parts[0]:
+            continue
+        try:
+            prices[parts[0]] = (float(parts[1]), float(parts[2]))
+        except ValueError:
+            continue
+    return prices
+
+
+@dataclass
+class ModelStats:
+    calls: int = 0
+    errors: int = 0
+    ewma_latency_ms: float | None = None
+    input_tokens: int = 0
+    cached_input_tokens: int = 0
+    output_tokens: int = 0
+    cost_usd: float = 0.0
+    # Latency split by whether the upstream prompt cache was hit.
+    cache_hit_calls: int = 0
+    cache_hit_latency_ms: float = 0.0
+    cache_miss_calls: int = 0
+    cache_miss_latency_ms: float = 0.0
+    latencies: deque = field(default_factory=lambda: deque(maxlen=200))
+    outcomes: deque = field(default_factory=lambda: deque(maxlen=50))
+
+    def recent_error_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return sum(1 for ok in self.outcomes if not ok) / len(self.outcomes)
+
+    def percentile(self, q: float) -> float | None:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[max(1, math.ceil(q * len(ordered))) - 1]
+
+
+@dataclass
+class Route:
+    name: str
+    ladder: list[str]
+    latency_target_ms: float | None = None
+
+
+class ModelRouter:
+    """
+    Picks models for Responses API calls from a per-route ladder (smallest
+    first). Callers choose a starting tier from request characteristics; the
+    router orders the remaining models into a fallback chain and pushes models
+    that are currently erroring or too slow to the back.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_error_rate: float = 0.5,
+        min_calls_for_health: int = 5,
+        ewma_alpha: float = 0.2,
+        prices: dict[str, tuple[float, float]] | None = None,
+    ):
+        self.max_error_rate = max_error_rate
+        self.min_calls_for_health = min_calls_for_health
+        self.ewma_alpha = ewma_alpha
+        self.prices = prices if prices is not None else dict(DEFAULT_MODEL_PRICES)
+        self._routes: dict[str, Route] = {}
+        self._stats: dict[tuple[str, str], ModelStats] = {}
+
+    def register(
+        self,
+        name: str,
+        ladder: list[str],
+        *,
+        latency_target_ms: float | None = None,
+    ) -> Route:
+        route = Route(name=name, ladder=list(ladder), latency_target_ms=latency_target_ms)
+        self._routes[name] = route
+        return route
+
+    def ladder(self, route_name: str) -> list[str]:
+        return list(self._routes[route_name].ladder)
+
+    def candidates(self, route_name: str, tier: int = 0) -> list[str]:
+        """
+        Models to try in order: the ladder from `tier` upwards, then the
+        smaller models below it, with unhealthy models moved to the end.
+        """
+        route = self._routes[route_name]
+        tier = max(0, min(tier, len(route.ladder) - 1))
+        ordered = route.ladder[tier:] + list(reversed(route.ladder[:tier]))
+        healthy = [m for m in ordered if self._is_healthy(route, m)]
+        return healthy + [m for m in ordered if m not in healthy]
+
+    def record(
+        self,
+        route_name: str,
+        model: str,
+        latency_ms: float,
+        *,
+        ok: bool,
+        usage: dict[str, Any] | None = None,
+    ) -> None:
+        stats = self._stats.setdefault((route_name, model), ModelStats())
+        stats.calls += 1
+        stats.outcomes.append(ok)
+        if not ok:
+            stats.errors += 1
+        stats.latencies.append(latency_ms)
+        if stats.ewma_latency_ms is None:
+            stats.ewma_latency_ms = latency_ms
+        else:
+            stats.ewma_latency_ms += self.ewma_alpha * (latency_ms - stats.ewma_latency_ms)
+
+        if isinstance(usage, dict):
+            input_tokens = int(usage.get("input_tokens") or 0)
+            output_tokens = int(usage.get("output_tokens") or 0)
+            details = usage.get("input_tokens_details")
+            cached_tokens = int(
+                (details.get("cached_tokens") if isinstance(details, dict) else 0) or 0
+            )
+            stats.input_tokens += input_tokens
+            stats.cached_input_tokens += cached_tokens
+            stats.output_tokens += output_tokens
+            if cached_tokens:
+                stats.cache_hit_calls += 1
+                stats.cache_hit_latency_ms += latency_ms
+            else:
+                stats.cache_miss_calls += 1
+                stats.cache_miss_latency_ms += latency_ms
+            input_price, output_price = self.prices.get(model, (0.0, 0.0))
+            stats.cost_usd += (
+                input_tokens * input_price + output_tokens * output_price
+            ) / 1_000_000
+
+    def snapshot(self) -> dict[str, Any]:
+        routes: dict[str, Any] = {}
+        for name, route in self._routes.items():
+            models: dict[str, Any] = {}
+            for model in route.ladder + [
+                m for (r, m) in self._stats if r == name and m not in route.ladder
+            ]:
+                stats = self._stats.get((name, model))
+                if stats is None:
+                    models[model] = {"calls": 0}
+                    continue
+                p50 = stats.percentile(0.5)
+                p95 = stats.percentile(0.95)
+                models[model] = {
+                    "calls": stats.calls,
+                    "errors": stats.errors,
+                    "recent_error_rate": round(stats.recent_error_rate(), 3),
+                    "ewma_latency_ms": round(stats.ewma_latency_ms or 0.0, 1),
+                    "p50_ms": round(p50, 1) if p50 is not None else None,
+                    "p95_ms": round(p95, 1) if p95 is not None else None,
+                    "input_tokens": stats.input_tokens,
+                    "cached_input_tokens": stats.cached_input_tokens,
+                    "output_tokens": stats.output_tokens,
+                    "cost_usd": round(stats.cost_usd, 6),
+                    "healthy": self._is_healthy(route, model),
+                }
+            routes[name] = {
+                "ladder": route.ladder,
+                "latency_target_ms": route.latency_target_ms,
+                "prompt_cache": self._prompt_cache_snapshot(name),
+                "models": models,
+            }
+        return routes
+
+    def _prompt_cache_snapshot(self, route_name: str) -> dict[str, Any]:
+        route_stats = [s for (r, _), s in self._stats.items() if r == route_name]
+        input_tokens = sum(s.input_tokens for s in route_stats)
+        cached_tokens = sum(s.cached_input_tokens for s in route_stats)
+        hit_calls = sum(s.cache_hit_calls for s in route_stats)
+        miss_calls = sum(s.cache_miss_calls for s in route_stats)
+        hit_latency = sum(s.cache_hit_latency_ms for s in route_stats)
+        miss_latency = sum(s.cache_miss_latency_ms for s in route_stats)
+        return {
+            "input_tokens": input_tokens,
+            "cached_tokens": cached_tokens,
+            "cached_token_ratio": (
+                round(cached_tokens / input_tokens, 3) if input_tokens else None
+            ),
+            "hit_calls": hit_calls,
+            "miss_calls": miss_calls,
+            "avg_hit_latency_ms": round(hit_latency / hit_calls, 1) if hit_calls else None,
+            "avg_miss_latency_ms": round(miss_latency / miss_calls, 1) if miss_calls else None,
+        }
+
+    def _is_healthy(self, route: Route, model: str) -> bool:
+        stats = self._stats.get((route.name, model))
+        if stats is None or len(stats.outcomes) < self.min_calls_for_health:
+            return True
+        if stats.recent_error_rate() > self.max_error_rate:
+            return False
+        if (
+            route.latency_target_ms is not None
+            and stats.ewma_latency_ms is not None
+            and stats.ewma_latency_ms > route.latency_target_ms
+        ):
+            return False
+        return True
+
+    async def post(
+        self,
+        client: httpx.AsyncClient,
+        route_name: str,
+        models: list[str],
+        *,
+        url: str,
+        headers: dict[str, str],
+        payload: dict[str, Any],
+        **kwargs: Any,
+    ) -> tuple[httpx.Response, str]:
+        """
+        POST `payload` with each model in turn until one succeeds or fails
+        with a non-retryable status. Returns the last response and its model;
+        re-raises the last connection error if no attempt got a response.
+        """
+        last_error: httpx.RequestError | None = None
+        last: tuple[httpx.Response, str] | None = None
+        for model in models:
+            started = time.perf_counter()
+            try:
+                response = await client.post(
+                    url, headers=headers, json={**payload, "model": model}, **kwargs
+                )
+            except httpx.RequestError as exc:
+                self.record(
+                    route_name, model, (time.perf_counter() - started) * 1000, ok=False
+                )
+                last_error = exc
+                continue
+
+            usage = None
+            if response.status_code == 200:
+                try:
+                    body = response.json()
+                except ValueError:
+                    body = None
+                if isinstance(body, dict):
+                    usage = body.get("usage")
+            self.record(
+                route_name,
+                model,
+                (time.perf_counter() - started) * 1000,
+                ok=response.status_code == 200,
+                usage=usage,
+            )
+            last = (response, model)
+            if response.status_code not in RETRYABLE_STATUS_CODES:
+                return last
+
+        if last is not None:
+            return last
+        if last_error is not None:
+            raise last_error
+        raise ValueError(f"No models configured for route {route_name!r}")
+
+
+# Singleton instance
+model_router = ModelRouter(prices=_parse_prices(os.getenv("OPENAI_MODEL_PRICES")))
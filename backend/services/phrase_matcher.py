@@ -0,0 +1,346 @@
+import os
+import re
+from collections import deque
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional, Sequence
+
+from models.session import TimestampedFlag
+from services.delivery_metrics import FILLER_WORDS
+
+# Comma-separated overrides for the built-in lexicons.
+FILLER_LEXICON = [
+    p.strip()
+    for p in os.getenv("KAWKAI_FILLER_LEXICON", ",".join(FILLER_WORDS)).split(",")
+    if p.strip()
+]
+# Phrases a spokesperson should not say on the record, whatever the scenario.
+RISK_PHRASES = [
+    p.strip()
+    for p in os.getenv(
+        "KAWKAI_RISK_LEXICON",
+        "guarantee,guaranteed,i promise,we promise,off the record,no comment,"
+        "between you and me,i'm not supposed to,confidential,i shouldn't say",
+    ).split(",")
+    if p.strip()
+]
+# Unknown words at least this long may match a phrase word one edit away
+# (transcription misspellings such as "layof" for "layoff").
+FUZZY_MIN_LEN = 5
+# Hits of the same phrase this close together (in words) are reported once.
+MERGE_GAP_WORDS = 8
+_RESOLVED_MAX = 50_000
+
+_NON_WORD = re.compile(r"[^\w'-]+")
+_DIRECTIVE = re.compile(r"^(?:do not|don't|dont|never|avoid)\s+")
+STOPWORDS = frozenset(
+    """a about all also an and any are as at be been being but by can could did do does
+    for from had has have he her his i i'm if in into is it it's its just me more my no
+    not of on or our ours over so than that that's the their them then there these they
+    this those to too us very was we we're were what when which who will with would you
+    your""".split()
+)
+
+_SEVERITY = {"red_line": "high", "risk_language": "medium", "key_message": "low", "filler": "low"}
+
+
+@lru_cache(maxsize=16384)
+def normalize_token(word: str) -> str:
+    return _NON_WORD.sub("", word.lower())
+
+
+def _tokens(phrase: str) -> list[str]:
+    return [t for t in (normalize_token(w) for w in phrase.split()) if t]
+
+
+@dataclass(frozen=True)
+class Pattern:
+    kind: str
+    label: str  # the phrase as given (the key message, red line or filler)
+    length: int  # tokens
+    content: bool  # matched on the stopword-free stream
+
+
+@dataclass
+class PhraseHit:
+    kind: str
+    label: str
+    pattern: int  # index into PhraseMatcher.patterns
+    start_index: int  # words[start_index:end_index]
+    end_index: int
+    start_time: float
+    end_time: float
+    fuzzy: bool
+
+
+class _Automaton:
+    """Aho-Corasick over token ids; `out[s]` holds every pattern ending at state s."""
+
+    def __init__(self):
+        self.goto: list[dict[int, int]] = [{}]
+        self.fail: list[int] = [0]
+        self.out: list[list[int]] = [[]]
+
+    def add(self, token_ids: Sequence[int], pattern: int) -> None:
+        state = 0
+        for token in token_ids:
+            nxt = self.goto[state].get(token)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto[state][token] = nxt
+                self.goto.append({})
+                self.fail.append(0)
+                self.out.append([])
+            state = nxt
+        self.out[state].append(pattern)
+
+    def build(self) -> None:
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, nxt in self.goto[state].items():
+                queue.append(nxt)
+                fallback = self.fail[state]
+                while fallback and token not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(token, 0)
+                self.fail[nxt] = target if target != nxt else 0
+                self.out[nxt] = self.out[nxt] + self.out[self.fail[nxt]]
+
+    def step(self, state: int, token: int) -> int:
+        goto, fail = self.goto, self.fail
+        while state and token not in goto[state]:
+            state = fail[state]
+        return goto[state].get(token, 0)
+
+
+class PhraseMatcher:
+    """
+    Key messages, red lines, risk phrases and fillers compiled into two
+    token-level Aho-Corasick automata, scanned together in one pass over a
+    session's words:
+
+    - literal: every phrase's full token sequence, over all words;
+    - content: for key messages and red lines of three or more content
+      words, their content-word bigrams over the stopword-free stream, so
+      paraphrases that reuse the phrase's key terms still register.
+
+    Red lines are matched without their leading "Do not"/"Avoid". Words not
+    in any phrase fall back to a phrase word one edit away (single-deletion
+    index), cached per distinct word.
+    """
+
+    def __init__(
+        self,
+        *,
+        key_messages: Sequence[str] = (),
+        red_lines: Sequence[str] = (),
+        fillers: Sequence[str] = FILLER_LEXICON,
+        risk_phrases: Sequence[str] = RISK_PHRASES,
+    ):
+        self.patterns: list[Pattern] = []
+        self.vocab: dict[str, int] = {}
+        self.literal = _Automaton()
+        self.content = _Automaton()
+        self.shingles: dict[str, int] = {}  # label -> content patterns compiled for it
+
+        for phrase in fillers:
+            self._add_literal("filler", phrase, _tokens(phrase))
+        for phrase in risk_phrases:
+            self._add_literal("risk_language", phrase, _tokens(phrase))
+        for kind, phrases in (("key_message", key_messages), ("red_line", red_lines)):
+            for phrase in phrases:
+                tokens = _tokens(_DIRECTIVE.sub("", phrase.strip().lower()))
+                self._add_literal(kind, phrase, tokens)
+                content = [t for t in tokens if t not in STOPWORDS]
+                if len(content) >= 3:
+                    bigrams = dict.fromkeys(zip(content, content[1:]))
+                    for bigram in bigrams:
+                        self._add(self.content, Pattern(kind, phrase, 2, True), bigram)
+                    self.shingles[phrase] = len(bigrams)
+        self.literal.build()
+        self.content.build()
+
+        # Single-deletion index over phrase words for the fuzzy fallback.
+        self._deletes: dict[str, list[str]] = {}
+        for token in self.vocab:
+            if len(token) >= FUZZY_MIN_LEN:
+                for variant in _deletions(token):
+                    self._deletes.setdefault(variant, []).append(token)
+        self._resolved: dict[str, tuple[int, bool]] = {}
+
+    def _add_literal(self, kind: str, phrase: str, tokens: list[str]) -> None:
+        if tokens:
+            self._add(self.literal, Pattern(kind, phrase, len(tokens), False), tokens)
+
+    def _add(self, automaton: _Automaton, pattern: Pattern, tokens: Sequence[str]) -> None:
+        ids = [self.vocab.setdefault(t, len(self.vocab)) for t in tokens]
+        self.patterns.append(pattern)
+        automaton.add(ids, len(self.patterns) - 1)
+
+    def resolve(self, word: str) -> tuple[int, bool]:
+        """(token id or -1, whether it was matched fuzzily) for a transcript word."""
+        cached = self._resolved.get(word)
+        if cached is not None:
+            return cached
+        token = normalize_token(word)
+        token_id = self.vocab.get(token)
+        result = (token_id, False) if token_id is not None else (-1, False)
+        if token_id is None and len(token) >= FUZZY_MIN_LEN - 1:
+            candidates = set(self._deletes.get(token, ()))  # transcript dropped a letter
+            for variant in _deletions(token):
+                if variant in self.vocab and len(variant) >= FUZZY_MIN_LEN:
+                    candidates.add(variant)  # transcript added a letter
+                candidates.update(self._deletes.get(variant, ()))  # substitution
+            if len(candidates) == 1:
+                result = (self.vocab[candidates.pop()], True)
+        if len(self._resolved) >= _RESOLVED_MAX:
+            self._resolved.clear()
+        self._resolved[word] = result
+        return result
+
+    def scan(
+        self, words: Sequence[str], starts: Sequence[float], ends: Sequence[float]
+    ) -> list[PhraseHit]:
+        """Every phrase occurrence, in one pass over the words (times in seconds)."""
+        hits: list[PhraseHit] = []
+        fuzzy_at: list[bool] = []
+        content_index: list[int] = []  # word index of each content-stream token
+        literal_state = content_state = 0
+        patterns = self.patterns
+        for i, word in enumerate(words):
+            token_id, fuzzy = self.resolve(word)
+            fuzzy_at.append(fuzzy)
+            literal_state = self.literal.step(literal_state, token_id)
+            for p in self.literal.out[literal_state]:
+                start = i - patterns[p].length + 1
+                hits.append(self._hit(p, start, i, starts, ends, fuzzy_at))
+            if normalize_token(word) in STOPWORDS:
+                continue
+            content_index.append(i)
+            content_state = self.content.step(content_state, token_id)
+            for p in self.content.out[content_state]:
+                start = content_index[-patterns[p].length]
+                hits.append(self._hit(p, start, i, starts, ends, fuzzy_at))
+        hits.sort(key=lambda h: (h.start_index, h.end_index))
+        return hits
+
+    def _hit(self, p: int, start: int, last: int, starts, ends, fuzzy_at) -> PhraseHit:
+        pattern = self.patterns[p]
+        return PhraseHit(
+            kind=pattern.kind,
+            label=pattern.label,
+            pattern=p,
+            start_index=start,
+            end_index=last + 1,
+            start_time=float(starts[start]),
+            end_time=float(ends[last]),
+            fuzzy=any(fuzzy_at[start : last + 1]),
+        )
+
+
+def _deletions(token: str) -> set[str]:
+    return {token[:i] + token[i + 1 :] for i in range(len(token))}
+
+
+@lru_cache(maxsize=64)
+def compile_matcher(
+    key_messages: tuple[str, ...],
+    red_lines: tuple[str, ...],
+    fillers: Optional[tuple[str, ...]] = None,
+) -> PhraseMatcher:
+    """Matchers are cached per phrase set: scenarios are reused across sessions."""
+    return PhraseMatcher(
+        key_messages=key_messages,
+        red_lines=red_lines,
+        fillers=FILLER_LEXICON if fillers is None else fillers,
+    )
+
+
+def merge_hits(hits: list[PhraseHit], gap_words: int = MERGE_GAP_WORDS) -> list[PhraseHit]:
+    """Overlapping or nearby hits of the same phrase merged into one span."""
+    merged: list[PhraseHit] = []
+    open_by_label: dict[tuple[str, str], PhraseHit] = {}
+    for hit in hits:
+        key = (hit.kind, hit.label)
+        current = open_by_label.get(key)
+        if current is not None and hit.start_index <= current.end_index + gap_words:
+            current.end_index = max(current.end_index, hit.end_index)
+            current.end_time = max(current.end_time, hit.end_time)
+            current.fuzzy = current.fuzzy or hit.fuzzy
+            continue
+        copy = PhraseHit(**vars(hit))
+        merged.append(copy)
+        open_by_label[key] = copy
+    return merged
+
+
+def hit_to_flag(hit: PhraseHit, words: Sequence[str]) -> TimestampedFlag:
+    if hit.kind == "red_line":
+        recommendation = f"Red line: {hit.label}. Bridge back to a key message."
+    elif hit.kind == "risk_language":
+        recommendation = f'Avoid "{hit.label}" on the record.'
+    elif hit.kind == "key_message":
+        recommendation = f"Key message landed: {hit.label}"
+    else:
+        recommendation = f'Pause instead of saying "{hit.label}".'
+    return TimestampedFlag(
+        start_time=round(hit.start_time, 2),
+        end_time=round(hit.end_time, 2),
+        issue_type=hit.kind,
+        severity=_SEVERITY[hit.kind],
+        evidence_quote=" ".join(words[hit.start_index : hit.end_index]),
+        recommendation=recommendation,
+    )
+
+
+def match_phrases(
+    words: Sequence[str],
+    starts: Sequence[float],
+    ends: Sequence[float],
+    *,
+    key_messages: Sequence[str] = (),
+    red_lines: Sequence[str] = (),
+    fillers: Optional[Sequence[str]] = None,
+) -> dict:
+    """
+    Red-line, risk-language and key-message flags (TimestampedFlag shape)
+    plus filler counts and per-key-message coverage: the share of its
+    bigrams heard, 1.0 when said verbatim.
+    """
+    matcher = compile_matcher(
+        tuple(key_messages), tuple(red_lines), tuple(fillers) if fillers is not None else None
+    )
+    hits = matcher.scan(words, starts, ends)
+
+    filler_counts: dict[str, int] = {}
+    bigrams_heard: dict[str, set[int]] = {}
+    verbatim: set[str] = set()
+    for hit in hits:
+        if hit.kind == "filler":
+            filler_counts[hit.label] = filler_counts.get(hit.label, 0) + 1
+        elif hit.kind == "key_message":
+            if matcher.patterns[hit.pattern].content:
+                bigrams_heard.setdefault(hit.label, set()).add(hit.pattern)
+            else:
+                verbatim.add(hit.label)
+
+    flags = [
+        hit_to_flag(hit, words)
+        for hit in merge_hits([h for h in hits if h.kind != "filler"])
+    ]
+    coverage = []
+    for message in dict.fromkeys(key_messages):
+        total = matcher.shingles.get(message, 0)
+        if message in verbatim:
+            share = 1.0
+        else:
+            share = len(bigrams_heard.get(message, ())) / total if total else 0.0
+        coverage.append({"key_message": message, "coverage": round(share, 2)})
+    return {
+        "flags": [f.model_dump() for f in flags],
+        "fuzzy_hits": sum(1 for h in hits if h.fuzzy),
+        "fillers": filler_counts,
+        "key_messages": coverage,
+        "red_lines_crossed": sorted({h.label for h in hits if h.kind == "red_line"}),
+    }
@@ -0,0 +1,150 @@
+import math
+import struct
+import zlib
+from typing import Any, Iterable, Iterator, Optional
+
+from models.session import Session
+from services.resp_client import RespClient, RespError
+from services.word_timings import decode_word_timings, encode_word_timings
+
+# Value layout: flags byte | uint32 payload length | payload JSON | word timings blob.
+# The whole value after the flags byte is zlib-compressed when that saves space.
+_FLAG_COMPRESSED = 0x01
+_PAYLOAD_LEN = struct.Struct("<I")
+_COMPRESS_MIN_BYTES = 1024
+# Optimistic field updates give up after this many conflicting writes.
+_UPDATE_ATTEMPTS = 5
+# Keys requested per SCAN step (and then fetched with one MGET).
+_SCAN_COUNT = 100
+
+
+def pack_session(session: Session) -> bytes:
+    payload = session.model_dump_json(exclude={"word_timings"}).encode()
+    words = session.word_timings
+    body = b"".join(
+        (
+            _PAYLOAD_LEN.pack(len(payload)),
+            payload,
+            encode_word_timings(words) if words is not None else b"",
+        )
+    )
+    if len(body) >= _COMPRESS_MIN_BYTES:
+        compressed = zlib.compress(body, 1)
+        if len(compressed) < len(body):
+            return bytes((_FLAG_COMPRESSED,)) + compressed
+    return b"\x00" + body
+
+
+def unpack_session(value: bytes) -> Session:
+    body = value[1:]
+    if value[0] & _FLAG_COMPRESSED:
+        body = zlib.decompress(body)
+    (length,) = _PAYLOAD_LEN.unpack_from(body)
+    start = _PAYLOAD_LEN.size
+    session = Session.model_validate_json(body[start : start + length])
+    words = body[start + length :]
+    if words:
+        session.word_timings = decode_word_timings(words)
+    return session
+
+
+class RedisSessionBackend:
+    """
+    Session storage on a shared Redis-protocol server so any instance can
+    serve any session. Each session is one compact key written with
+    `SET ... EX ttl_s`, so expiry (since last write) is handled server-side;
+    size bounds come from the server's `maxmemory` policy. Field updates
+    are optimistic: `WATCH` the key, rewrite it in `MULTI`/`EXEC`, and retry
+    if another writer got there first.
+    """
+
+    blocking = True
+    shared = True
+
+    def __init__(
+        self,
+        client: RespClient,
+        *,
+        prefix: str = "kawkai:session:",
+        ttl_s: float = 24 * 3600,
+    ):
+        self.client = client
+        self.prefix = prefix
+        self.ttl_s = ttl_s
+        self._stats = {"writes": 0, "hits": 0, "misses": 0, "conflicts": 0}
+
+    def _set_command(self, session: Session) -> tuple:
+        key = self.prefix + session.id
+        if self.ttl_s > 0:
+            return ("SET", key, pack_session(session), "EX", max(1, math.ceil(self.ttl_s)))
+        return ("SET", key, pack_session(session))
+
+    def save(self, session: Session) -> None:
+        self.client.execute(*self._set_command(session))
+        self._stats["writes"] += 1
+
+    def save_many(self, sessions: Iterable[Session]) -> None:
+        replies = self.client.pipeline([self._set_command(s) for s in sessions])
+        self._stats["writes"] += len(replies)
+        for reply in replies:
+            if isinstance(reply, RespError):
+                raise reply
+
+    def get(self, session_id: str) -> Optional[Session]:
+        value = self.client.execute("GET", self.prefix + session_id)
+        if value is None:
+            self._stats["misses"] += 1
+            return None
+        self._stats["hits"] += 1
+        return unpack_session(value)
+
+    def update(self, session_id: str, fields: dict[str, Any]) -> Optional[Session]:
+        key = self.prefix + session_id
+        for _ in range(_UPDATE_ATTEMPTS):
+            _, value = self.client.pipeline([("WATCH", key), ("GET", key)])
+            if isinstance(value, RespError):
+                raise value
+            if value is None:
+                self.client.execute("UNWATCH")
+                return None
+            session = unpack_session(value)
+            for name, field_value in fields.items():
+                setattr(session, name, field_value)
+            replies = self.client.pipeline(
+                [("MULTI",), self._set_command(session), ("EXEC",)], retry=False
+            )
+            if isinstance(replies[-1], RespError):
+                raise replies[-1]
+            if replies[-1] is not None:  # None: the key changed after WATCH
+                self._stats["writes"] += 1
+                return session
+            self._stats["conflicts"] += 1
+        raise RespError(f"Session {session_id} kept changing during update")
+
+    def delete(self, session_id: str) -> None:
+        self.client.execute("DEL", self.prefix + session_id)
+
+    def scan(self) -> Iterator[Session]:
+        cursor = b"0"
+        while True:
+            cursor, keys = self.client.execute(
+                "SCAN", cursor, "MATCH", self.prefix + "*", "COUNT", _SCAN_COUNT
+            )
+            if keys:
+                for value in self.client.execute("MGET", *keys):
+                    if value is not None:  # expired between SCAN and MGET
+                        yield unpack_session(value)
+            if cursor == b"0":
+                return
+
+    def sweep(self) -> int:
+        # Keys expire server-side.
+        return 0
+
+    def stats(self) -> dict:
+        return {
+            "backend": "redis",
+            "url": self.client.safe_url,
+            "ttl_s": self.ttl_s,
+            **self._stats,
+        }
@@ -0,0 +1,157 @@
+import functools
+import os
+import socket
+import ssl
+import threading
+from typing import Any, Iterable
+from urllib.parse import unquote, urlparse
+
+REDIS_URL = os.getenv("KAWKAI_REDIS_URL", "").strip() or None
+REDIS_TIMEOUT_S = float(os.getenv("KAWKAI_REDIS_TIMEOUT_S", "2.0"))
+
+
+class RespError(Exception):
+    """Error reply from a Redis-protocol server."""
+
+
+def _encode_arg(arg: Any) -> bytes:
+    if isinstance(arg, bytes):
+        return arg
+    if isinstance(arg, str):
+        return arg.encode()
+    if isinstance(arg, (int, float)):
+        return repr(arg).encode()
+    raise TypeError(f"Unsupported argument type: {type(arg).__name__}")
+
+
+def encode_command(*args: Any) -> bytes:
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        data = _encode_arg(arg)
+        parts.append(b"$%d\r\n" % len(data))
+        parts.append(data)
+        parts.append(b"\r\n")
+    return b"".join(parts)
+
+
+def read_reply(stream) -> Any:
+    """Read one RESP2 reply; error replies are returned as `RespError` instances."""
+    line = stream.readline()
+    if not line:
+        raise ConnectionError("Connection closed by server")
+    kind, body = line[:1], line[1:-2]
+    if kind == b"+":
+        return body.decode()
+    if kind == b"-":
+        return RespError(body.decode())
+    if kind == b":":
+        return int(body)
+    if kind == b"$":
+        length = int(body)
+        if length < 0:
+            return None
+        data = stream.read(length + 2)
+        if len(data) != length + 2:
+            raise ConnectionError("Connection closed by server")
+        return data[:-2]
+    if kind == b"*":
+        count = int(body)
+        if count < 0:
+            return None
+        return [read_reply(stream) for _ in range(count)]
+    raise RespError(f"Unknown reply type: {line!r}")
+
+
+class RespClient:
+    """
+    Minimal blocking client for the Redis protocol (RESP2): single commands
+    and pipelines, one connection per thread. Accepts `redis://` and
+    `rediss://` URLs with optional password and database number.
+    """
+
+    def __init__(self, url: str, *, timeout_s: float = 2.0):
+        parsed = urlparse(url)
+        if parsed.scheme not in ("redis", "rediss"):
+            raise ValueError(f"Unsupported Redis URL scheme: {parsed.scheme!r}")
+        self.url = url
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        # For logs and metrics: no credentials.
+        self.safe_url = parsed._replace(netloc=f"{self.host}:{self.port}").geturl()
+        self.tls = parsed.scheme == "rediss"
+        self.password = unquote(parsed.password) if parsed.password else None
+        self.username = unquote(parsed.username) if parsed.username else None
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.timeout_s = timeout_s
+        self._local = threading.local()
+
+    def _connect(self):
+        sock = socket.create_connection((self.host, self.port), timeout=self.timeout_s)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        if self.tls:
+            sock = ssl.create_default_context().wrap_socket(sock, server_hostname=self.host)
+        stream = sock.makefile("rb")
+        self._local.sock, self._local.stream = sock, stream
+        setup = []
+        if self.password:
+            setup.append(
+                ("AUTH", self.username, self.password) if self.username else ("AUTH", self.password)
+            )
+        if self.db:
+            setup.append(("SELECT", self.db))
+        if setup:
+            for reply in self._roundtrip(setup):
+                if isinstance(reply, RespError):
+                    self.close()
+                    raise reply
+
+    def _roundtrip(self, commands: list[tuple]) -> list[Any]:
+        self._local.sock.sendall(b"".join(encode_command(*cmd) for cmd in commands))
+        return [read_reply(self._local.stream) for _ in commands]
+
+    def close(self) -> None:
+        sock = getattr(self._local, "sock", None)
+        if sock is not None:
+            try:
+                self._local.stream.close()
+                sock.close()
+            except OSError:
+                pass
+        self._local.sock = self._local.stream = None
+
+    def pipeline(self, commands: Iterable[tuple], *, retry: bool = True) -> list[Any]:
+        """
+        Send all commands in one write and read the replies in order. Error
+        replies are returned in place (as `RespError`) rather than raised.
+        Pass `retry=False` for commands that depend on connection state
+        (`MULTI`/`EXEC` after a `WATCH`), which a reconnect would lose.
+        """
+        commands = list(commands)
+        if not commands:
+            return []
+        # Retry once on a fresh connection: idle connections get dropped by
+        # servers and proxies. Plain commands we issue are idempotent.
+        for attempt in (0, 1) if retry else (1,):
+            if getattr(self._local, "sock", None) is None:
+                self._connect()
+            try:
+                return self._roundtrip(commands)
+            except OSError:
+                self.close()
+                if attempt:
+                    raise
+        raise AssertionError("unreachable")
+
+    def execute(self, *args: Any) -> Any:
+        reply = self.pipeline([args])[0]
+        if isinstance(reply, RespError):
+            raise reply
+        return reply
+
+
+@functools.lru_cache(maxsize=1)
+def shared_client() -> RespClient | None:
+    """Client for `KAWKAI_REDIS_URL`, or None when no shared Redis is configured."""
+    if not REDIS_URL:
+        return None
+    return RespClient(REDIS_URL, timeout_s=REDIS_TIMEOUT_S)
@@ -0,0 +1,176 @@
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import os
+import time
+import zlib
+from collections import OrderedDict
+from typing import Callable, Optional, Protocol
+
+from services.resp_client import RespClient, shared_client
+
+logger = logging.getLogger("kawkai")
+
+
+def cache_key(*parts: str) -> str:
+    """Stable key for a generated result: a digest of everything that shaped the prompt."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode())
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+def _with_hit_rate(stats: dict) -> dict:
+    lookups = stats["hits"] + stats["misses"]
+    return {**stats, "hit_rate": round(stats["hits"] / lookups, 3) if lookups else None}
+
+
+class ResponseCache(Protocol):
+    name: str
+
+    async def get(self, key: str) -> Optional[dict]: ...
+
+    async def set(self, key: str, value: dict) -> None: ...
+
+    def stats(self) -> dict: ...
+
+
+class MemoryResponseCache:
+    """Per-process LRU cache of generated JSON results; `ttl_s <= 0` disables it."""
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        max_entries: int = 256,
+        ttl_s: float = 3600,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._stats = {"hits": 0, "misses": 0, "writes": 0}
+
+    async def get(self, key: str) -> Optional[dict]:
+        entry = self._entries.get(key)
+        if entry is None or self._clock() - entry[0] > self.ttl_s:
+            self._entries.pop(key, None)
+            self._stats["misses"] += 1
+            return None
+        self._entries.move_to_end(key)
+        self._stats["hits"] += 1
+        return entry[1]
+
+    async def set(self, key: str, value: dict) -> None:
+        if self.ttl_s <= 0:
+            return
+        self._entries[key] = (self._clock(), value)
+        self._entries.move_to_end(key)
+        while self.max_entries > 0 and len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        self._stats["writes"] += 1
+
+    def stats(self) -> dict:
+        return _with_hit_rate(
+            {"backend": "memory", "entries": len(self._entries), **self._stats}
+        )
+
+
+class RedisResponseCache:
+    """
+    Fleet-wide cache of generated JSON results on a Redis-protocol server.
+    Values are compact JSON, zlib-compressed; keys expire server-side. Cache
+    errors are logged and treated as misses so an outage never fails a request.
+    The blocking client runs in a worker thread, off the event loop.
+    """
+
+    def __init__(self, name: str, client: RespClient, *, ttl_s: float = 3600):
+        self.name = name
+        self.client = client
+        self.ttl_s = ttl_s
+        self._prefix = f"kawkai:cache:{name}:"
+        self._stats = {"hits": 0, "misses": 0, "writes": 0, "errors": 0}
+
+    async def get(self, key: str) -> Optional[dict]:
+        return (await self.get_many([key]))[0]
+
+    async def get_many(self, keys: list[str]) -> list[Optional[dict]]:
+        if self.ttl_s <= 0:
+            return [None] * len(keys)
+        try:
+            values = await asyncio.to_thread(
+                self.client.execute, "MGET", *(self._prefix + key for key in keys)
+            )
+        except Exception as exc:
+            self._stats["errors"] += 1
+            logger.warning("Response cache %s read failed: %s", self.name, exc)
+            values = [None] * len(keys)
+        results = []
+        for value in values:
+            parsed = None
+            if value is not None:
+                try:
+                    parsed = json.loads(zlib.decompress(value))
+                except (zlib.error, ValueError):
+                    self._stats["errors"] += 1
+            self._stats["hits" if parsed is not None else "misses"] += 1
+            results.append(parsed)
+        return results
+
+    async def set(self, key: str, value: dict) -> None:
+        await self.set_many({key: value})
+
+    async def set_many(self, items: dict[str, dict]) -> None:
+        """Write several entries in one pipelined round trip."""
+        if self.ttl_s <= 0 or not items:
+            return
+        commands = []
+        for key, value in items.items():
+            data = zlib.compress(json.dumps(value, separators=(",", ":")).encode())
+            commands.append(
+                ("SET", self._prefix + key, data, "EX", max(1, math.ceil(self.ttl_s)))
+            )
+        try:
+            replies = await asyncio.to_thread(self.client.pipeline, commands)
+        except Exception as exc:
+            self._stats["errors"] += 1
+            logger.warning("Response cache %s write failed: %s", self.name, exc)
+            return
+        failed = sum(1 for reply in replies if isinstance(reply, Exception))
+        self._stats["errors"] += failed
+        self._stats["writes"] += len(replies) - failed
+
+    def stats(self) -> dict:
+        return _with_hit_rate({"backend": "redis", "url": self.client.safe_url, **self._stats})
+
+
+def create_response_cache(name: str, *, ttl_s: float, max_entries: int = 256) -> ResponseCache:
+    """Redis-backed when `KAWKAI_REDIS_URL` is set, otherwise per-process memory."""
+    client = shared_client()
+    if client is not None:
+        return RedisResponseCache(name, client, ttl_s=ttl_s)
+    return MemoryResponseCache(name, max_entries=max_entries, ttl_s=ttl_s)
+
+
+# Briefs describe a company and change slowly. Generated scenarios are only
+# cached when opted in: each "generate" is otherwise expected to be fresh.
+company_brief_cache = create_response_cache(
+    "company_brief",
+    ttl_s=float(os.getenv("KAWKAI_COMPANY_BRIEF_CACHE_TTL_S", str(24 * 3600))),
+)
+scenario_cache = create_response_cache(
+    "scenario",
+    ttl_s=float(os.getenv("KAWKAI_SCENARIO_CACHE_TTL_S", "0")),
+)
+# Transcripts are keyed by the audio's content hash, so retried uploads and
+# re-uploaded recordings reuse the first result instead of paying again.
+transcription_cache = create_response_cache(
+    "transcription",
+    ttl_s=float(os.getenv("KAWKAI_TRANSCRIPTION_CACHE_TTL_S", str(7 * 24 * 3600))),
+    max_entries=int(os.getenv("KAWKAI_TRANSCRIPTION_CACHE_MAX_ENTRIES", "64")),
+)
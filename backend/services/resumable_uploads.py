@@ -0,0 +1,192 @@
+import asyncio
+import os
+import secrets
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Callable, Optional
+
+from services.audio_spool import AudioSpool
+
+UPLOAD_TTL_S = float(os.getenv("KAWKAI_UPLOAD_TTL_S", "3600"))
+MAX_PENDING_UPLOADS = int(os.getenv("KAWKAI_MAX_PENDING_UPLOADS", "64"))
+UPLOAD_CHUNK_MAX_BYTES = int(os.getenv("KAWKAI_UPLOAD_CHUNK_MAX_BYTES", str(16 * 1024 * 1024)))
+
+
+class UploadOffsetMismatch(Exception):
+    """A chunk starts past the bytes received so far; `offset` is where to resume."""
+
+    def __init__(self, offset: int):
+        super().__init__(f"Expected a chunk starting at or before byte {offset}")
+        self.offset = offset
+
+
+class UploadRejected(Exception):
+    pass
+
+
+class TooManyUploads(Exception):
+    pass
+
+
+@dataclass
+class ResumableUpload:
+    id: str
+    spool: AudioSpool
+    size: Optional[int]  # declared total, if the client knew it up front
+    sha256: Optional[str]  # declared digest of the whole file, checked on finalize
+    updated_at: float
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+    @property
+    def offset(self) -> int:
+        return self.spool.size
+
+    @property
+    def complete(self) -> bool:
+        return self.size is None or self.offset == self.size
+
+
+class ResumableUploadRegistry:
+    """
+    In-progress resumable uploads, each appending to its own `AudioSpool`.
+    Chunks must arrive in order; a chunk that repeats bytes already received
+    (a client retry after a lost response) must match them and only appends
+    the new tail, so retries are idempotent. An upload stays registered until
+    the session built from it is accepted, so a failed finalize can be
+    retried. Idle uploads expire after `ttl_s`.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl_s: float = UPLOAD_TTL_S,
+        max_uploads: int = MAX_PENDING_UPLOADS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl_s = ttl_s
+        self.max_uploads = max_uploads
+        self._clock = clock
+        self._uploads: dict[str, ResumableUpload] = {}
+        self._stats = {
+            "created": 0,
+            "finalized": 0,
+            "expired": 0,
+            "aborted": 0,
+            "chunks": 0,
+            "duplicate_bytes": 0,
+        }
+
+    async def create(
+        self,
+        *,
+        filename: Optional[str] = None,
+        content_type: Optional[str] = None,
+        size: Optional[int] = None,
+        sha256: Optional[str] = None,
+    ) -> ResumableUpload:
+        await self.sweep()
+        if len(self._uploads) >= self.max_uploads:
+            raise TooManyUploads(f"{self.max_uploads} uploads already in progress")
+        spool = AudioSpool(filename=filename, content_type=content_type)
+        if size is not None and size > spool.max_bytes:
+            await spool.aclose()
+            raise UploadRejected(f"Upload exceeds {spool.max_bytes} bytes")
+        upload = ResumableUpload(
+            id=secrets.token_urlsafe(16),
+            spool=spool,
+            size=size,
+            sha256=sha256.lower() if sha256 else None,
+            updated_at=self._clock(),
+        )
+        self._uploads[upload.id] = upload
+        self._stats["created"] += 1
+        return upload
+
+    def get(self, upload_id: str) -> Optional[ResumableUpload]:
+        upload = self._uploads.get(upload_id)
+        if upload is None or self._expired(upload):
+            return None
+        return upload
+
+    async def append(self, upload: ResumableUpload, start: int, data: bytes) -> int:
+        """Write a chunk that starts at byte `start`; returns the new offset."""
+        async with upload.lock:
+            if self._uploads.get(upload.id) is not upload:
+                raise UploadRejected("Upload is no longer in progress")
+            offset = upload.offset
+            if start > offset:
+                raise UploadOffsetMismatch(offset)
+            end = start + len(data)
+            if upload.size is not None and end > upload.size:
+                raise UploadRejected(
+                    f"Chunk ends at byte {end}, past the declared size {upload.size}"
+                )
+            overlap = min(offset - start, len(data))
+            if overlap and await upload.spool.read_range(start, overlap) != data[:overlap]:
+                raise UploadRejected(f"Chunk does not match the bytes received from {start}")
+            skip = offset - start
+            self._stats["chunks"] += 1
+            self._stats["duplicate_bytes"] += overlap
+            if skip < len(data):
+                await upload.spool.write(data[skip:])
+            upload.updated_at = self._clock()
+            return upload.offset
+
+    @asynccontextmanager
+    async def finalize(self, upload: ResumableUpload) -> AsyncIterator[AudioSpool]:
+        """
+        Check the upload is whole and matches its declared digest, then lend
+        its spool to the `async with` body. The upload is forgotten (and the
+        spool becomes the body's to close) only when the body succeeds; if it
+        raises, the upload stays in progress so finalize can be retried.
+        """
+        async with upload.lock:
+            if self._uploads.get(upload.id) is not upload:
+                raise UploadRejected("Upload is no longer in progress")
+            if not upload.complete:
+                raise UploadOffsetMismatch(upload.offset)
+            if upload.sha256 is not None and upload.spool.sha256 != upload.sha256:
+                raise UploadRejected("Uploaded bytes do not match the declared sha256")
+            try:
+                yield upload.spool
+            finally:
+                upload.updated_at = self._clock()
+            self._uploads.pop(upload.id, None)
+            self._stats["finalized"] += 1
+
+    async def abort(self, upload_id: str) -> bool:
+        upload = self._uploads.get(upload_id)
+        if upload is None:
+            return False
+        async with upload.lock:  # not while a finalize is using the spool
+            if self._uploads.pop(upload_id, None) is not upload:
+                return False
+        self._stats["aborted"] += 1
+        await upload.spool.aclose()
+        return True
+
+    async def sweep(self) -> int:
+        expired = [u for u in self._uploads.values() if self._expired(u)]
+        for upload in expired:
+            del self._uploads[upload.id]
+            await upload.spool.aclose()
+        self._stats["expired"] += len(expired)
+        return len(expired)
+
+    def _expired(self, upload: ResumableUpload) -> bool:
+        return (
+            self.ttl_s > 0
+            and not upload.lock.locked()
+            and self._clock() - upload.updated_at > self.ttl_s
+        )
+
+    def stats(self) -> dict:
+        return {
+            **self._stats,
+            "in_progress": len(self._uploads),
+            "buffered_bytes": sum(u.offset for u in self._uploads.values()),
+        }
+
+
+resumable_uploads = ResumableUploadRegistry()
@@ -0,0 +1,202 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+import numpy as np
+
+from models.session import Session, TimestampedFlag
+from models.word_timings import WordColumns
+
+# Sessions whose indexes are kept between range queries (a scrubbing
+# client sends many in a row for the same session).
+INDEX_CACHE_SIZE = 64
+WORD_FIELDS = ("word", "start", "end", "index")
+
+
+class WordTimeIndex:
+    """
+    Words sorted by start with the running maximum of their ends, so the
+    words overlapping [t0, t1] are found with two binary searches: every
+    word before the first whose running max end reaches t0 ends too early,
+    every word after the last starting by t1 starts too late. O(log n + k).
+    """
+
+    def __init__(self, columns: WordColumns):
+        starts = np.frombuffer(columns.start_ms, dtype=np.int32)
+        ends = np.frombuffer(columns.end_ms, dtype=np.int32)
+        order = np.argsort(starts, kind="stable")
+        self.sorted = bool(np.all(order[1:] > order[:-1])) if len(order) else True
+        self.order = None if self.sorted else order
+        self.starts = starts if self.sorted else starts[order]
+        self.ends = ends if self.sorted else ends[order]
+        self.max_end = np.maximum.accumulate(self.ends) if len(self.ends) else self.ends
+        self.words = columns.words
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def overlapping(self, t0_ms: int, t1_ms: int) -> np.ndarray:
+        """Positions (in start order) of words with start <= t1 and end >= t0."""
+        lo = int(np.searchsorted(self.max_end, t0_ms, side="left"))
+        hi = int(np.searchsorted(self.starts, t1_ms, side="right"))
+        if lo >= hi:
+            return np.zeros(0, dtype=np.int64)
+        positions = np.arange(lo, hi)
+        return positions[self.ends[lo:hi] >= t0_ms]
+
+    def word(self, position: int) -> str:
+        return self.words[position if self.order is None else int(self.order[position])]
+
+    @property
+    def duration_ms(self) -> int:
+        return int(self.max_end[-1]) if len(self.max_end) else 0
+
+
+class IntervalTree:
+    """
+    Static interval tree: intervals sorted by start form an implicit
+    balanced BST (the middle of each range is its root), each node keeping
+    the largest end in its subtree. A query skips every subtree that ends
+    before t0 or starts after t1. O(log n + k).
+    """
+
+    def __init__(self, starts: Sequence[float], ends: Sequence[float]):
+        self.order = sorted(range(len(starts)), key=lambda i: (starts[i], ends[i]))
+        self.starts = [starts[i] for i in self.order]
+        self.ends = [ends[i] for i in self.order]
+        self.max_end = [0.0] * len(self.order)
+        if self.order:
+            self._build(0, len(self.order))
+
+    def _build(self, lo: int, hi: int) -> float:
+        mid = (lo + hi) // 2
+        best = self.ends[mid]
+        if lo < mid:
+            best = max(best, self._build(lo, mid))
+        if mid + 1 < hi:
+            best = max(best, self._build(mid + 1, hi))
+        self.max_end[mid] = best
+        return best
+
+    def overlapping(self, t0: float, t1: float) -> list[int]:
+        """Original indexes of intervals overlapping [t0, t1], ordered by start."""
+        found: list[int] = []
+        stack = [(0, len(self.order))] if self.order else []
+        while stack:
+            lo, hi = stack.pop()
+            mid = (lo + hi) // 2
+            if self.max_end[mid] < t0:
+                continue  # the whole subtree ends before the range
+            if mid + 1 < hi and self.starts[mid] <= t1:
+                stack.append((mid + 1, hi))  # right subtree starts at or after mid
+            if self.starts[mid] <= t1 and self.ends[mid] >= t0:
+                found.append(mid)
+            if lo < mid:
+                stack.append((lo, mid))
+        return [self.order[i] for i in sorted(found)]
+
+
+@dataclass
+class SessionIndex:
+    fingerprint: tuple
+    words: Optional[WordTimeIndex]
+    flags: list[TimestampedFlag]
+    flag_tree: IntervalTree
+
+
+def _fingerprint(session: Session) -> tuple:
+    columns = session.word_timings
+    word_key = (
+        (len(columns), columns.start_ms[0], columns.end_ms[-1]) if columns else (0, 0, 0)
+    )
+    flags = session.analysis.timestamped_flags if session.analysis else []
+    return (*word_key, tuple((f.start_time, f.end_time, f.issue_type) for f in flags))
+
+
+class SessionIndexCache:
+    """LRU of per-session indexes, rebuilt when the session's words or flags change."""
+
+    def __init__(self, max_entries: int = INDEX_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, SessionIndex] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, session: Session) -> SessionIndex:
+        fingerprint = _fingerprint(session)
+        entry = self._entries.get(session.id)
+        if entry is not None and entry.fingerprint == fingerprint:
+            self._entries.move_to_end(session.id)
+            self.hits += 1
+            return entry
+        self.misses += 1
+        flags = list(session.analysis.timestamped_flags) if session.analysis else []
+        entry = SessionIndex(
+            fingerprint=fingerprint,
+            words=WordTimeIndex(session.word_timings) if session.word_timings else None,
+            flags=flags,
+            flag_tree=IntervalTree([f.start_time for f in flags], [f.end_time for f in flags]),
+        )
+        self._entries[session.id] = entry
+        self._entries.move_to_end(session.id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return entry
+
+
+def query_range(
+    index: SessionIndex,
+    t0: float,
+    t1: Optional[float],
+    *,
+    fields: Sequence[str] = ("word", "start", "end"),
+    limit: int = 500,
+    cursor: Optional[int] = None,
+    include_words: bool = True,
+    include_flags: bool = True,
+) -> dict:
+    """
+    Words and flags overlapping [t0, t1] (seconds; t1 defaults to the end).
+    Words carry only `fields` and come `limit` at a time: pass `next_cursor`
+    back as `cursor` for the next page. Flags are returned on the first page.
+    """
+    words_index = index.words
+    duration_s = words_index.duration_ms / 1000 if words_index is not None else 0.0
+    if t1 is None:
+        t1 = max(duration_s, max((f.end_time for f in index.flags), default=0.0))
+    page: dict = {"t0": t0, "t1": t1, "duration_s": duration_s}
+
+    if include_words:
+        words: list[dict] = []
+        total = 0
+        next_cursor = None
+        if words_index is not None:
+            positions = words_index.overlapping(round(t0 * 1000), round(t1 * 1000))
+            total = len(positions)
+            if cursor is not None:
+                positions = positions[np.searchsorted(positions, cursor, side="left") :]
+            if len(positions) > limit:
+                next_cursor = int(positions[limit])
+            for position in positions[:limit].tolist():
+                row = {}
+                for field in fields:
+                    if field == "word":
+                        row["word"] = words_index.word(position)
+                    elif field == "start":
+                        row["start"] = int(words_index.starts[position]) / 1000
+                    elif field == "end":
+                        row["end"] = int(words_index.ends[position]) / 1000
+                    elif field == "index":
+                        order = words_index.order
+                        row["index"] = position if order is None else int(order[position])
+                words.append(row)
+        page.update(words=words, total_words=total, next_cursor=next_cursor)
+
+    if include_flags and cursor is None:
+        page["flags"] = [
+            index.flags[i].model_dump() for i in index.flag_tree.overlapping(t0, t1)
+        ]
+    return page
+
+
+session_indexes = SessionIndexCache()
@@ -1,41 +1,345 @@
-from typing import Optional
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Iterator, Optional, Protocol
+import asyncio
+import logging
 import sys
 import os
+import time
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from models.session import Session, AnalysisStatus, AnalysisResult
+from services.transcript_index import TranscriptIndex
 
+logger = logging.getLogger("kawkai")
 
-class SessionStore:
-    """In-memory session storage for MVP."""
+# Rough per-object CPython costs used for memory accounting.
+_SESSION_BASE_BYTES = 2048
+_SEGMENT_BYTES = 420  # pydantic model + fields
+
+
+def estimate_session_bytes(session: Session) -> int:
+    """Approximate resident size of a session; cheap enough to run on every save."""
+    size = _SESSION_BASE_BYTES
+    size += len(session.transcript_text or "")
+    if session.word_timings is not None:
+        size += session.word_timings.nbytes()
+    if session.metric_series is not None:
+        size += session.metric_series.nbytes()
+    segments = session.metadata.transcript
+    size += len(segments) * _SEGMENT_BYTES + sum(len(seg.text) for seg in segments)
+    if session.analysis is not None:
+        size += len(session.analysis.model_dump_json()) * 2
+    if session.error:
+        size += len(session.error)
+    return size
+
+
+@dataclass
+class _Entry:
+    session: Session
+    size: int
+    written_at: float
+
+
+class SessionBackend(Protocol):
+    """
+    Storage behind `SessionStore`. Backends that do disk or network I/O set
+    `blocking = True` and are then only called from worker threads; backends
+    other processes also write to set `shared = True`.
+    """
+
+    blocking: bool
+    shared: bool
+
+    def save(self, session: Session) -> None: ...
+
+    def save_many(self, sessions: Iterable[Session]) -> None:
+        """Write several sessions in one batch (one transaction or pipeline where supported)."""
+        ...
+
+    def get(self, session_id: str) -> Optional[Session]: ...
+
+    def update(self, session_id: str, fields: dict[str, Any]) -> Optional[Session]:
+        """Set only `fields` on the stored session, atomically; returns it, or None if gone."""
+        ...
+
+    def delete(self, session_id: str) -> None: ...
+
+    def scan(self) -> Iterator[Session]:
+        """Every stored, unexpired session, in no particular order."""
+        ...
 
-    def __init__(self):
-        self._sessions: dict[str, Session] = {}
+    def sweep(self) -> int: ...
+
+    def stats(self) -> dict: ...
+
+
+class MemorySessionBackend:
+    """
+    In-memory session storage, bounded by entry count, approximate bytes and
+    TTL (since last write). Least recently used sessions are evicted first.
+    Per-process only; use the SQLite backend when running several workers.
+    """
+
+    blocking = False
+    shared = False
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 1000,
+        max_bytes: int = 256 * 1024 * 1024,
+        ttl_s: float = 24 * 3600,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_s = ttl_s
+        self._clock = clock
+        self._sessions: OrderedDict[str, _Entry] = OrderedDict()
+        self._bytes = 0
+        self._evictions = {"lru": 0, "bytes": 0, "ttl": 0}
 
     def save(self, session: Session) -> None:
-        self._sessions[session.id] = session
+        previous = self._sessions.pop(session.id, None)
+        if previous is not None:
+            self._bytes -= previous.size
+        entry = _Entry(session, estimate_session_bytes(session), self._clock())
+        self._sessions[session.id] = entry
+        self._bytes += entry.size
+        self._enforce_limits(keep=session.id)
+
+    def save_many(self, sessions: Iterable[Session]) -> None:
+        for session in sessions:
+            self.save(session)
 
     def get(self, session_id: str) -> Optional[Session]:
-        return self._sessions.get(session_id)
+        entry = self._sessions.get(session_id)
+        if entry is None:
+            return None
+        if self._expired(entry):
+            self._remove(session_id)
+            self._evictions["ttl"] += 1
+            return None
+        self._sessions.move_to_end(session_id)
+        return entry.session
+
+    def update(self, session_id: str, fields: dict[str, Any]) -> Optional[Session]:
+        session = self.get(session_id)
+        if session is None:
+            return None
+        for name, value in fields.items():
+            setattr(session, name, value)
+        self.save(session)  # re-measures the entry and refreshes its write time
+        return session
+
+    def delete(self, session_id: str) -> None:
+        self._remove(session_id)
+
+    def scan(self) -> Iterator[Session]:
+        for entry in list(self._sessions.values()):
+            if not self._expired(entry):
+                yield entry.session
+
+    def sweep(self) -> int:
+        """Drop expired sessions; returns how many were removed."""
+        expired = [sid for sid, entry in self._sessions.items() if self._expired(entry)]
+        for session_id in expired:
+            self._remove(session_id)
+        self._evictions["ttl"] += len(expired)
+        return len(expired)
+
+    def stats(self) -> dict:
+        return {
+            "backend": "memory",
+            "entries": len(self._sessions),
+            "estimated_bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "ttl_s": self.ttl_s,
+            "evictions": dict(self._evictions),
+        }
+
+    def _expired(self, entry: _Entry) -> bool:
+        return self.ttl_s > 0 and self._clock() - entry.written_at > self.ttl_s
+
+    def _remove(self, session_id: str) -> None:
+        entry = self._sessions.pop(session_id, None)
+        if entry is not None:
+            self._bytes -= entry.size
 
-    def update_status(
+    def _enforce_limits(self, keep: str) -> None:
+        while self.max_entries > 0 and len(self._sessions) > self.max_entries:
+            oldest = next(iter(self._sessions))
+            if oldest == keep:
+                break
+            self._remove(oldest)
+            self._evictions["lru"] += 1
+        while self.max_bytes > 0 and self._bytes > self.max_bytes and len(self._sessions) > 1:
+            oldest = next(iter(self._sessions))
+            if oldest == keep:
+                break
+            self._remove(oldest)
+            self._evictions["bytes"] += 1
+
+
+class SessionStore:
+    """
+    Session storage facade over a pluggable `SessionBackend`. Calls into a
+    blocking backend run in a worker thread so the event loop never waits on
+    disk or network I/O. Saved sessions are also added to `transcript_index`
+    for full-text search; `rebuild_index` loads the ones already stored by a
+    persistent backend at startup.
+
+    Persistent backends hand out copies, so writers after the first `save`
+    go through `update`, which sets only the fields they own: a transcription
+    finishing during an analysis no longer overwrites `analysis_status`.
+    """
+
+    def __init__(self, backend: SessionBackend, transcript_index: Optional[TranscriptIndex] = None):
+        self.backend = backend
+        self.transcript_index = transcript_index or TranscriptIndex()
+        self._sweeper: asyncio.Task | None = None
+
+    async def _call(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if self.backend.blocking:
+            return await asyncio.to_thread(fn, *args)
+        return fn(*args)
+
+    async def save(self, session: Session) -> None:
+        await self._call(self.backend.save, session)
+        self.transcript_index.add(session)
+
+    async def save_many(self, sessions: Iterable[Session]) -> None:
+        """Persist several sessions in one batch (one transaction or pipeline where supported)."""
+        sessions = list(sessions)
+        await self._call(self.backend.save_many, sessions)
+        for session in sessions:
+            self.transcript_index.add(session)
+
+    async def get(self, session_id: str) -> Optional[Session]:
+        return await self._call(self.backend.get, session_id)
+
+    async def update(self, session_id: str, **fields: Any) -> Optional[Session]:
+        """Set only the given fields on a stored session; returns it, or None if it is gone."""
+        session = await self._call(self.backend.update, session_id, fields)
+        if session is not None:
+            self.transcript_index.add(session)
+        return session
+
+    async def update_status(
         self, session_id: str, status: AnalysisStatus, error: Optional[str] = None
-    ) -> None:
-        if session_id in self._sessions:
-            self._sessions[session_id].status = status
-            if error:
-                self._sessions[session_id].error = error
+    ) -> Optional[Session]:
+        fields: dict[str, Any] = {"status": status}
+        if error:
+            fields["error"] = error
+        return await self.update(session_id, **fields)
 
-    def update_analysis(self, session_id: str, analysis: AnalysisResult) -> None:
-        if session_id in self._sessions:
-            self._sessions[session_id].analysis = analysis
-            self._sessions[session_id].status = AnalysisStatus.COMPLETE
+    async def update_analysis(self, session_id: str, analysis: AnalysisResult) -> Optional[Session]:
+        return await self.update(
+            session_id,
+            analysis=analysis,
+            analysis_status=AnalysisStatus.COMPLETE,
+            analysis_error=None,
+        )
 
-    def delete(self, session_id: str) -> None:
-        self._sessions.pop(session_id, None)
+    async def update_analysis_status(
+        self, session_id: str, status: AnalysisStatus, error: Optional[str] = None
+    ) -> Optional[Session]:
+        return await self.update(session_id, analysis_status=status, analysis_error=error)
+
+    async def delete(self, session_id: str) -> None:
+        await self._call(self.backend.delete, session_id)
+        self.transcript_index.remove(session_id)
+
+    async def rebuild_index(self) -> int:
+        """Index every session the backend already holds; returns how many were added."""
+
+        def _rebuild() -> int:
+            return sum(self.transcript_index.add(session) for session in self.backend.scan())
+
+        return await self._call(_rebuild)
+
+    async def search(self, query: str, *, limit: int = 50, max_hits: int = 20) -> dict:
+        """
+        Full-text search over saved transcripts. Sessions the backend has
+        since evicted or expired are dropped from the index as they turn up.
+        With a shared backend, sessions other processes saved after this one
+        started are not indexed here, so results are flagged `partial`.
+        """
+        while True:
+            result = self.transcript_index.search(query, limit=limit, max_hits=max_hits)
+            found = [hit["session_id"] for hit in result["sessions"]]
+            gone = [session_id for session_id in found if await self.get(session_id) is None]
+            if not gone:
+                result["partial"] = self.backend.shared
+                return result
+            for session_id in gone:
+                self.transcript_index.remove(session_id)
+
+    async def sweep(self) -> int:
+        return await self._call(self.backend.sweep)
+
+    async def stats(self) -> dict:
+        return await self._call(self.backend.stats)
+
+    def start_sweeper(self, interval_s: float = 60.0) -> None:
+        if self._sweeper is None:
+            self._sweeper = asyncio.create_task(self._sweep_forever(interval_s))
+
+    async def stop_sweeper(self) -> None:
+        if self._sweeper is None:
+            return
+        self._sweeper.cancel()
+        try:
+            await self._sweeper
+        except asyncio.CancelledError:
+            pass
+        self._sweeper = None
+
+    async def _sweep_forever(self, interval_s: float) -> None:
+        while True:
+            await asyncio.sleep(interval_s)
+            try:
+                removed = await self.sweep()
+            except Exception:
+                logger.exception("Session store sweep failed")
+                continue
+            if removed:
+                logger.info("Session store sweeper expired %d sessions", removed)
+
+
+def _create_backend() -> SessionBackend:
+    kind = os.getenv("KAWKAI_SESSION_BACKEND", "memory").strip().lower()
+    max_entries = int(os.getenv("KAWKAI_SESSION_MAX_ENTRIES", "1000"))
+    ttl_s = float(os.getenv("KAWKAI_SESSION_TTL_S", str(24 * 3600)))
+    if kind == "sqlite":
+        from services.sqlite_session_backend import SQLiteSessionBackend
+
+        return SQLiteSessionBackend(
+            os.getenv("KAWKAI_SESSION_DB_PATH", "kawkai-sessions.sqlite3"),
+            max_entries=max_entries,
+            ttl_s=ttl_s,
+        )
+    if kind == "redis":
+        from services.redis_session_backend import RedisSessionBackend
+        from services.resp_client import shared_client
+
+        client = shared_client()
+        if client is None:
+            raise RuntimeError("KAWKAI_SESSION_BACKEND=redis requires KAWKAI_REDIS_URL")
+        return RedisSessionBackend(client, ttl_s=ttl_s)
+    if kind != "memory":
+        logger.warning("Unknown KAWKAI_SESSION_BACKEND=%r; using memory", kind)
+    return MemorySessionBackend(
+        max_entries=max_entries,
+        max_bytes=int(os.getenv("KAWKAI_SESSION_MAX_BYTES", str(256 * 1024 * 1024))),
+        ttl_s=ttl_s,
+    )
 
 
 # Singleton instance
-session_store = SessionStore()
+session_store = SessionStore(_create_backend())
@@ -0,0 +1,170 @@
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+from models.session import Session
+from services.word_timings import decode_word_timings, encode_word_timings
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    words BLOB,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sessions_updated_at ON sessions (updated_at);
+"""
+
+# Statements are constant strings so sqlite3's per-connection statement cache
+# reuses the prepared form on every call.
+_UPSERT = (
+    "INSERT OR REPLACE INTO sessions (id, status, payload, words, updated_at) "
+    "VALUES (?, ?, ?, ?, ?)"
+)
+_SELECT = "SELECT payload, words, updated_at FROM sessions WHERE id = ?"
+_SCAN = "SELECT payload, words FROM sessions WHERE updated_at >= ?"
+_DELETE = "DELETE FROM sessions WHERE id = ?"
+_DELETE_EXPIRED = "DELETE FROM sessions WHERE updated_at < ?"
+_DELETE_OVERFLOW = (
+    "DELETE FROM sessions WHERE id IN "
+    "(SELECT id FROM sessions ORDER BY updated_at DESC LIMIT -1 OFFSET ?)"
+)
+_COUNT = "SELECT COUNT(*) FROM sessions"
+
+
+class SQLiteSessionBackend:
+    """
+    Durable session storage in a SQLite database in WAL mode, so several
+    workers can share one file and sessions survive restarts. Word timings
+    are stored as a compact blob next to the JSON payload. Entries expire
+    `ttl_s` after their last write; `sweep` also trims the oldest rows beyond
+    `max_entries`. Every call blocks on disk, so `SessionStore` runs them in
+    worker threads (one connection per thread).
+    """
+
+    blocking = True
+    shared = True
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        max_entries: int = 1000,
+        ttl_s: float = 24 * 3600,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self._clock = clock
+        self._local = threading.local()
+        self._evictions = {"lru": 0, "ttl": 0}
+        with self._connection() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, cached_statements=64)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=5000")
+            self._local.conn = conn
+        return conn
+
+    def _row(self, session: Session, now: float) -> tuple:
+        words = session.word_timings
+        payload = session.model_dump_json(exclude={"word_timings"})
+        blob = encode_word_timings(words) if words is not None else None
+        return (session.id, session.status.value, payload, blob, now)
+
+    def save(self, session: Session) -> None:
+        with self._connection() as conn:
+            conn.execute(_UPSERT, self._row(session, self._clock()))
+
+    def save_many(self, sessions: Iterable[Session]) -> None:
+        now = self._clock()
+        rows = [self._row(session, now) for session in sessions]
+        if rows:
+            with self._connection() as conn:  # one transaction for the whole batch
+                conn.executemany(_UPSERT, rows)
+
+    def get(self, session_id: str) -> Optional[Session]:
+        with self._connection() as conn:
+            return self._load(conn, session_id)
+
+    def update(self, session_id: str, fields: dict[str, Any]) -> Optional[Session]:
+        conn = self._connection()
+        # Take the write lock before reading, so concurrent updates of other
+        # fields (from any worker) are applied one after another, not lost.
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            session = self._load(conn, session_id)
+            if session is not None:
+                for name, value in fields.items():
+                    setattr(session, name, value)
+                conn.execute(_UPSERT, self._row(session, self._clock()))
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        return session
+
+    def _load(self, conn: sqlite3.Connection, session_id: str) -> Optional[Session]:
+        row = conn.execute(_SELECT, (session_id,)).fetchone()
+        if row is None:
+            return None
+        payload, blob, updated_at = row
+        if self.ttl_s > 0 and self._clock() - updated_at > self.ttl_s:
+            conn.execute(_DELETE, (session_id,))
+            self._evictions["ttl"] += 1
+            return None
+        return self._decode(payload, blob)
+
+    @staticmethod
+    def _decode(payload: str, blob: Optional[bytes]) -> Session:
+        session = Session.model_validate_json(payload)
+        if blob is not None:
+            session.word_timings = decode_word_timings(blob)
+        return session
+
+    def delete(self, session_id: str) -> None:
+        with self._connection() as conn:
+            conn.execute(_DELETE, (session_id,))
+
+    def scan(self) -> Iterator[Session]:
+        cutoff = self._clock() - self.ttl_s if self.ttl_s > 0 else float("-inf")
+        cursor = self._connection().execute(_SCAN, (cutoff,))
+        while rows := cursor.fetchmany(100):
+            for payload, blob in rows:
+                yield self._decode(payload, blob)
+
+    def sweep(self) -> int:
+        """Drop expired rows and the oldest rows over `max_entries`."""
+        removed = 0
+        with self._connection() as conn:
+            if self.ttl_s > 0:
+                expired = conn.execute(_DELETE_EXPIRED, (self._clock() - self.ttl_s,)).rowcount
+                self._evictions["ttl"] += expired
+                removed += expired
+            if self.max_entries > 0:
+                overflow = conn.execute(_DELETE_OVERFLOW, (self.max_entries,)).rowcount
+                self._evictions["lru"] += overflow
+                removed += overflow
+        return removed
+
+    def stats(self) -> dict:
+        conn = self._connection()
+        page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+        page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+        return {
+            "backend": "sqlite",
+            "path": self.path,
+            "entries": conn.execute(_COUNT).fetchone()[0],
+            "db_bytes": page_count * page_size,
+            "max_entries": self.max_entries,
+            "ttl_s": self.ttl_s,
+            "evictions": dict(self._evictions),
+        }
@@ -0,0 +1,116 @@
+import asyncio
+import io
+import sys
+import wave
+from pathlib import Path
+import unittest
+
+import numpy as np
+
+
+# Ensure `services.*` imports work when running from repo root.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from services import audio_processing, transcription  # noqa: E402
+from services.audio_chunking import PcmAudio, decode_pcm, frame_energy  # noqa: E402
+from services.audio_processing import normalize_pcm, resample  # noqa: E402
+from services.audio_spool import AudioSpool  # noqa: E402
+
+RATE = 48000
+# (start_s, duration_s) of each "word" in the original recording.
+WORDS = [(0.5, 0.4), (1.2, 0.3), (5.0, 0.5), (5.8, 0.4), (11.0, 0.6)]
+DURATION_S = 14.0
+
+
+def _stereo_wav() -> bytes:
+    t = np.arange(int(DURATION_S * RATE)) / RATE
+    mono = np.zeros_like(t)
+    for start, length in WORDS:
+        burst = (t >= start) & (t < start + length)
+        mono[burst] = 8000 * np.sin(2 * np.pi * 440 * t[burst])
+    stereo = np.stack([mono, mono * 0.5], axis=1).astype("<i2")
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(2)
+        wav.setsampwidth(2)
+        wav.setframerate(RATE)
+        wav.writeframes(stereo.tobytes())
+    return buffer.getvalue()
+
+
+def _bursts(pcm: PcmAudio) -> list[tuple[float, float]]:
+    loud = np.concatenate(([False], frame_energy(pcm, 10) > 500, [False]))
+    edges = np.flatnonzero(np.diff(loud.astype(np.int8)))
+    return [(a / 100, b / 100) for a, b in zip(edges[::2], edges[1::2])]
+
+
+class TestAudioNormalization(unittest.TestCase):
+    def test_resample_keeps_frequency(self):
+        t = np.arange(RATE) / RATE
+        tone = (8000 * np.sin(2 * np.pi * 1000 * t)).astype(np.int16)
+        out = resample(tone, RATE, 16000)
+        self.assertEqual(len(out), 16000)
+        self.assertEqual(np.argmax(np.abs(np.fft.rfft(out))), 1000)
+
+        odd = resample(tone, RATE, 22050)
+        self.assertEqual(len(odd), 22050)
+        self.assertEqual(np.argmax(np.abs(np.fft.rfft(odd))), 1000)
+
+    def test_downmixes_resamples_and_trims_with_offset_map(self):
+        data = _stereo_wav()
+        encoded, content_type, offsets, report = normalize_pcm(data, max_silence_s=1.0)
+
+        self.assertEqual(content_type, "audio/wav")
+        pcm = decode_pcm(encoded)
+        self.assertEqual(pcm.sample_rate, 16000)
+        self.assertGreater(report.seconds_saved, 6.0)
+        self.assertGreater(report.bytes_saved, report.original_bytes * 0.9)
+
+        bursts = _bursts(pcm)
+        self.assertEqual(len(bursts), len(WORDS))
+        restored = offsets.restore_words(
+            [{"word": "w", "start": a, "end": b} for a, b in bursts]
+        )
+        for word, (start, length) in zip(restored, WORDS):
+            self.assertAlmostEqual(word["start"], start, delta=0.02)
+            self.assertAlmostEqual(word["end"], start + length, delta=0.02)
+
+    def test_transcription_reports_original_timestamps(self):
+        async def fake_post(client, audio, filename, content_type, *, granularities):
+            pcm = decode_pcm(await audio.read_all())
+            words = [{"word": "w", "start": a, "end": b} for a, b in _bursts(pcm)]
+            return {"text": "w " * len(words), "words": words}
+
+        async def run():
+            spool = AudioSpool(filename="session.wav")
+            await spool.write(_stereo_wav())
+            try:
+                return await transcription.transcribe_audio(spool)
+            finally:
+                await spool.aclose()
+
+        saved = (
+            transcription.OPENAI_API_KEY,
+            transcription._post_transcription,
+            audio_processing.NORMALIZE_ENABLED,
+        )
+        transcription.OPENAI_API_KEY = "test-key"
+        transcription._post_transcription = fake_post
+        audio_processing.NORMALIZE_ENABLED = True
+        try:
+            result = asyncio.run(run())
+        finally:
+            (
+                transcription.OPENAI_API_KEY,
+                transcription._post_transcription,
+                audio_processing.NORMALIZE_ENABLED,
+            ) = saved
+
+        self.assertEqual(
+            [round(w["start"], 1) for w in result.words], [start for start, _ in WORDS]
+        )
+        self.assertGreaterEqual(audio_processing.normalization_stats["normalized"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,151 @@
+import asyncio
+import email
+import hashlib
+import sys
+import tempfile
+from pathlib import Path
+import unittest
+
+
+# Ensure `services.*` imports work when running from repo root.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from fastapi import FastAPI, Request, UploadFile  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from services.audio_spool import AudioSpool, UploadSizeLimitMiddleware, UploadTooLarge  # noqa: E402
+from services.transcription import _multipart_body  # noqa: E402
+
+
+async def _collect(stream) -> bytes:
+    return b"".join([chunk async for chunk in stream])
+
+
+class TestAudioSpool(unittest.TestCase):
+    def test_small_bodies_stay_in_memory_and_large_roll_to_disk(self):
+        async def scenario():
+            small = AudioSpool(memory_limit=1024)
+            await small.write(b"a" * 1000)
+            large = AudioSpool(memory_limit=1024)
+            for _ in range(5):
+                await large.write(b"b" * 1000)
+            results = (
+                small.in_memory,
+                large.in_memory,
+                await _collect(small.iter_bytes(chunk_size=300)),
+                await _collect(large.iter_bytes(chunk_size=300)),
+            )
+            await small.aclose()
+            await large.aclose()
+            return results
+
+        small_in_memory, large_in_memory, small_body, large_body = asyncio.run(scenario())
+        self.assertTrue(small_in_memory)
+        self.assertFalse(large_in_memory)
+        self.assertEqual(small_body, b"a" * 1000)
+        self.assertEqual(large_body, b"b" * 5000)
+
+    def test_hashes_body_while_writing(self):
+        async def scenario():
+            spool = AudioSpool(memory_limit=1024)
+            for i in range(5):
+                await spool.write(bytes([i]) * 700)
+            digest = spool.sha256
+            await spool.aclose()
+            return digest
+
+        body = b"".join(bytes([i]) * 700 for i in range(5))
+        self.assertEqual(asyncio.run(scenario()), hashlib.sha256(body).hexdigest())
+
+    def test_enforces_max_bytes(self):
+        async def scenario():
+            spool = AudioSpool(max_bytes=10)
+            await spool.write(b"x" * 8)
+            await spool.write(b"x" * 8)
+
+        with self.assertRaises(UploadTooLarge):
+            asyncio.run(scenario())
+
+    def test_from_upload_adopts_spooled_body_without_copying(self):
+        async def scenario():
+            body = tempfile.SpooledTemporaryFile(max_size=1024)
+            upload = UploadFile(body, filename="take.webm")
+            await upload.write(b"z" * 3000)
+            spool = await AudioSpool.from_upload(upload)
+            await upload.close()
+            results = (spool._file is body, spool.in_memory, spool.size, spool.sha256)
+            results += (await spool.read_all(),)
+            await spool.aclose()
+            return results
+
+        adopted, in_memory, size, digest, data = asyncio.run(scenario())
+        self.assertTrue(adopted)
+        self.assertFalse(in_memory)
+        self.assertEqual(size, 3000)
+        self.assertEqual(digest, hashlib.sha256(b"z" * 3000).hexdigest())
+        self.assertEqual(data, b"z" * 3000)
+
+    def test_multipart_body_streams_spool_with_exact_length(self):
+        async def scenario():
+            spool = AudioSpool(memory_limit=16)
+            await spool.write(b"\x00audio-bytes\xff" * 10)
+            headers, body = _multipart_body(
+                spool, [("model", "whisper-1")], 'take "1".webm', "audio/webm"
+            )
+            data = await _collect(body)
+            await spool.aclose()
+            return headers, data
+
+        headers, data = asyncio.run(scenario())
+        self.assertEqual(int(headers["Content-Length"]), len(data))
+        message = email.message_from_bytes(
+            f"Content-Type: {headers['Content-Type']}\r\n\r\n".encode() + data
+        )
+        parts = {
+            part.get_param("name", header="content-disposition"): part
+            for part in message.get_payload()
+        }
+        self.assertEqual(parts["model"].get_payload(), "whisper-1")
+        self.assertEqual(parts["file"].get_payload(decode=True), b"\x00audio-bytes\xff" * 10)
+
+
+class TestUploadSizeLimitMiddleware(unittest.TestCase):
+    def setUp(self):
+        app = FastAPI()
+        app.add_middleware(UploadSizeLimitMiddleware, max_bytes=1000, path_prefixes=("/upload",))
+
+        @app.post("/upload")
+        async def upload(request: Request):
+            return {"size": len(await request.body())}
+
+        self.client = TestClient(app)
+
+    def test_accepts_small_and_rejects_declared_or_streamed_oversize(self):
+        self.assertEqual(self.client.post("/upload", content=b"x" * 100).json(), {"size": 100})
+        too_big = 1000 + 64 * 1024 + 1
+        self.assertEqual(self.client.post("/upload", content=b"x" * too_big).status_code, 413)
+
+        def chunks():
+            for _ in range(too_big // 4096 + 1):
+                yield b"x" * 4096
+
+        self.assertEqual(self.client.post("/upload", content=chunks()).status_code, 413)
+
+
+class TestAppMiddlewareOrder(unittest.TestCase):
+    def test_oversized_upload_413_carries_cors_headers(self):
+        import main  # the real app, with its middleware registered as in production
+
+        origin = next(o for o in main.cors_allow_origins if o != "*")
+        client = TestClient(main.app)
+        response = client.post(
+            "/api/sessions",
+            content=b"x" * 10,
+            headers={"Origin": origin, "Content-Length": str(500 * 1024 * 1024)},
+        )
+        self.assertEqual(response.status_code, 413)
+        self.assertEqual(response.headers.get("access-control-allow-origin"), origin)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,233 @@
+import asyncio
+import email
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+import unittest
+
+import numpy as np
+
+
+# Ensure `services.*` imports work when running from repo root.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from services import transcription  # noqa: E402
+from services.audio_chunking import (  # noqa: E402
+    AudioChunk,
+    PcmAudio,
+    decode_pcm,
+    encode_wav,
+    frame_energy,
+    stitch_words,
+)
+from services.audio_spool import AudioSpool  # noqa: E402
+
+RATE = 16000
+WORD_S = 0.4
+
+
+def _tone_frequency(k: int) -> float:
+    return 200.0 + 40.0 * k
+
+
+def _synthetic_speech(words: int) -> tuple[bytes, list[dict]]:
+    """One tone burst per "word" (frequency encodes the index), with pauses."""
+    pieces, expected, t = [], [], 0.0
+    for k in range(words):
+        n = int(WORD_S * RATE)
+        tone = 8000 * np.sin(2 * np.pi * _tone_frequency(k) * np.arange(n) / RATE)
+        pieces.append(tone)
+        expected.append({"word": f"w{k}", "start": round(t, 3), "end": round(t + WORD_S, 3)})
+        gap = 1.2 if k % 6 == 5 else 0.5
+        pieces.append(np.zeros(int(gap * RATE)))
+        t += WORD_S + gap
+    return encode_wav(np.concatenate(pieces).astype(np.int16), RATE), expected
+
+
+def _recognize(pcm: PcmAudio) -> list[dict]:
+    """Mock recognizer: energy runs are words, named by their dominant frequency."""
+    loud = frame_energy(pcm, 10) > 500
+    words, k = [], 0
+    while k < len(loud):
+        if not loud[k]:
+            k += 1
+            continue
+        j = k
+        while j < len(loud) and loud[j]:
+            j += 1
+        burst = pcm.samples[k * 160 : j * 160].astype(np.float32)
+        spectrum = np.abs(np.fft.rfft(burst))
+        freq = np.argmax(spectrum) * RATE / len(burst)
+        index = int(round((freq - 200.0) / 40.0))
+        words.append({"word": f"w{index}", "start": k / 100, "end": j / 100})
+        k = j
+    return words
+
+
+class TestStitchWords(unittest.TestCase):
+    def test_collapses_seam_duplicates_but_keeps_in_chunk_repeats(self):
+        first = AudioChunk(index=0, start_s=0.0, end_s=11.0, own_start_s=0.0, own_end_s=10.0)
+        second = AudioChunk(index=1, start_s=9.0, end_s=20.0, own_start_s=10.0, own_end_s=20.0)
+        words = stitch_words(
+            [
+                (
+                    first,
+                    [
+                        {"word": "the", "start": 2.0, "end": 2.1},
+                        {"word": "the", "start": 2.15, "end": 2.3},
+                        {"word": "launch", "start": 9.8, "end": 10.1},
+                    ],
+                ),
+                (
+                    second,
+                    [
+                        # Same word heard again from the overlap, midpoint just past the seam.
+                        {"word": "launch,", "start": 0.9, "end": 1.2},
+                        {"word": "no,", "start": 3.0, "end": 3.1},
+                        {"word": "no", "start": 3.2, "end": 3.3},
+                    ],
+                ),
+            ]
+        )
+        self.assertEqual(
+            [(w["word"], w["start"]) for w in words],
+            [("the", 2.0), ("the", 2.15), ("launch", 9.8), ("no,", 12.0), ("no", 12.2)],
+        )
+
+
+class MockTranscriptionServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active = 0
+        self.max_active = 0
+        self.requests: list[dict] = []
+        super().__init__(("127.0.0.1", 0), _MockHandler)
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/v1/audio/transcriptions"
+
+
+class _MockHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        server = self.server
+        with server.lock:
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+        try:
+            body = self.rfile.read(int(self.headers["Content-Length"]))
+            message = email.message_from_bytes(
+                f"Content-Type: {self.headers['Content-Type']}\r\n\r\n".encode() + body
+            )
+            fields, audio = {}, b""
+            for part in message.get_payload():
+                name = part.get_param("name", header="content-disposition")
+                if name == "file":
+                    audio = part.get_payload(decode=True)
+                else:
+                    fields.setdefault(name, []).append(part.get_payload())
+            with server.lock:
+                server.requests.append(fields)
+            time.sleep(0.05)  # let concurrent chunk requests overlap
+
+            pcm = decode_pcm(audio)
+            words = _recognize(pcm) if pcm is not None else []
+            payload = {
+                "text": " ".join(w["word"].upper() + "." for w in words),
+                "words": words,
+                "segments": [
+                    {"start": w["start"], "end": w["end"], "text": " " + w["word"].upper() + "."}
+                    for w in words
+                ],
+            }
+        finally:
+            # Released before replying: the client may start its next request
+            # as soon as it has read this response.
+            with server.lock:
+                server.active -= 1
+        data = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class TestChunkedTranscription(unittest.TestCase):
+    def setUp(self):
+        self.server = MockTranscriptionServer()
+        self._saved = {
+            name: getattr(transcription, name)
+            for name in (
+                "OPENAI_API_KEY",
+                "TRANSCRIPTION_URL",
+                "CHUNKING_ENABLED",
+                "CHUNK_MIN_S",
+                "CHUNK_TARGET_S",
+                "CHUNK_SEARCH_WINDOW_S",
+                "CHUNK_OVERLAP_S",
+                "CHUNK_CONCURRENCY",
+            )
+        }
+        transcription.OPENAI_API_KEY = "test-key"
+        transcription.TRANSCRIPTION_URL = self.server.url
+        transcription.CHUNKING_ENABLED = True
+        transcription.CHUNK_MIN_S = 10
+        transcription.CHUNK_TARGET_S = 6
+        transcription.CHUNK_SEARCH_WINDOW_S = 3
+        transcription.CHUNK_OVERLAP_S = 1.0
+        transcription.CHUNK_CONCURRENCY = 2
+
+    def tearDown(self):
+        for name, value in self._saved.items():
+            setattr(transcription, name, value)
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _transcribe(self, data: bytes, filename: str):
+        async def run():
+            spool = AudioSpool(filename=filename)
+            await spool.write(data)
+            try:
+                return await transcription.transcribe_audio(spool)
+            finally:
+                await spool.aclose()
+
+        return asyncio.run(run())
+
+    def test_long_audio_is_chunked_and_stitched(self):
+        wav, expected = _synthetic_speech(30)
+        result = self._transcribe(wav, "session.wav")
+
+        self.assertGreater(len(self.server.requests), 2)
+        self.assertLessEqual(self.server.max_active, 2)
+        self.assertEqual([w["word"] for w in result.words], [w["word"] for w in expected])
+        for got, want in zip(result.words, expected):
+            self.assertAlmostEqual(got["start"], want["start"], delta=0.05)
+            self.assertAlmostEqual(got["end"], want["end"], delta=0.05)
+        self.assertEqual(result.text, " ".join(f"W{k}." for k in range(30)))
+        self.assertEqual(
+            self.server.requests[0]["timestamp_granularities[]"], ["word", "segment"]
+        )
+
+    def test_short_or_undecodable_audio_uses_one_request(self):
+        wav, expected = _synthetic_speech(4)
+        result = self._transcribe(wav, "short.wav")
+        self.assertEqual([w["word"] for w in result.words], [w["word"] for w in expected])
+
+        self._transcribe(b"\x1aE\xdf\xa3 not really webm", "session.webm")
+        self.assertEqual(len(self.server.requests), 2)
+        self.assertEqual(self.server.requests[-1]["timestamp_granularities[]"], ["word"])
+
+
+if __name__ == "__main__":
+    unittest.main()
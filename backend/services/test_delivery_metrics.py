@@ -0,0 +1,76 @@
+import sys
+from pathlib import Path
+import unittest
+
+
+# Ensure `services.*` imports work when running from repo root.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from models.word_timings import WordColumns  # noqa: E402
+from services.delivery_metrics import analyze_delivery, filler_mask  # noqa: E402
+
+
+def _words(text: str, start: float, step: float, length: float = 0.3) -> list[dict]:
+    return [
+        {"word": w, "start": start + i * step, "end": start + i * step + length}
+        for i, w in enumerate(text.split())
+    ]
+
+
+def _segment(speaker: str, start_s: float, end_s: float) -> dict:
+    return {"speaker": speaker, "text": "", "startTime": start_s * 1000, "endTime": end_s * 1000}
+
+
+class TestDeliveryMetrics(unittest.TestCase):
+    def test_filler_mask_matches_words_and_phrases(self):
+        words = ["Um,", "I", "mean", "you", "know", "what?", "Kind", "of", "like,", "knowing"]
+        self.assertEqual(
+            filler_mask(words).tolist(),
+            [True, True, False, True, False, False, True, False, True, False],
+        )
+
+    def test_turn_metrics_and_breaches(self):
+        # Answer 1: 50 s at 200 WPM of speaking time, six fillers inside 30 s.
+        answer_one = _words(" ".join(["um"] * 6 + ["word"] * 119), 2.0, 0.4)
+        # Answer 2: 10 s, fast (0.2 s per word), with a 2 s pause in the middle.
+        answer_two = _words("fast " * 25, 70.0, 0.2, 0.15) + _words("fast " * 25, 77.0, 0.2, 0.15)
+        transcript = [
+            _segment("ai", 0, 1.5),
+            _segment("user", 1.5, 52.5),
+            _segment("ai", 55, 69),
+            _segment("user", 69.5, 82),
+            _segment("user", 82, 83),  # same speaker continues the turn
+        ]
+        result = analyze_delivery(WordColumns.from_dicts(answer_one + answer_two), transcript)
+
+        self.assertEqual(result["words"], 175)
+        self.assertEqual(len(result["turns"]), 2)
+        first, second = result["turns"]
+        self.assertEqual(first["words"], 125)
+        self.assertEqual(first["fillers"], 6)
+        self.assertEqual(first["max_fillers_per_window"], 6)
+        self.assertAlmostEqual(first["answer_s"], 49.9, places=1)
+        types = {b["type"] for b in first["breaches"]}
+        self.assertEqual(types, {"pace_fast", "filler_intervention", "answer_length_intervention"})
+
+        self.assertEqual(second["end_s"], 83.0)
+        self.assertEqual(second["words"], 50)
+        self.assertAlmostEqual(second["longest_pause_s"], 2.05, places=2)
+        self.assertIn("pace_fast", {b["type"] for b in second["breaches"]})
+        self.assertEqual(result["longest_answer"]["index"], 0)
+
+        pauses = result["pauses"]
+        self.assertEqual(pauses["count"], 2)  # 17.6 s between answers, 2.05 s inside one
+        self.assertEqual(pauses["histogram"]["counts"], [0, 0, 0, 1, 0, 1])
+        windows = result["windows"]
+        self.assertEqual(len(windows["end_s"]), len(windows["wpm"]))
+        self.assertEqual(windows["fillers"][0], 6)
+
+    def test_without_transcript_the_whole_recording_is_one_turn(self):
+        result = analyze_delivery(WordColumns.from_dicts(_words("so well right", 0, 0.5)))
+        self.assertEqual(len(result["turns"]), 1)
+        self.assertEqual(result["fillers"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import os
+import sys
+from pathlib import Path
+import unittest
+
+
+# Ensure `services.*` imports work when running from repo root.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from fastapi import FastAPI  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+import api.face_nudge as face_nudge  # noqa: E402
+from services.latency_slo import DegradationLevel, LatencySLOController  # noqa: E402
+from services.testing import FakeClock, patch_globals  # noqa: E402
+
+
+class TestLatencySLOController(unittest.TestCase):
+    def _controller(self, clock: FakeClock) -> LatencySLOController:
+        return LatencySLOController(
+            "test",
+            slo_ms=1000,
+            window_size=20,
+            min_samples=5,
+            min_probe_samples=2,
+            probe_interval_s=10,
+            clock=clock,
+        )
+
+    def test_stays_normal_under_slo(self):
+        slo = self._controller(FakeClock())
+        for _ in range(20):
+            slo.record(200)
+        self.assertEqual(slo.level, DegradationLevel.NORMAL)
+        self.assertEqual(slo.plan(), DegradationLevel.NORMAL)
+
+    def test_escalates_one_level_at_a_time(self):
+        slo = self._controller(FakeClock())
+        for _ in range(5):
+            slo.record(3000)
+        self.assertEqual(slo.level, DegradationLevel.FAST_MODEL)
+        for _ in range(5):
+            slo.record(3000)
+        self.assertEqual(slo.level, DegradationLevel.FALLBACK_ONLY)
+
+    def test_fallback_only_probes_and_recovers(self):
+        clock = FakeClock()
+        slo = self._controller(clock)
+        for _ in range(10):
+            slo.record(3000)
+        self.assertEqual(slo.plan(), DegradationLevel.FALLBACK_ONLY)
+
+        clock.now += 10
+        self.assertEqual(slo.plan(), DegradationLevel.FAST_MODEL)
+        self.assertEqual(slo.plan(), DegradationLevel.FALLBACK_ONLY)
+        slo.record(100)
+        clock.now += 10
+        self.assertEqual(slo.plan(), DegradationLevel.FAST_MODEL)
+        slo.record(100)
+        self.assertEqual(slo.level, DegradationLevel.FAST_MODEL)
+
+        for _ in range(5):
+            slo.record(100)
+        self.assertEqual(slo.level, DegradationLevel.NORMAL)
+
+    def test_old_samples_expire(self):
+        clock = FakeClock()
+        slo = self._controller(clock)
+        for _ in range(4):
+            slo.record(3000)
+        clock.now += 1000
+        self.assertIsNone(slo.p95_ms())
+        slo.record(3000)
+        self.assertEqual(slo.level, DegradationLevel.NORMAL)
+
+
+class TestFaceNudgeSLORecording(unittest.TestCase):
+    def test_local_failures_are_not_recorded(self):
+        slo = LatencySLOController("phrase", slo_ms=1000)
+        patch_globals(self, face_nudge, phrase_slo=slo)
+        saved_key = os.environ.pop("OPENAI_API_KEY", None)
+        if saved_key is not None:
+            self.addCleanup(os.environ.__setitem__, "OPENAI_API_KEY", saved_key)
+
+        app = FastAPI()
+        app.include_router(face_nudge.router, prefix="/api/face")
+        response = TestClient(app).post(
+            "/api/face/nudge/phrase",
+            json={"t_ms": 0, "reason": "look_away", "severity": "low", "fallback_text": "Eyes up"},
+        )
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(slo.snapshot()["samples"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
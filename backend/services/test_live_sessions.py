@@ -0,0 +1,93 @@
+import asyncio
+import json
+import sys
+from pathlib import Path
+import unittest
+
+
+# Ensure `services.*` imports work when running from repo root.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import api.sessions as sessions  # noqa: E402
+from models.session import TranscriptSegment  # noqa: E402
+from services.live_sessions import LiveAggregates, LiveSessionRegistry  # noqa: E402
+from services.testing import sessions_client  # noqa: E402
+from services.transcription import TranscriptionResult  # noqa: E402
+
+
+def _segment(speaker: str, text: str, start_s: float, end_s: float) -> dict:
+    return {"speaker": speaker, "text": text, "startTime": start_s * 1000, "endTime": end_s * 1000}
+
+
+class TestLiveAggregates(unittest.TestCase):
+    def test_answers_fillers_and_window(self):
+        aggregates = LiveAggregates()
+        for segment in [
+            _segment("ai", "Tell me about the launch.", 0, 3),
+            _segment("user", "Um, so we, you know, shipped it", 4, 8),
+            _segment("user", "like last week", 8, 10),
+            _segment("user", "um and then", 45, 47),
+            _segment("ai", "And revenue?", 48, 50),
+            _segment("user", "Up.", 51, 52),
+        ]:
+            aggregates.add_segment(TranscriptSegment(**segment))
+
+        summary = aggregates.summary()
+        self.assertEqual(summary["words"], 14)
+        self.assertEqual(summary["fillers"], 5)  # um, so, you know, like, um
+        # The third user segment is more than 30 s after the first two.
+        self.assertEqual(summary["max_fillers_per_window"], 4)
+        self.assertEqual(summary["answers"], 2)
+        self.assertEqual(summary["longest_answer_s"], 43.0)
+        self.assertEqual(summary["mean_answer_s"], 22.0)
+        self.assertEqual(summary["current_answer_s"], 1.0)
+        self.assertEqual(summary["wpm"], round(14 / (9 / 60)))
+
+
+class TestLiveIngestion(unittest.TestCase):
+    def setUp(self):
+        async def fake_transcribe(audio):
+            return TranscriptionResult(text="ok", words=[])
+
+        self.client = sessions_client(
+            self, transcribe_audio=fake_transcribe, live_sessions=LiveSessionRegistry()
+        )
+
+    def _batch(self, seq: int, segments=(), nudges=()):
+        return self.client.post(
+            "/api/sessions/s1/live",
+            json={"seq": seq, "segments": list(segments), "nudges": list(nudges)},
+        )
+
+    def test_batches_are_idempotent_and_carry_into_the_upload(self):
+        question = _segment("ai", "Why now?", 0, 2)
+        answer = _segment("user", "Because um the market moved", 3, 6)
+        self.assertEqual(self._batch(0, [question]).json()["next_seq"], 1)
+        first = self._batch(1, [answer], [{"text": "Slow down", "severity": "gentle", "timestamp": 5000}])
+        self.assertEqual(first.json()["metrics"]["fillers"], 1)
+        # A resent batch is acknowledged but not counted again.
+        again = self._batch(1, [answer])
+        self.assertEqual(again.json()["metrics"], first.json()["metrics"])
+        gap = self._batch(3, [answer])
+        self.assertEqual(gap.status_code, 409)
+        self.assertEqual(gap.headers["Live-Next-Seq"], "2")
+
+        metadata = {"sessionId": "s1", "mode": "coach"}
+        upload = self.client.post(
+            "/api/sessions",
+            files={"audio": ("take.webm", b"audio", "audio/webm")},
+            data={"metadata": json.dumps(metadata)},
+        )
+        self.assertEqual(upload.status_code, 200)
+        stored = asyncio.run(sessions.session_store.get("s1"))
+        self.assertEqual([s.text for s in stored.metadata.transcript], ["Why now?", answer["text"]])
+
+        final = self.client.get("/api/sessions/s1/live").json()
+        self.assertFalse(final["live"])
+        self.assertEqual(final["metrics"], first.json()["metrics"])
+        self.assertEqual(final["metrics"]["nudges"], {"gentle": 1})
+        self.assertEqual(self._batch(2, [answer]).status_code, 409)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import sys
+from pathlib import Path
+import unittest
+
+import numpy as np
+
+
+# Ensure `services.*` imports work when running from repo root.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from models.metric_series import MetricSeries  # noqa: E402
+from models.session import Session, SessionMetadata  # noqa: E402
+from services.downsampling import downsample_series, lttb  # noqa: E402
+
+
+def _samples(start: int, count: int) -> list[dict]:
+    return [{"t": t * 1000, "wpm": float(t)} for t in range(start, start + count)]
+
+
+class TestMetricSeries(unittest.TestCase):
+    def test_ring_keeps_newest_samples_in_order(self):
+        series = MetricSeries(capacity=500)
+        for start in range(0, 1200, 100):
+            series.append(_samples(start, 100))
+        t, v = series.series("wpm")
+        self.assertEqual(len(series), 500)
+        self.assertEqual(len(series.t_ms), 500)
+        self.assertEqual(t[0], 700_000)
+        self.assertEqual(t[-1], 1_199_000)
+        self.assertTrue(np.all(np.diff(t) > 0))
+        np.testing.assert_array_equal(v, t / 1000)
+
+    def test_resent_and_partial_samples(self):
+        series = MetricSeries(capacity=100)
+        self.assertEqual(series.append(_samples(0, 10)), 10)
+        self.assertEqual(series.append(_samples(5, 10)), 5)  # 5..9 already stored
+        series.append([{"t": 20_000, "filler_rate": 2.5}])
+        self.assertEqual(len(series.series("wpm")[0]), 15)
+        self.assertEqual(series.series("filler_rate")[0].tolist(), [20_000])
+
+    def test_persists_with_session(self):
+        session = Session(id="s", metadata=SessionMetadata(sessionId="s", mode="coach"))
+        session.metric_series = MetricSeries(capacity=50)
+        session.metric_series.append(_samples(0, 80))
+        restored = Session.model_validate_json(session.model_dump_json())
+        self.assertEqual(restored.metric_series.capacity, 50)
+        np.testing.assert_array_equal(
+            restored.metric_series.series("wpm")[0], session.metric_series.series("wpm")[0]
+        )
+
+
+class TestLttb(unittest.TestCase):
+    def test_keeps_endpoints_and_spikes(self):
+        t = np.arange(5000) * 1000
+        v = np.full(5000, 150.0)
+        v[1234], v[4321] = 320.0, 40.0
+        kept = lttb(t, v, 100)
+        self.assertEqual(len(kept), 100)
+        self.assertEqual((kept[0], kept[-1]), (0, 4999))
+        self.assertIn(1234, kept)
+        self.assertIn(4321, kept)
+        self.assertTrue(np.all(np.diff(kept) > 0))
+
+    def test_short_series_is_returned_whole(self):
+        series = MetricSeries()
+        series.append(_samples(0, 40))
+        out = downsample_series(series, ["wpm", "prosody_variance"], 300, t0_ms=10_000)
+        self.assertEqual(out["wpm"]["total"], 30)
+        self.assertEqual(out["wpm"]["t"][0], 10_000)
+        self.assertEqual(out["prosody_variance"]["t"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
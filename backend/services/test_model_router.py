@@ -0,0 +1,98 @@
+import asyncio
+import json
+import sys
+from pathlib import Path
+import unittest
+
+import httpx
+
+
+# Ensure `services.*` imports work when running from repo root.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from services.model_router import ModelRouter, parse_ladder  # noqa: E402
+
+
+class TestModelRouter(unittest.TestCase):
+    def test_parse_ladder_dedupes_and_falls_back_to_default(self):
+        self.assertEqual(parse_ladder(" a, b ,a,, ", ["x"]), ["a", "b"])
+        self.assertEqual(parse_ladder(None, ["x", "x", "y"]), ["x", "y"])
+
+    def test_candidates_start_at_tier_then_fall_back_downwards(self):
+        router = ModelRouter()
+        router.register("r", ["small", "medium", "large"])
+        self.assertEqual(router.candidates("r", 0), ["small", "medium", "large"])
+        self.assertEqual(router.candidates("r", 1), ["medium", "large", "small"])
+        self.assertEqual(router.candidates("r", 9), ["large", "medium", "small"])
+
+    def test_unhealthy_models_move_to_the_back(self):
+        router = ModelRouter(min_calls_for_health=3)
+        router.register("r", ["small", "large"], latency_target_ms=1000)
+        for _ in range(3):
+            router.record("r", "small", 100, ok=False)
+        self.assertEqual(router.candidates("r", 0), ["large", "small"])
+
+        router.register("slow", ["small", "large"], latency_target_ms=1000)
+        for _ in range(3):
+            router.record("slow", "small", 5000, ok=True)
+        self.assertEqual(router.candidates("slow", 0), ["large", "small"])
+
+    def test_record_accumulates_usage_cost(self):
+        router = ModelRouter(prices={"m": (1.0, 2.0)})
+        router.register("r", ["m"])
+        router.record(
+            "r", "m", 10, ok=True, usage={"input_tokens": 1000, "output_tokens": 500}
+        )
+        stats = router.snapshot()["r"]["models"]["m"]
+        self.assertEqual(stats["calls"], 1)
+        self.assertAlmostEqual(stats["cost_usd"], 0.002)
+
+    def test_prompt_cache_hits_are_tracked_per_route(self):
+        router = ModelRouter()
+        router.register("r", ["m"])
+        router.record(
+            "r",
+            "m",
+            100,
+            ok=True,
+            usage={"input_tokens": 2000, "input_tokens_details": {"cached_tokens": 1536}},
+        )
+        router.record("r", "m", 300, ok=True, usage={"input_tokens": 2000})
+        cache = router.snapshot()["r"]["prompt_cache"]
+        self.assertEqual(cache["cached_tokens"], 1536)
+        self.assertEqual(cache["cached_token_ratio"], 0.384)
+        self.assertEqual(cache["avg_hit_latency_ms"], 100)
+        self.assertEqual(cache["avg_miss_latency_ms"], 300)
+
+    def test_post_falls_back_on_retryable_status(self):
+        router = ModelRouter()
+        router.register("r", ["small", "large"])
+        seen: list[str] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            model = json.loads(request.content)["model"]
+            seen.append(model)
+            if model == "small":
+                return httpx.Response(503, text="overloaded")
+            return httpx.Response(200, json={"output_text": "{}", "usage": {}})
+
+        async def run():
+            async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+                return await router.post(
+                    client,
+                    "r",
+                    router.candidates("r"),
+                    url="https://example.test/v1/responses",
+                    headers={},
+                    payload={"input": []},
+                )
+
+        response, model = asyncio.run(run())
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(model, "large")
+        self.assertEqual(seen, ["small", "large"])
+        self.assertEqual(router.snapshot()["r"]["models"]["small"]["errors"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import random
+import sys
+from pathlib import Path
+import unittest
+
+
+# Ensure `services.*` imports work when running from repo root.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from services.phrase_matcher import PhraseMatcher, match_phrases  # noqa: E402
+
+
+def _times(words):
+    starts = [i * 0.5 for i in range(len(words))]
+    return starts, [s + 0.4 for s in starts]
+
+
+class TestPhraseMatcher(unittest.TestCase):
+    def test_literal_hits_match_brute_force(self):
+        rng = random.Random(3)
+        vocab = ["alpha", "bravo", "charlie", "delta"]
+        phrases = list(
+            dict.fromkeys(
+                " ".join(rng.choice(vocab) for _ in range(rng.randint(1, 4))) for _ in range(40)
+            )
+        )
+        words = [rng.choice(vocab) for _ in range(500)]
+        matcher = PhraseMatcher(key_messages=phrases, fillers=(), risk_phrases=())
+        found = {
+            (h.label, h.start_index, h.end_index)
+            for h in matcher.scan(words, *_times(words))
+            if not matcher.patterns[h.pattern].content
+        }
+        expected = {
+            (phrase, i, i + len(phrase.split()))
+            for phrase in phrases
+            for i in range(len(words))
+            if words[i : i + len(phrase.split())] == phrase.split()
+        }
+        self.assertEqual(found, expected)
+
+    def test_red_lines_key_messages_and_fuzzy_words(self):
+        words = (
+            "Um, we won't speculate on futur layoffs. Honestly, customer security and "
+            "privacy remain top priorities, I guarantee it."
+        ).split()
+        result = match_phrases(
+            words,
+            *_times(words),
+            key_messages=["Customer security and privacy are our top priorities"],
+            red_lines=["Do not speculate about future layoffs"],
+        )
+        self.assertEqual(result["red_lines_crossed"], ["Do not speculate about future layoffs"])
+        by_type = {f["issue_type"]: f for f in result["flags"]}
+        # "futur" is one edit from "future"; both red-line bigrams merge into one flag.
+        self.assertEqual(by_type["red_line"]["evidence_quote"], "speculate on futur layoffs.")
+        self.assertEqual(by_type["red_line"]["severity"], "high")
+        self.assertEqual(by_type["risk_language"]["evidence_quote"], "guarantee")
+        self.assertEqual(result["fuzzy_hits"], 2)
+        # Paraphrased: 3 of its 4 content bigrams ("privacy top" is missing).
+        self.assertEqual(result["key_messages"][0]["coverage"], 0.75)
+        self.assertEqual(result["fillers"], {"um": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
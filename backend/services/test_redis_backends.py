@@ -0,0 +1,235 @@
+import asyncio
+import fnmatch
+import socketserver
+import sys
+import threading
+import time
+from pathlib import Path
+import unittest
+
+
+# Ensure `services.*` imports work when running from repo root.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from models.session import AnalysisStatus, Session, SessionMetadata  # noqa: E402
+from services.redis_session_backend import RedisSessionBackend  # noqa: E402
+from services.resp_client import RespClient, RespError, read_reply  # noqa: E402
+from services.response_cache import RedisResponseCache  # noqa: E402
+from services.session_store import SessionStore  # noqa: E402
+
+
+class FakeRedisServer(socketserver.ThreadingTCPServer):
+    """In-process server for the handful of Redis commands the app uses."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        self.data: dict[bytes, tuple[bytes, float | None]] = {}
+        self.versions: dict[bytes, int] = {}  # bumped on every write, for WATCH
+        self.lock = threading.RLock()
+        super().__init__(("127.0.0.1", 0), _FakeRedisHandler)
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    @property
+    def url(self) -> str:
+        return f"redis://127.0.0.1:{self.server_address[1]}/0"
+
+    def _live(self, key: bytes) -> bytes | None:
+        entry = self.data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and time.monotonic() >= expires_at:
+            del self.data[key]
+            return None
+        return value
+
+    def handle_command(self, args: list[bytes]) -> bytes:
+        name = args[0].upper()
+        with self.lock:
+            if name == b"PING":
+                return b"+PONG\r\n"
+            if name == b"SET":
+                expires_at = None
+                if len(args) == 5 and args[3].upper() == b"EX":
+                    expires_at = time.monotonic() + int(args[4])
+                self.data[args[1]] = (args[2], expires_at)
+                self.versions[args[1]] = self.versions.get(args[1], 0) + 1
+                return b"+OK\r\n"
+            if name == b"GET":
+                return _bulk(self._live(args[1]))
+            if name == b"MGET":
+                return b"*%d\r\n" % (len(args) - 1) + b"".join(
+                    _bulk(self._live(key)) for key in args[1:]
+                )
+            if name == b"SCAN":  # one pass: MATCH pattern COUNT n
+                pattern = args[3].decode()
+                keys = [
+                    key
+                    for key in list(self.data)
+                    if fnmatch.fnmatchcase(key.decode(), pattern) and self._live(key) is not None
+                ]
+                return b"*2\r\n" + _bulk(b"0") + b"*%d\r\n" % len(keys) + b"".join(
+                    _bulk(key) for key in keys
+                )
+            if name == b"DEL":
+                removed = sum(1 for key in args[1:] if self.data.pop(key, None) is not None)
+                for key in args[1:]:
+                    self.versions[key] = self.versions.get(key, 0) + 1
+                return b":%d\r\n" % removed
+            return b"-ERR unknown command '%s'\r\n" % args[0]
+
+
+def _bulk(value: bytes | None) -> bytes:
+    if value is None:
+        return b"$-1\r\n"
+    return b"$%d\r\n%s\r\n" % (len(value), value)
+
+
+class _FakeRedisHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        watched: dict[bytes, int] = {}
+        queued: list | None = None
+        while True:
+            try:
+                args = read_reply(self.rfile)
+            except ConnectionError:
+                return
+            name = args[0].upper()
+            server = self.server
+            if name == b"WATCH":
+                with server.lock:
+                    watched.update({key: server.versions.get(key, 0) for key in args[1:]})
+                reply = b"+OK\r\n"
+            elif name == b"UNWATCH":
+                watched.clear()
+                reply = b"+OK\r\n"
+            elif name == b"MULTI":
+                queued = []
+                reply = b"+OK\r\n"
+            elif name == b"EXEC":
+                with server.lock:
+                    if all(server.versions.get(k, 0) == v for k, v in watched.items()):
+                        replies = [server.handle_command(cmd) for cmd in queued or []]
+                        reply = b"*%d\r\n" % len(replies) + b"".join(replies)
+                    else:
+                        reply = b"*-1\r\n"
+                watched.clear()
+                queued = None
+            elif queued is not None:
+                queued.append(args)
+                reply = b"+QUEUED\r\n"
+            else:
+                reply = server.handle_command(args)
+            self.wfile.write(reply)
+
+
+def _session(session_id: str, words: int = 0) -> Session:
+    return Session(
+        id=session_id,
+        metadata=SessionMetadata(sessionId=session_id, mode="journalist", transcript=[]),
+        transcript_text="so " * words,
+        word_timings=[
+            {"word": "so", "start": i * 0.25, "end": i * 0.25 + 0.125} for i in range(words)
+        ],
+    )
+
+
+class TestRedisBackends(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeRedisServer()
+        self.client = RespClient(self.server.url)
+
+    def tearDown(self):
+        self.client.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_client_pipeline_and_errors(self):
+        self.assertEqual(self.client.execute("PING"), "PONG")
+        replies = self.client.pipeline([("SET", "k", "v"), ("NOPE",), ("GET", "k")])
+        self.assertEqual(replies[0], "OK")
+        self.assertIsInstance(replies[1], RespError)
+        self.assertEqual(replies[2], b"v")
+        with self.assertRaises(RespError):
+            self.client.execute("NOPE")
+
+    def test_client_reconnects_after_dropped_connection(self):
+        self.client.execute("SET", "k", "v")
+        self.client._local.sock.close()
+        self.assertEqual(self.client.execute("GET", "k"), b"v")
+
+    def test_session_backend_shared_between_instances(self):
+        writer = SessionStore(RedisSessionBackend(self.client, ttl_s=60))
+
+        async def write():
+            await writer.save(_session("a", words=2000))
+            await writer.save(_session("b"))
+            await writer.update_status("b", AnalysisStatus.ERROR, "boom")
+
+        asyncio.run(write())
+
+        other = RedisSessionBackend(RespClient(self.server.url), ttl_s=60)
+        session = other.get("a")
+        self.assertEqual(session.word_timings, _session("a", words=2000).word_timings)
+        self.assertEqual(other.get("b").error, "boom")
+        self.assertIsNone(other.get("missing"))
+
+        stored, expires_at = self.server.data[b"kawkai:session:a"]
+        self.assertIsNotNone(expires_at)
+        self.assertLess(len(stored), len(_session("a", words=2000).model_dump_json()) // 4)
+        other.client.close()
+
+    def test_rebuild_index_from_stored_sessions(self):
+        backend = RedisSessionBackend(self.client, ttl_s=60)
+        backend.save_many([_session(session_id, words=3) for session_id in ("a", "b", "c")])
+        self.assertEqual(backend.stats()["writes"], 3)
+        self.client.execute("SET", "unrelated", "x")
+
+        store = SessionStore(RedisSessionBackend(RespClient(self.server.url), ttl_s=60))
+        self.assertEqual(asyncio.run(store.rebuild_index()), 3)
+        result = asyncio.run(store.search("so so"))
+        self.assertEqual(sorted(s["session_id"] for s in result["sessions"]), ["a", "b", "c"])
+        self.assertTrue(result["partial"])
+        store.backend.client.close()
+
+    def test_update_retries_after_a_concurrent_write(self):
+        backend = RedisSessionBackend(self.client, ttl_s=60)
+        backend.save(_session("a"))
+        other = RedisSessionBackend(RespClient(self.server.url), ttl_s=60)
+        real_pipeline = self.client.pipeline
+        raced = []
+
+        def pipeline(commands, **kwargs):
+            commands = list(commands)
+            if commands[0][0] == "MULTI" and not raced:
+                # Another instance finishes the analysis between WATCH and EXEC.
+                raced.append(other.update("a", {"analysis_status": AnalysisStatus.COMPLETE}))
+            return real_pipeline(commands, **kwargs)
+
+        self.client.pipeline = pipeline
+        updated = backend.update("a", {"status": AnalysisStatus.COMPLETE})
+        self.assertEqual(updated.status, AnalysisStatus.COMPLETE)
+        self.assertEqual(updated.analysis_status, AnalysisStatus.COMPLETE)
+        self.assertEqual(backend.stats()["conflicts"], 1)
+        self.assertIsNone(backend.update("missing", {"error": "x"}))
+        other.client.close()
+
+    def test_response_cache_round_trip_and_outage(self):
+        cache = RedisResponseCache("scenario", self.client, ttl_s=60)
+        asyncio.run(cache.set_many({"k1": {"name": "Crisis"}, "k2": {"name": "Launch"}}))
+        self.assertEqual(
+            asyncio.run(cache.get_many(["k1", "k2", "k3"])),
+            [{"name": "Crisis"}, {"name": "Launch"}, None],
+        )
+        self.assertEqual(cache.stats()["hits"], 2)
+
+        down = RedisResponseCache("scenario", RespClient("redis://127.0.0.1:1", timeout_s=0.2))
+        self.assertIsNone(asyncio.run(down.get("k1")))
+        asyncio.run(down.set("k1", {"name": "x"}))
+        self.assertEqual(down.stats()["errors"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,153 @@
+import base64
+import hashlib
+import sys
+from pathlib import Path
+import unittest
+
+
+# Ensure `services.*` imports work when running from repo root.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import api.sessions as sessions  # noqa: E402
+from services.resumable_uploads import ResumableUploadRegistry  # noqa: E402
+from services.testing import patch_globals, sessions_client  # noqa: E402
+from services.transcription import TranscriptionResult  # noqa: E402
+
+AUDIO = bytes(range(256)) * 40  # 10 KiB
+METADATA = {"sessionId": "s1", "mode": "coach", "transcript": []}
+
+
+class _FullQueue:
+    def submit(self, job) -> bool:
+        return False
+
+    def notify(self, session_id: str) -> None:
+        pass
+
+
+class TestResumableUploads(unittest.TestCase):
+    def setUp(self):
+        self.transcribed = []
+        self.failures = 0
+
+        async def fake_transcribe(audio):
+            self.transcribed.append(await audio.read_all())
+            if self.failures:
+                self.failures -= 1
+                raise RuntimeError("upstream 500")
+            return TranscriptionResult(text="ok", words=[])
+
+        self.client = sessions_client(
+            self, transcribe_audio=fake_transcribe, resumable_uploads=ResumableUploadRegistry()
+        )
+
+    def _put(self, upload_id: str, start: int, end: int, **headers):
+        return self.client.put(
+            f"/api/sessions/uploads/{upload_id}",
+            content=AUDIO[start:end],
+            headers={"Content-Range": f"bytes {start}-{end - 1}/{len(AUDIO)}", **headers},
+        )
+
+    def _finalize(self, upload_id: str, query: str = ""):
+        return self.client.post(
+            f"/api/sessions/uploads/{upload_id}/finalize{query}", json={"metadata": METADATA}
+        )
+
+    def _create(self, **body) -> str:
+        response = self.client.post("/api/sessions/uploads", json=body)
+        self.assertEqual(response.status_code, 201)
+        return response.json()["upload_id"]
+
+    def test_resume_after_gap_and_retry(self):
+        upload_id = self._create(
+            filename="take.webm",
+            size=len(AUDIO),
+            sha256=hashlib.sha256(AUDIO).hexdigest(),
+        )
+
+        self.assertEqual(self._put(upload_id, 0, 4000).json()["offset"], 4000)
+        # A chunk past the received offset is refused with the resume point.
+        gap = self._put(upload_id, 6000, 8000)
+        self.assertEqual(gap.status_code, 409)
+        self.assertEqual(gap.headers["Upload-Offset"], "4000")
+        # A retry overlapping received bytes only appends the new tail.
+        self.assertEqual(self._put(upload_id, 2000, 7000).json()["offset"], 7000)
+        status = self.client.get(f"/api/sessions/uploads/{upload_id}")
+        self.assertEqual(status.json(), {"upload_id": upload_id, "offset": 7000, "size": len(AUDIO)})
+
+        early = self.client.post(
+            f"/api/sessions/uploads/{upload_id}/finalize", json={"metadata": METADATA}
+        )
+        self.assertEqual(early.status_code, 409)
+
+        digest = base64.b64encode(hashlib.sha256(AUDIO[7000:]).digest()).decode()
+        bad = self._put(upload_id, 7000, len(AUDIO), **{"Content-Digest": "sha-256=:AAAA:"})
+        self.assertEqual(bad.status_code, 400)
+        good = self._put(upload_id, 7000, len(AUDIO), **{"Content-Digest": f"sha-256=:{digest}:"})
+        self.assertEqual(good.json()["offset"], len(AUDIO))
+
+        done = self.client.post(
+            f"/api/sessions/uploads/{upload_id}/finalize", json={"metadata": METADATA}
+        )
+        self.assertEqual(done.status_code, 200)
+        self.assertEqual(done.json()["status"], "complete")
+        self.assertEqual(self.transcribed, [AUDIO])
+        self.assertEqual(self.client.get(f"/api/sessions/uploads/{upload_id}").status_code, 404)
+
+        stats = sessions.resumable_uploads.stats()
+        self.assertEqual(stats["duplicate_bytes"], 2000)
+        self.assertEqual(stats["in_progress"], 0)
+
+    def test_finalize_rejects_digest_mismatch(self):
+        upload_id = self._create()
+        self.assertEqual(self._put(upload_id, 0, len(AUDIO)).status_code, 200)
+        response = self.client.post(
+            f"/api/sessions/uploads/{upload_id}/finalize",
+            json={"metadata": METADATA, "sha256": "0" * 64},
+        )
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(self.transcribed, [])
+        self.assertEqual(self.client.delete(f"/api/sessions/uploads/{upload_id}").status_code, 204)
+
+    def test_overlapping_retry_must_match_received_bytes(self):
+        upload_id = self._create(size=len(AUDIO))
+        self.assertEqual(self._put(upload_id, 0, 4000).status_code, 200)
+        response = self.client.put(
+            f"/api/sessions/uploads/{upload_id}",
+            content=b"x" * 1000 + AUDIO[4000:6000],
+            headers={"Content-Range": f"bytes 3000-5999/{len(AUDIO)}"},
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.client.get(f"/api/sessions/uploads/{upload_id}").json()["offset"], 4000)
+        self.assertEqual(self._put(upload_id, 3000, len(AUDIO)).json()["offset"], len(AUDIO))
+        self.assertEqual(self._finalize(upload_id).status_code, 200)
+        self.assertEqual(self.transcribed, [AUDIO])
+
+    def test_finalize_can_be_retried_after_queue_full(self):
+        upload_id = self._create(size=len(AUDIO))
+        self.assertEqual(self._put(upload_id, 0, len(AUDIO)).status_code, 200)
+
+        patch_globals(self, sessions, transcription_jobs=_FullQueue())
+        busy = self._finalize(upload_id, "?async=true")
+        self.assertEqual(busy.status_code, 503)
+        self.assertEqual(self.client.get(f"/api/sessions/uploads/{upload_id}").status_code, 200)
+
+        retry = self._finalize(upload_id)
+        self.assertEqual(retry.status_code, 200)
+        self.assertEqual(retry.json()["status"], "complete")
+        self.assertEqual(self.transcribed, [AUDIO])
+        self.assertEqual(self.client.get(f"/api/sessions/uploads/{upload_id}").status_code, 404)
+
+    def test_finalize_can_be_retried_after_transcription_error(self):
+        upload_id = self._create(size=len(AUDIO))
+        self.assertEqual(self._put(upload_id, 0, len(AUDIO)).status_code, 200)
+        self.failures = 1
+        self.assertEqual(self._finalize(upload_id).status_code, 500)
+        retry = self._finalize(upload_id)
+        self.assertEqual(retry.status_code, 200)
+        self.assertEqual(self.transcribed, [AUDIO, AUDIO])
+        self.assertEqual(sessions.resumable_uploads.stats()["finalized"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
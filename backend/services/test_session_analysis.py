@@ -0,0 +1,118 @@
+import asyncio
+import sys
+import time
+from pathlib import Path
+import unittest
+
+
+# Ensure `services.*` imports work when running from repo root.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import api.sessions as sessions  # noqa: E402
+from models.session import AnalysisStatus, Session, SessionMetadata  # noqa: E402
+from services import session_analysis  # noqa: E402
+from services.testing import patch_globals, sessions_client  # noqa: E402
+
+
+def _transcript(answers: int) -> list[dict]:
+    segments = []
+    for i in range(answers):
+        t = i * 20_000
+        segments.append({"speaker": "ai", "text": f"Question {i + 1}?", "startTime": t, "endTime": t + 3000})
+        segments.append(
+            {"speaker": "user", "text": f"Answer {i + 1} " + "words " * 20, "startTime": t + 4000, "endTime": t + 15000}
+        )
+    return segments
+
+
+class FakeModel:
+    """Stands in for `_call_model`: flags answer 2 (and a number from another chunk)."""
+
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+        self.calls: dict[str, int] = {}
+
+    async def __call__(self, client, name, schema, task_prompt, inputs, *, max_output_tokens):
+        self.calls[name] = self.calls.get(name, 0) + 1
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(0.01)
+        finally:
+            self.active -= 1
+        if name == "rewrites_and_drills":
+            return {
+                "rewrites": [{"answer": 2, "improved_answer": "Better.", "explanation": "Shorter."}],
+                "drills": [{"name": "Topline", "instructions": "10 s first.", "target_metric": "answers < 30 s"}],
+            }
+        flags = []
+        if "[2] Q:" in inputs:
+            flags.append(
+                {
+                    "answer": 2,
+                    "issue_type": "speculation",
+                    "severity": "high",
+                    "evidence_quote": "Answer 2",
+                    "recommendation": "Stick to facts.",
+                }
+            )
+            flags.append({**flags[0], "answer": 99})
+        score = 2 if "[2] Q:" in inputs else 4
+        return {"section_scores": {name: score for name in session_analysis.SECTIONS}, "flags": flags}
+
+
+class TestSessionAnalysis(unittest.TestCase):
+    def setUp(self):
+        self.model = FakeModel()
+        patch_globals(
+            self,
+            session_analysis,
+            _call_model=self.model,
+            ANALYSIS_CONCURRENCY=3,
+            ANALYSIS_CHUNK_CHARS=1,  # one exchange per chunk
+        )
+
+    def test_map_reduce_with_bounded_parallelism(self):
+        result = asyncio.run(session_analysis.analyze_transcript(_transcript(10)))
+
+        self.assertEqual(self.model.calls, {"answer_review": 10, "rewrites_and_drills": 1})
+        self.assertEqual(self.model.peak, 3)
+        # Nine answers score 4 and one scores 2, all the same length.
+        self.assertEqual(result.section_scores.message_discipline, 4)
+        self.assertEqual(result.overall_score, 80)
+        self.assertEqual(len(result.timestamped_flags), 1)
+        flag = result.timestamped_flags[0]
+        self.assertEqual((flag.start_time, flag.end_time), (24.0, 35.0))
+        self.assertEqual(result.rewrites[0].question, "Question 2?")
+        self.assertTrue(result.rewrites[0].original_answer.startswith("Answer 2"))
+        self.assertEqual(result.drills[0].name, "Topline")
+
+    def test_chunks_pack_consecutive_exchanges(self):
+        exchanges = session_analysis.build_exchanges(_transcript(5))
+        size = len(exchanges[0].prompt())
+        chunks = session_analysis.chunk_exchanges(exchanges, max_chars=2 * size + 5)
+        self.assertEqual([[e.number for e in chunk] for chunk in chunks], [[1, 2], [3, 4], [5]])
+
+    def test_endpoint_drives_analysis_status(self):
+        client = sessions_client(self)
+        metadata = SessionMetadata(sessionId="s1", mode="coach", transcript=_transcript(3))
+        asyncio.run(sessions.session_store.save(Session(id="s1", metadata=metadata)))
+        with client:
+            started = client.post("/api/sessions/s1/analysis")
+            self.assertEqual(started.status_code, 202)
+            self.assertEqual(started.json()["status"], "processing")
+            for _ in range(100):
+                body = client.get("/api/sessions/s1/analysis").json()
+                if body["status"] != "processing":
+                    break
+                time.sleep(0.01)
+        self.assertEqual(body["status"], "complete")
+        self.assertEqual(len(body["analysis"]["timestamped_flags"]), 1)
+        stored = asyncio.run(sessions.session_store.get("s1"))
+        self.assertEqual(stored.analysis_status, AnalysisStatus.COMPLETE)
+        self.assertEqual(stored.status, AnalysisStatus.PENDING)  # transcription untouched
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import random
+import sys
+from pathlib import Path
+import unittest
+
+
+# Ensure `services.*` imports work when running from repo root.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from models.session import Session, SessionMetadata  # noqa: E402
+from models.word_timings import WordColumns  # noqa: E402
+from services.session_index import (  # noqa: E402
+    IntervalTree,
+    SessionIndexCache,
+    WordTimeIndex,
+    query_range,
+)
+
+
+def _flag(start: float, end: float) -> dict:
+    return {
+        "start_time": start,
+        "end_time": end,
+        "issue_type": "rambling",
+        "severity": "medium",
+        "evidence_quote": "...",
+        "recommendation": "Land the point.",
+    }
+
+
+class TestSessionIndex(unittest.TestCase):
+    def test_word_and_interval_queries_match_brute_force(self):
+        rng = random.Random(5)
+        words = []
+        for i in range(400):
+            start = rng.uniform(0, 120)
+            words.append({"word": f"w{i}", "start": start, "end": start + rng.uniform(0.05, 3.0)})
+        columns = WordColumns.from_dicts(words)  # deliberately unsorted, overlapping
+        index = WordTimeIndex(columns)
+        spans = [(rng.uniform(0, 120), rng.uniform(0, 40)) for _ in range(60)]
+        tree = IntervalTree([a for a, _ in spans], [a + b for a, b in spans])
+
+        for _ in range(200):
+            t0 = rng.uniform(-5, 125)
+            t1 = t0 + rng.uniform(0, 20)
+            lo, hi = round(t0 * 1000), round(t1 * 1000)
+            found = {index.word(p) for p in index.overlapping(lo, hi).tolist()}
+            expected = {
+                w for w, s, e in zip(columns.words, columns.start_ms, columns.end_ms)
+                if s <= hi and e >= lo
+            }
+            self.assertEqual(found, expected)
+            self.assertEqual(
+                sorted(tree.overlapping(t0, t1)),
+                [i for i, (a, b) in enumerate(spans) if a <= t1 and a + b >= t0],
+            )
+
+    def test_projection_pagination_and_cache(self):
+        words = [{"word": f"w{i}", "start": i * 0.5, "end": i * 0.5 + 0.4} for i in range(100)]
+        session = Session(
+            id="s1",
+            metadata=SessionMetadata(sessionId="s1", mode="coach"),
+            word_timings=words,
+            analysis={
+                "overall_score": 70,
+                "section_scores": {
+                    "message_discipline": 3,
+                    "question_handling": 3,
+                    "risk_compliance": 4,
+                    "soundbites": 3,
+                    "tone_presence": 4,
+                },
+                "timestamped_flags": [_flag(2.0, 4.0), _flag(30.0, 31.0)],
+                "rewrites": [],
+                "drills": [],
+            },
+        )
+        cache = SessionIndexCache()
+        index = cache.get(session)
+        self.assertIs(cache.get(session), index)
+
+        first = query_range(index, 10.0, 20.0, fields=["start"], limit=8)
+        self.assertEqual(first["total_words"], 21)  # words 20..40 touch [10, 20]
+        self.assertEqual(first["words"][0], {"start": 10.0})
+        self.assertEqual(first["flags"], [])
+        collected = list(first["words"])
+        cursor = first["next_cursor"]
+        while cursor is not None:
+            page = query_range(index, 10.0, 20.0, fields=["start"], limit=8, cursor=cursor)
+            self.assertNotIn("flags", page)
+            collected += page["words"]
+            cursor = page["next_cursor"]
+        self.assertEqual([w["start"] for w in collected], [i * 0.5 for i in range(20, 41)])
+
+        around = query_range(index, 3.5, 5.0, fields=["word", "index"])
+        self.assertEqual(around["words"][0], {"word": "w7", "index": 7})
+        self.assertEqual([f["start_time"] for f in around["flags"]], [2.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
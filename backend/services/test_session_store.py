@@ -0,0 +1,74 @@
+import asyncio
+import sys
+from pathlib import Path
+import unittest
+
+
+# Ensure `services.*` imports work when running from repo root.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from models.session import AnalysisStatus, Session, SessionMetadata  # noqa: E402
+from services.session_store import (  # noqa: E402
+    MemorySessionBackend,
+    SessionStore,
+    estimate_session_bytes,
+)  # noqa: E402
+from services.testing import FakeClock  # noqa: E402
+
+
+def _session(session_id: str, words: int = 0) -> Session:
+    return Session(
+        id=session_id,
+        metadata=SessionMetadata(sessionId=session_id, mode="coach", transcript=[]),
+        word_timings=[
+            {"word": "word", "start": i * 0.5, "end": i * 0.5 + 0.4} for i in range(words)
+        ],
+    )
+
+
+class TestSessionStore(unittest.TestCase):
+    def test_lru_eviction_by_entry_count(self):
+        backend = MemorySessionBackend(max_entries=2, max_bytes=0, ttl_s=0)
+        backend.save(_session("a"))
+        backend.save(_session("b"))
+        self.assertIsNotNone(backend.get("a"))  # "b" is now least recently used
+        backend.save(_session("c"))
+        self.assertIsNone(backend.get("b"))
+        self.assertIsNotNone(backend.get("a"))
+        self.assertEqual(backend.stats()["evictions"]["lru"], 1)
+
+    def test_eviction_by_estimated_bytes(self):
+        big = _session("big", words=1000)
+        limit = estimate_session_bytes(big) + estimate_session_bytes(_session("x")) // 2
+        backend = MemorySessionBackend(max_entries=0, max_bytes=limit, ttl_s=0)
+        backend.save(big)
+        backend.save(_session("small"))
+        self.assertIsNone(backend.get("big"))
+        self.assertIsNotNone(backend.get("small"))
+        self.assertEqual(backend.stats()["evictions"]["bytes"], 1)
+        self.assertEqual(
+            backend.stats()["estimated_bytes"], estimate_session_bytes(_session("small"))
+        )
+
+    def test_ttl_expiry_and_sweep(self):
+        clock = FakeClock()
+        store = SessionStore(MemorySessionBackend(ttl_s=10, clock=clock))
+
+        async def scenario():
+            await store.save_many([_session("a"), _session("b")])
+            clock.now = 5
+            await store.update_status("b", AnalysisStatus.PROCESSING)  # refreshes write time
+            clock.now = 11
+            self.assertIsNone(await store.get("a"))
+            self.assertEqual(await store.sweep(), 0)
+            clock.now = 16
+            self.assertEqual(await store.sweep(), 1)
+            return await store.stats()
+
+        stats = asyncio.run(scenario())
+        self.assertEqual(stats["entries"], 0)
+        self.assertEqual(stats["estimated_bytes"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
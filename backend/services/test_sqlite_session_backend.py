@@ -0,0 +1,105 @@
+import asyncio
+import os
+import sys
+import tempfile
+from pathlib import Path
+import unittest
+
+
+# Ensure `services.*` imports work when running from repo root.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from models.session import AnalysisStatus, Session, SessionMetadata  # noqa: E402
+from services.session_store import SessionStore  # noqa: E402
+from services.sqlite_session_backend import SQLiteSessionBackend  # noqa: E402
+from services.testing import FakeClock  # noqa: E402
+
+
+def _session(session_id: str, words: int = 0) -> Session:
+    return Session(
+        id=session_id,
+        metadata=SessionMetadata(sessionId=session_id, mode="coach", transcript=[]),
+        transcript_text="hello world",
+        word_timings=[
+            {"word": f"w{i}", "start": i * 0.25, "end": i * 0.25 + 0.125} for i in range(words)
+        ],
+    )
+
+
+class TestSQLiteSessionBackend(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._tmp.name, "sessions.sqlite3")
+        self.clock = FakeClock(1000.0)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _backend(self, **kwargs) -> SQLiteSessionBackend:
+        return SQLiteSessionBackend(self.path, clock=self.clock, **kwargs)
+
+    def test_round_trip_and_shared_file(self):
+        store = SessionStore(self._backend())
+
+        async def scenario():
+            await store.save(_session("a", words=50))
+            await store.update_status("a", AnalysisStatus.ERROR, "boom")
+
+        asyncio.run(scenario())
+        other = self._backend()  # e.g. another worker process
+        session = other.get("a")
+        self.assertIsNotNone(session)
+        self.assertEqual(session.status, AnalysisStatus.ERROR)
+        self.assertEqual(session.error, "boom")
+        self.assertEqual(session.word_timings, _session("a", words=50).word_timings)
+        self.assertIsNone(other.get("missing"))
+
+    def test_field_updates_do_not_overwrite_each_other(self):
+        store = SessionStore(self._backend())
+
+        async def scenario():
+            await store.save(_session("a"))
+            # Transcription and analysis each hold their own copy of the session.
+            await asyncio.gather(
+                store.update_analysis_status("a", AnalysisStatus.PROCESSING),
+                store.update("a", transcript_text="done", status=AnalysisStatus.COMPLETE),
+            )
+            return await store.get("a")
+
+        session = asyncio.run(scenario())
+        self.assertEqual(session.analysis_status, AnalysisStatus.PROCESSING)
+        self.assertEqual(session.status, AnalysisStatus.COMPLETE)
+        self.assertEqual(session.transcript_text, "done")
+        self.assertIsNone(self._backend().update("missing", {"error": "x"}))
+
+    def test_restarted_store_rebuilds_search_index(self):
+        backend = self._backend(ttl_s=10)
+        for session_id in ("a", "b"):
+            backend.save(_session(session_id))
+        self.clock.now += 11  # "a" and "b" expire
+        backend.save(_session("c"))
+        backend.save(_session("d"))
+
+        restarted = SessionStore(self._backend(ttl_s=10))
+        self.assertEqual(asyncio.run(restarted.rebuild_index()), 2)
+        result = asyncio.run(restarted.search("hello world"))
+        self.assertEqual(sorted(s["session_id"] for s in result["sessions"]), ["c", "d"])
+        self.assertTrue(result["partial"])  # other workers write to the same file
+
+    def test_save_many_and_sweep(self):
+        backend = self._backend(max_entries=2, ttl_s=10)
+        backend.save_many([_session("a"), _session("b", words=20)])
+        self.assertEqual(backend.get("b").word_timings, _session("b", words=20).word_timings)
+        self.clock.now += 5
+        backend.save(_session("c"))
+        self.assertEqual(backend.sweep(), 1)  # over max_entries: oldest write goes
+        self.assertIsNotNone(backend.get("c"))
+        self.assertEqual(backend.stats()["entries"], 2)
+        self.clock.now += 6
+        self.assertEqual(backend.sweep(), 1)  # the remaining save_many row expired
+        self.assertEqual(backend.stats()["entries"], 1)
+        self.assertEqual(backend.stats()["evictions"], {"lru": 1, "ttl": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import asyncio
+import sys
+from pathlib import Path
+import unittest
+
+
+# Ensure `services.*` imports work when running from repo root.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from services.testing import FakeClock  # noqa: E402
+from services.token_pool import PooledToken, TokenPool  # noqa: E402
+
+
+class TestTokenPool(unittest.TestCase):
+    def _pool(self, clock: FakeClock, minted: list) -> TokenPool:
+        async def mint(key):
+            minted.append(key)
+            return PooledToken(
+                client_secret=f"secret-{len(minted)}",
+                expires_at=int(clock.now) + 60,
+                model="m",
+            )
+
+        return TokenPool(mint, ["a", "b"], size_per_key=2, min_ttl_s=20, clock=clock)
+
+    def test_refill_and_take(self):
+        clock = FakeClock(1000.0)
+        minted: list = []
+        pool = self._pool(clock, minted)
+        asyncio.run(pool.refill_once())
+        self.assertEqual(sorted(minted), ["a", "a", "b", "b"])
+
+        self.assertIsNotNone(pool.take("a"))
+        self.assertIsNone(pool.take("unknown"))
+        stats = pool.stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["pooled"], 3)
+
+        asyncio.run(pool.refill_once())
+        self.assertEqual(pool.stats()["pooled"], 4)
+
+    def test_tokens_near_expiry_are_discarded_as_waste(self):
+        clock = FakeClock(1000.0)
+        pool = self._pool(clock, [])
+        asyncio.run(pool.refill_once())
+        clock.now += 45
+        self.assertIsNone(pool.take("a"))
+        stats = pool.stats()
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["wasted"], 2)
+
+    def test_mint_failures_are_counted(self):
+        async def mint(key):
+            raise RuntimeError("upstream down")
+
+        pool = TokenPool(mint, ["a"], size_per_key=1)
+        asyncio.run(pool.refill_once())
+        self.assertEqual(pool.stats()["mint_failures"], 1)
+        self.assertEqual(pool.stats()["pooled"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
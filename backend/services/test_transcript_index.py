@@ -0,0 +1,105 @@
+import asyncio
+import sys
+from pathlib import Path
+import unittest
+
+
+# Ensure `services.*` imports work when running from repo root.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from models.session import Session, SessionMetadata, TranscriptSegment  # noqa: E402
+from services.session_store import MemorySessionBackend, SessionStore  # noqa: E402
+from services.transcript_index import TranscriptIndex  # noqa: E402
+
+
+def _session(session_id: str, text: str) -> Session:
+    return Session(
+        id=session_id,
+        metadata=SessionMetadata(sessionId=session_id, mode="coach"),
+        word_timings=[
+            {"word": word, "start": i * 0.5, "end": i * 0.5 + 0.4}
+            for i, word in enumerate(text.split())
+        ],
+    )
+
+
+def _ids(result: dict) -> list[str]:
+    return [s["session_id"] for s in result["sessions"]]
+
+
+class TestTranscriptIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = TranscriptIndex()
+        self.index.add(_session("a", "Well, no comment. I said NO COMMENT; our competitors lag."))
+        self.index.add(_session("b", "We beat the competition. Comment? No."))
+        self.index.add(_session("c", "nothing to see here"))
+
+    def test_phrase_hits_with_times(self):
+        result = self.index.search('"no comment"')
+        self.assertEqual(_ids(result), ["a"])
+        self.assertEqual(result["sessions"][0]["count"], 2)
+        first = result["sessions"][0]["hits"][0]
+        self.assertEqual(first, {"position": 1, "start_ms": 500, "end_ms": 1400})
+
+    def test_prefix_query(self):
+        result = self.index.search("compet*")
+        self.assertEqual(sorted(_ids(result)), ["a", "b"])
+        self.assertEqual(result["terms"], [["competition", "competitors"]])
+        self.assertEqual(self.index.search("the compet*")["sessions"][0]["session_id"], "b")
+
+    def test_reindex_on_change_and_skip_when_unchanged(self):
+        self.assertFalse(self.index.add(_session("c", "nothing to see here")))
+        self.assertTrue(self.index.add(_session("c", "still no comment from us")))
+        self.assertEqual(sorted(_ids(self.index.search("no comment"))), ["a", "c"])
+        self.assertEqual(_ids(self.index.search("see")), [])
+        self.index.remove("a")
+        self.assertEqual(self.index.search("compet*")["terms"], [["competition"]])
+
+    def test_evicted_terms_are_forgotten_and_ids_reused(self):
+        index = TranscriptIndex(max_sessions=2)
+        for i in range(50):
+            index.add(_session(f"s{i}", f"common unique{i} words{i}"))
+        self.assertEqual(len(index._term_ids), 5)  # "common" + two terms per kept session
+        self.assertLessEqual(len(index._terms), 7)
+        self.assertEqual(_ids(index.search("unique49 words49")), ["s49"])
+        self.assertEqual(_ids(index.search("unique47")), [])
+        self.assertEqual(sorted(_ids(index.search("common"))), ["s48", "s49"])
+        self.assertEqual(index.search("uniq*")["terms"], [["unique48", "unique49"]])
+
+    def test_live_segments_stand_in_for_word_timings(self):
+        session = Session(
+            id="live",
+            metadata=SessionMetadata(
+                sessionId="live",
+                mode="journalist",
+                transcript=[
+                    TranscriptSegment(speaker="ai", text="Any comment?", startTime=0, endTime=900),
+                    TranscriptSegment(
+                        speaker="user", text="No comment.", startTime=1000, endTime=2000
+                    ),
+                ],
+            ),
+        )
+        self.index.add(session)
+        hits = [s for s in self.index.search("no comment")["sessions"] if s["session_id"] == "live"]
+        self.assertEqual(hits[0]["hits"], [{"position": 0, "start_ms": 1000, "end_ms": 2000}])
+        self.assertEqual(_ids(self.index.search("any")), [])  # interviewer words are not indexed
+
+    def test_store_keeps_index_in_sync(self):
+        store = SessionStore(MemorySessionBackend(max_entries=1, max_bytes=0, ttl_s=0))
+
+        async def scenario():
+            await store.save(_session("a", "no comment"))
+            await store.save(_session("b", "no comment again"))  # evicts "a" from the backend
+            result = await store.search("no comment")
+            self.assertEqual(_ids(result), ["b"])
+            self.assertFalse(result["partial"])
+            self.assertEqual(len(store.transcript_index), 1)
+            await store.delete("b")
+            self.assertEqual((await store.search("no comment"))["total_sessions"], 0)
+
+        asyncio.run(scenario())
+
+
+if __name__ == "__main__":
+    unittest.main()
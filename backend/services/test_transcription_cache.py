@@ -0,0 +1,74 @@
+import asyncio
+import json
+import sys
+from pathlib import Path
+import unittest
+
+
+# Ensure `services.*` imports work when running from repo root.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import api.sessions as sessions  # noqa: E402
+from services import transcription  # noqa: E402
+from services.response_cache import MemoryResponseCache  # noqa: E402
+from services.testing import sessions_client  # noqa: E402
+from services.transcription import TranscriptionResult  # noqa: E402
+
+
+class TestTranscriptionCache(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+
+        async def fake_transcribe(audio):
+            self.calls.append(await audio.read_all())
+            return TranscriptionResult(
+                text="hello world",
+                words=[
+                    {"word": "hello", "start": 0.25, "end": 0.5},
+                    {"word": "world", "start": 0.625, "end": 1.0},
+                ],
+            )
+
+        self.cache = MemoryResponseCache("transcription", ttl_s=60)
+        self.client = sessions_client(
+            self, transcription_cache=self.cache, transcribe_audio=fake_transcribe
+        )
+
+    def _upload(self, session_id: str, audio: bytes):
+        metadata = {"sessionId": session_id, "mode": "coach", "transcript": []}
+        return self.client.post(
+            "/api/sessions",
+            files={"audio": ("take.webm", audio, "audio/webm")},
+            data={"metadata": json.dumps(metadata)},
+        )
+
+    def test_identical_audio_is_transcribed_once(self):
+        first = self._upload("s1", b"recording-1" * 100)
+        retry = self._upload("s2", b"recording-1" * 100)
+        other = self._upload("s3", b"recording-2" * 100)
+
+        self.assertEqual(len(self.calls), 2)
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(retry.status_code, 200)
+        self.assertEqual(retry.json()["status"], "complete")
+        self.assertEqual(retry.json()["word_timings"], first.json()["word_timings"])
+        self.assertEqual(retry.json()["transcript_text"], "hello world")
+        self.assertEqual(other.status_code, 200)
+        self.assertIsNotNone(asyncio.run(sessions.session_store.get("s2")))
+
+        stats = self.cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 2))
+        self.assertEqual(stats["hit_rate"], 0.333)
+
+    def test_key_depends_on_transcription_options(self):
+        key = transcription.transcription_cache_key("abc")
+        saved = transcription.CHUNKING_ENABLED
+        transcription.CHUNKING_ENABLED = not saved
+        try:
+            self.assertNotEqual(transcription.transcription_cache_key("abc"), key)
+        finally:
+            transcription.CHUNKING_ENABLED = saved
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,148 @@
+import asyncio
+import json
+import sys
+from pathlib import Path
+import unittest
+
+import httpx
+import numpy as np
+
+
+# Ensure `services.*` imports work when running from repo root.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import api.sessions as sessions  # noqa: E402
+from models.session import Session, SessionMetadata  # noqa: E402
+from services.audio_chunking import encode_wav  # noqa: E402
+from services.model_router import ModelRouter  # noqa: E402
+from services.testing import sessions_client  # noqa: E402
+from services.transcription import TranscriptionResult  # noqa: E402
+from services.transcription_engine import (  # noqa: E402
+    TranscriptionEngine,
+    TranscriptionModelStats,
+    TranscriptionUnavailable,
+    estimate_duration_s,
+)
+
+WORDS = [{"word": "hi", "start": 0.0, "end": 0.5}]
+
+
+def _engine(**kwargs) -> TranscriptionEngine:
+    return TranscriptionEngine(
+        router=ModelRouter(),
+        ladder=["whisper-1", "gpt-4o-mini-transcribe"],
+        word_models={"whisper-1"},
+        **kwargs,
+    )
+
+
+def _fake_upstream(behaviour: dict):
+    """send() that answers per model: a status code, an exception, or (delay, payload)."""
+    calls = []
+
+    async def send(model, fields, timeout_s):
+        calls.append((model, dict(fields), timeout_s))
+        action = behaviour[model]
+        if isinstance(action, Exception):
+            raise action
+        if isinstance(action, int):
+            return httpx.Response(action, text="upstream error")
+        delay, payload = action
+        await asyncio.sleep(delay)
+        return httpx.Response(200, json=payload)
+
+    return send, calls
+
+
+class TestTranscriptionEngine(unittest.TestCase):
+    def test_falls_back_on_5xx_and_timeout(self):
+        engine = _engine()
+        for failure in (503, httpx.ReadTimeout("slow")):
+            send, calls = _fake_upstream(
+                {"whisper-1": failure, "gpt-4o-mini-transcribe": (0, {"text": "hi"})}
+            )
+            data = asyncio.run(engine.transcribe(send, duration_s=10))
+            self.assertEqual(data["model"], "gpt-4o-mini-transcribe")
+            self.assertEqual([model for model, _, _ in calls], ["whisper-1", "gpt-4o-mini-transcribe"])
+            # Text-only models are not asked for verbose_json.
+            self.assertEqual(calls[1][1]["response_format"], "json")
+            self.assertEqual(calls[0][2], 25.0)  # 15 s base + 1 s per audio second
+
+        stats = engine.stats()["models"]
+        self.assertEqual(stats["whisper-1"]["errors"], 2)
+        self.assertEqual(stats["whisper-1"]["timeouts"], 1)
+        self.assertEqual(stats["gpt-4o-mini-transcribe"]["word_timings_rate"], 0.0)
+
+    def test_client_errors_do_not_fall_back(self):
+        send, calls = _fake_upstream({"whisper-1": 400, "gpt-4o-mini-transcribe": 200})
+        with self.assertRaisesRegex(Exception, "Transcription failed"):
+            asyncio.run(_engine().transcribe(send, duration_s=10))
+        self.assertEqual(len(calls), 1)
+
+        send, _ = _fake_upstream({"whisper-1": 502, "gpt-4o-mini-transcribe": 503})
+        with self.assertRaises(TranscriptionUnavailable):
+            asyncio.run(_engine().transcribe(send, duration_s=10))
+
+    def test_race_prefers_word_timings_over_first_text(self):
+        engine = _engine(race_max_s=30)
+        send, _ = _fake_upstream(
+            {
+                "whisper-1": (0.05, {"text": "hi", "words": WORDS}),
+                "gpt-4o-mini-transcribe": (0, {"text": "hi"}),
+            }
+        )
+        data = asyncio.run(engine.transcribe(send, duration_s=5))
+        self.assertEqual(data["model"], "whisper-1")
+        self.assertEqual(engine.stats()["models"]["whisper-1"]["race_wins"], 1)
+
+        send, _ = _fake_upstream(
+            {"whisper-1": 500, "gpt-4o-mini-transcribe": (0.01, {"text": "hi"})}
+        )
+        self.assertEqual(
+            asyncio.run(engine.transcribe(send, duration_s=5))["model"],
+            "gpt-4o-mini-transcribe",
+        )
+        # Long clips are never raced.
+        self.assertFalse(engine.should_race(60))
+
+    def test_duration_aware_order_against_latency_target(self):
+        engine = _engine(latency_target_ms=30_000)
+        # Nothing observed yet: keep the ladder order.
+        self.assertEqual(engine.candidates(600)[0], "whisper-1")
+
+        engine._stats["whisper-1"] = TranscriptionModelStats(ms_per_audio_s=500.0)
+        engine._stats["gpt-4o-mini-transcribe"] = TranscriptionModelStats(ms_per_audio_s=100.0)
+        self.assertEqual(engine.candidates(30)[0], "whisper-1")  # 15 s predicted
+        self.assertEqual(engine.candidates(120)[0], "gpt-4o-mini-transcribe")  # 60 s predicted
+
+    def test_estimate_duration(self):
+        wav = encode_wav(np.zeros(32000, dtype=np.int16), 16000)
+        self.assertAlmostEqual(estimate_duration_s(len(wav), wav[:44]), 2.0)
+        self.assertEqual(estimate_duration_s(40000, b"\x1aE\xdf\xa3"), 10.0)
+
+
+class TestTextOnlyFallbackTranscript(unittest.TestCase):
+    def test_word_timing_endpoints_distinguish_missing_timings(self):
+        async def text_only(audio):
+            return TranscriptionResult(text="hello there", words=[])
+
+        client = sessions_client(self, transcribe_audio=text_only)
+        metadata = {"sessionId": "s1", "mode": "coach", "transcript": []}
+        uploaded = client.post(
+            "/api/sessions",
+            files={"audio": ("take.webm", b"audio", "audio/webm")},
+            data={"metadata": json.dumps(metadata)},
+        )
+        self.assertEqual(uploaded.json()["status"], "complete")
+        delivery = client.get("/api/sessions/s1/delivery")
+        self.assertEqual(delivery.status_code, 422)
+        self.assertEqual(delivery.json()["detail"], "No word timings for this transcript")
+        self.assertEqual(client.post("/api/sessions/s1/phrases", json={}).status_code, 422)
+
+        pending = SessionMetadata(sessionId="s2", mode="coach", transcript=[])
+        asyncio.run(sessions.session_store.save(Session(id="s2", metadata=pending)))
+        self.assertEqual(client.get("/api/sessions/s2/delivery").status_code, 409)
+
+
+if __name__ == "__main__":
+    unittest.main()
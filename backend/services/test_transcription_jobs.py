@@ -0,0 +1,186 @@
+import asyncio
+import json
+import sys
+from pathlib import Path
+import unittest
+
+
+# Ensure `services.*` imports work when running from repo root.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import api.sessions as sessions  # noqa: E402
+from services.testing import sessions_client  # noqa: E402
+from services.transcription import TranscriptionResult  # noqa: E402
+from services.transcription_jobs import TranscriptionJob, TranscriptionJobQueue  # noqa: E402
+
+
+class _Spool:
+    def __init__(self):
+        self.closed = False
+
+    async def aclose(self):
+        self.closed = True
+
+
+class TestTranscriptionJobQueue(unittest.TestCase):
+    def test_bounded_concurrency_and_failures(self):
+        active = []
+        peak = []
+
+        async def run(job: TranscriptionJob):
+            active.append(job.session_id)
+            peak.append(len(active))
+            await asyncio.sleep(0.01)
+            active.remove(job.session_id)
+            if job.session_id == "bad":
+                raise RuntimeError("upstream 500")
+
+        async def scenario():
+            queue = TranscriptionJobQueue(run, workers=2, max_pending=10)
+            queue.start()
+            for session_id in ("a", "b", "c", "bad"):
+                self.assertTrue(queue.submit(TranscriptionJob(session_id, None)))
+            await queue._queue.join()
+            await queue.stop()
+            return queue.stats()
+
+        stats = asyncio.run(scenario())
+        self.assertEqual(max(peak), 2)
+        self.assertEqual(stats["completed"], 3)
+        self.assertEqual(stats["failed"], 1)
+        self.assertEqual(stats["pending"], 0)
+
+    def test_rejects_when_full_and_wakes_watchers(self):
+        async def scenario():
+            gate = asyncio.Event()
+
+            async def run(job: TranscriptionJob):
+                await gate.wait()
+
+            queue = TranscriptionJobQueue(run, workers=1, max_pending=1)
+            queue.start()
+            self.assertTrue(queue.submit(TranscriptionJob("a", None)))
+            await asyncio.sleep(0)  # worker picks up "a"
+            self.assertTrue(queue.submit(TranscriptionJob("b", None)))
+            self.assertFalse(queue.submit(TranscriptionJob("c", None)))
+
+            waiter = asyncio.create_task(queue.wait_for_change("a", timeout_s=5))
+            await asyncio.sleep(0)
+            gate.set()
+            await asyncio.wait_for(waiter, timeout=1)  # woken by the job finishing
+            await queue.stop()
+            return queue.stats()
+
+        stats = asyncio.run(scenario())
+        self.assertEqual(stats["rejected"], 1)
+        self.assertEqual(stats["submitted"], 2)
+
+    def test_stop_abandons_running_and_queued_jobs(self):
+        abandoned = []
+
+        async def run(job: TranscriptionJob):
+            await asyncio.Event().wait()
+
+        async def abandon(job: TranscriptionJob):
+            abandoned.append(job.session_id)
+
+        async def scenario():
+            queue = TranscriptionJobQueue(run, abandon=abandon, workers=1, max_pending=4)
+            queue.start()
+            jobs = [TranscriptionJob(session_id, _Spool()) for session_id in ("a", "b", "c")]
+            for job in jobs:
+                self.assertTrue(queue.submit(job))
+            await asyncio.sleep(0)  # worker picks up "a"
+            await queue.stop()
+            return jobs, queue.stats()
+
+        jobs, stats = asyncio.run(scenario())
+        self.assertEqual(sorted(abandoned), ["a", "b", "c"])
+        self.assertTrue(all(job.audio.closed for job in jobs))
+        self.assertEqual(stats["abandoned"], 3)
+        self.assertEqual(stats["pending"], 0)
+
+
+class TestAsyncUploadEndpoint(unittest.TestCase):
+    def setUp(self):
+        self.release = None
+
+        async def fake_transcribe(audio):
+            if self.release is not None:
+                await self.release.wait()
+            await asyncio.sleep(0.02)
+            return TranscriptionResult(
+                text="hello world",
+                words=[
+                    {"word": "hello", "start": 0.25, "end": 0.5},
+                    {"word": "world", "start": 0.625, "end": 1.0},
+                ],
+            )
+
+        self.jobs = TranscriptionJobQueue(
+            sessions._run_transcription_job,
+            abandon=sessions._abandon_transcription_job,
+            workers=1,
+            max_pending=4,
+        )
+        self.client = sessions_client(
+            self, transcribe_audio=fake_transcribe, transcription_jobs=self.jobs
+        )
+
+    def _upload(self, session_id: str):
+        metadata = {"sessionId": session_id, "mode": "coach", "transcript": []}
+        return self.client.post(
+            "/api/sessions?async=true",
+            files={"audio": ("take.webm", b"recording" * 100, "audio/webm")},
+            data={"metadata": json.dumps(metadata)},
+        )
+
+    def _events(self, session_id: str) -> list[tuple[str, dict]]:
+        events = []
+        with self.client.stream("GET", f"/api/sessions/{session_id}/events") as response:
+            self.assertEqual(response.headers["content-type"], "text/event-stream; charset=utf-8")
+            for block in response.iter_text():
+                for message in block.split("\n\n"):
+                    lines = dict(
+                        line.split(": ", 1) for line in message.splitlines() if ": " in line
+                    )
+                    if "event" in lines:
+                        events.append((lines["event"], json.loads(lines["data"])))
+        return events
+
+    def test_202_then_status_events_until_complete(self):
+        with self.client:
+            self.client.portal.call(self.jobs.start)
+            accepted = self._upload("s1")
+            events = self._events("s1")
+            self.client.portal.call(self.jobs.stop)
+
+        self.assertEqual(accepted.status_code, 202)
+        self.assertEqual(accepted.json()["status"], "pending")
+        self.assertEqual(accepted.headers["location"], "/api/sessions/s1/transcript")
+        statuses = [data["status"] for _, data in events]
+        self.assertEqual({name for name, _ in events}, {"status"})
+        self.assertEqual(statuses[-1], "complete")
+        order = ["pending", "processing", "complete"]
+        self.assertEqual(statuses, sorted(statuses, key=order.index))
+        transcript = self.client.get("/api/sessions/s1/transcript").json()
+        self.assertEqual(transcript["transcript_text"], "hello world")
+
+    def test_shutdown_marks_unfinished_sessions_as_errors(self):
+        with self.client:
+            self.release = self.client.portal.call(asyncio.Event)
+            self.client.portal.call(self.jobs.start)
+            self.assertEqual(self._upload("s1").status_code, 202)
+            self.assertEqual(self._upload("s2").status_code, 202)
+            self.client.portal.call(self.jobs.stop)
+            events = self._events("s2")
+
+        self.assertEqual(events[-1][1]["status"], "error")
+        for session_id in ("s1", "s2"):
+            stored = asyncio.run(sessions.session_store.get(session_id))
+            self.assertEqual(stored.status.value, "error")
+            self.assertIn("upload the recording again", stored.error)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import sys
+from pathlib import Path
+import unittest
+
+import numpy as np
+
+
+# Ensure `services.*` imports work when running from repo root.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from services.transcription import segment_qa_turns  # noqa: E402
+from services.turn_alignment import align_words, merge_turns  # noqa: E402
+
+
+def _conversation(skew_s: float):
+    """
+    Alternating 4 s questions and 10 s answers. The recording is the mic, so
+    only answers have words; the transcript clock lags the audio by skew_s.
+    """
+    words, segments, t = [], [], 0.0
+    for turn in range(6):
+        speaker, length = ("ai", 4.0) if turn % 2 == 0 else ("user", 10.0)
+        segments.append(
+            {
+                "speaker": speaker,
+                "text": f"turn {turn}",
+                "startTime": (t - skew_s) * 1000,
+                "endTime": (t + length - skew_s) * 1000,
+            }
+        )
+        if speaker == "user":
+            for k in range(24):
+                start = t + 0.25 + k * 0.4
+                words.append({"word": f"t{turn}", "start": start, "end": start + 0.3})
+        t += length + 0.6
+    return words, segments
+
+
+class TestTurnAlignment(unittest.TestCase):
+    def test_recovers_clock_skew_and_assigns_words(self):
+        words, segments = _conversation(skew_s=1.3)
+        starts = np.array([w["start"] for w in words])
+        ends = np.array([w["end"] for w in words])
+        alignment = align_words(starts, ends, segments)
+
+        self.assertAlmostEqual(alignment.skew_s, 1.3, delta=0.051)
+        labels = [words[i]["word"] for i in range(len(words))]
+        for turn, (lo, hi) in enumerate(alignment.word_ranges.tolist()):
+            expected = {f"t{turn}"} if turn % 2 else set()
+            self.assertEqual(set(labels[lo:hi]), expected)
+        self.assertEqual(int(alignment.word_ranges[-1][1]), len(words))
+
+    def test_aligned_sessions_keep_zero_skew_and_gap_words_go_to_nearest_turn(self):
+        segments = [
+            {"speaker": "ai", "text": "q", "startTime": 0, "endTime": 2000},
+            {"speaker": "user", "text": "a", "startTime": 5000, "endTime": 8000},
+        ]
+        starts = np.array([0.5, 2.2, 4.5, 6.0])  # 2.2 s is nearer the question, 4.5 s the answer
+        alignment = align_words(starts, starts + 0.2, segments, max_skew_s=0.1)
+        self.assertEqual(alignment.skew_s, 0.0)
+        self.assertEqual(alignment.turn_of_word.tolist(), [0, 0, 1, 1])
+
+    def test_segment_qa_turns_merges_speakers_and_attaches_words(self):
+        segments = [
+            {"speaker": "ai", "text": "Why?", "startTime": 0, "endTime": 1000},
+            {"speaker": "user", "text": "Because", "startTime": 1200, "endTime": 2000},
+            {"speaker": "user", "text": "it works.", "startTime": 2000, "endTime": 3000},
+        ]
+        words = [
+            {"word": "works.", "start": 2.5, "end": 2.9},
+            {"word": "Because", "start": 1.3, "end": 1.8},
+            {"word": "it", "start": 2.1, "end": 2.3},
+        ]
+        turns = segment_qa_turns(words, segments)
+        self.assertEqual([t["speaker"] for t in turns], ["ai", "user"])
+        self.assertEqual(turns[1]["text"], "Because it works.")
+        self.assertEqual(turns[1]["end_time"], 3.0)
+        self.assertEqual([w["word"] for w in turns[1]["words"]], ["Because", "it", "works."])
+        self.assertEqual(turns[0]["words"], [])
+        self.assertEqual(len(merge_turns([])), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import sys
+from pathlib import Path
+import unittest
+
+
+# Ensure `services.*` imports work when running from repo root.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from models.session import Session, SessionMetadata  # noqa: E402
+from models.word_timings import WordColumns  # noqa: E402
+from services.word_timings import decode_word_timings, encode_word_timings  # noqa: E402
+
+WORDS = [
+    {"word": " Hello,", "start": 0.0, "end": 0.42},
+    {"word": "wörld", "start": 1234.567, "end": 1235.001},
+    {"word": " Hello,", "start": 1236.0, "end": 1236.5},
+]
+
+
+class TestWordColumns(unittest.TestCase):
+    def test_round_trips_through_dicts_and_blob(self):
+        columns = WordColumns.from_dicts(WORDS)
+        self.assertEqual(columns.to_dicts(), WORDS)
+        self.assertIs(columns.words[0], columns.words[2])  # interned
+        self.assertEqual(decode_word_timings(encode_word_timings(columns)), columns)
+        empty = WordColumns.from_dicts([])
+        self.assertEqual(decode_word_timings(encode_word_timings(empty)).to_dicts(), [])
+
+    def test_session_keeps_columns_and_serializes_dicts(self):
+        session = Session(
+            id="s1",
+            metadata=SessionMetadata(sessionId="s1", mode="coach", transcript=[]),
+            word_timings=WORDS,
+        )
+        self.assertIsInstance(session.word_timings, WordColumns)
+        session.word_timings = WORDS[:1]
+        self.assertIsInstance(session.word_timings, WordColumns)
+        self.assertEqual(session.model_dump()["word_timings"], WORDS[:1])
+        restored = Session.model_validate_json(session.model_dump_json())
+        self.assertEqual(restored.word_timings, session.word_timings)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+"""Shared helpers for the backend unit tests."""
+
+import unittest
+from types import ModuleType
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import api.sessions as sessions
+from services import transcription
+from services.response_cache import MemoryResponseCache
+from services.session_store import MemorySessionBackend, SessionStore
+
+
+class FakeClock:
+    """Manually advanced stand-in for `time.monotonic` / `time.time`."""
+
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def patch_globals(test: unittest.TestCase, module: ModuleType, **values) -> None:
+    """Swap module globals for the duration of `test`; cleanups restore them."""
+    for name, value in values.items():
+        test.addCleanup(setattr, module, name, getattr(module, name))
+        setattr(module, name, value)
+
+
+def sessions_client(
+    test: unittest.TestCase,
+    *,
+    transcription_cache: MemoryResponseCache | None = None,
+    **overrides,
+) -> TestClient:
+    """
+    Mount `api.sessions.router` on a fresh app for `test`, with an in-memory
+    session store, the transcription cache off (unless one is given) and any
+    other `api.sessions` globals passed as keyword arguments.
+    """
+    overrides.setdefault("session_store", SessionStore(MemorySessionBackend()))
+    patch_globals(
+        test,
+        transcription,
+        transcription_cache=transcription_cache
+        or MemoryResponseCache("transcription", ttl_s=0),
+    )
+    patch_globals(test, sessions, **overrides)
+
+    app = FastAPI()
+    app.include_router(sessions.router, prefix="/api/sessions")
+    return TestClient(app)
@@ -0,0 +1,124 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Hashable
+
+logger = logging.getLogger("kawkai")
+
+
+@dataclass
+class PooledToken:
+    client_secret: str
+    expires_at: int  # unix seconds, as returned by OpenAI
+    model: str
+
+
+class TokenPool:
+    """
+    Keeps a few pre-minted ephemeral realtime tokens per configuration key.
+    Tokens are discarded once they have less than `min_ttl_s` left (counted as
+    waste) and a background task refills each key back to `size_per_key`.
+    """
+
+    def __init__(
+        self,
+        mint: Callable[[Hashable], Awaitable[PooledToken]],
+        keys: list[Hashable],
+        *,
+        size_per_key: int = 1,
+        min_ttl_s: float = 20.0,
+        refill_interval_s: float = 5.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        self._mint = mint
+        self._keys = list(keys)
+        self.size_per_key = max(0, size_per_key)
+        self.min_ttl_s = min_ttl_s
+        self.refill_interval_s = refill_interval_s
+        self._clock = clock
+        self._tokens: dict[Hashable, list[PooledToken]] = {key: [] for key in self._keys}
+        self._refill_needed = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._stats = {"hits": 0, "misses": 0, "minted": 0, "wasted": 0, "mint_failures": 0}
+
+    def matches(self, key: Hashable) -> bool:
+        return key in self._tokens
+
+    def take(self, key: Hashable) -> PooledToken | None:
+        tokens = self._tokens.get(key)
+        if tokens is None:
+            return None
+        self._prune(key)
+        if not tokens:
+            self._stats["misses"] += 1
+            self._refill_needed.set()
+            return None
+        self._stats["hits"] += 1
+        self._refill_needed.set()
+        # Serve the freshest token; older ones are closer to expiry either way.
+        return tokens.pop()
+
+    def _prune(self, key: Hashable) -> None:
+        tokens = self._tokens[key]
+        deadline = self._clock() + self.min_ttl_s
+        fresh = [token for token in tokens if token.expires_at > deadline]
+        self._stats["wasted"] += len(tokens) - len(fresh)
+        tokens[:] = fresh
+
+    async def _mint_one(self, key: Hashable) -> None:
+        try:
+            token = await self._mint(key)
+        except Exception as exc:
+            self._stats["mint_failures"] += 1
+            logger.warning("Token pool mint failed for %r: %s", key, exc)
+            return
+        self._stats["minted"] += 1
+        self._tokens[key].append(token)
+        self._tokens[key].sort(key=lambda t: t.expires_at)
+
+    async def refill_once(self) -> None:
+        jobs = []
+        for key in self._keys:
+            self._prune(key)
+            deficit = self.size_per_key - len(self._tokens[key])
+            jobs.extend(self._mint_one(key) for _ in range(deficit))
+        if jobs:
+            await asyncio.gather(*jobs)
+
+    async def _run(self) -> None:
+        while True:
+            self._refill_needed.clear()
+            await self.refill_once()
+            try:
+                await asyncio.wait_for(
+                    self._refill_needed.wait(), timeout=self.refill_interval_s
+                )
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self) -> None:
+        if self._task is None and self._keys and self.size_per_key > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def stats(self) -> dict:
+        served = self._stats["hits"] + self._stats["misses"]
+        minted = self._stats["minted"]
+        return {
+            **self._stats,
+            "running": self._task is not None,
+            "configurations": len(self._keys),
+            "pooled": sum(len(tokens) for tokens in self._tokens.values()),
+            "hit_rate": round(self._stats["hits"] / served, 3) if served else None,
+            "waste_rate": round(self._stats["wasted"] / minted, 3) if minted else None,
+        }
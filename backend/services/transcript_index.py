@@ -0,0 +1,283 @@
+import os
+import time
+from array import array
+from bisect import bisect_left, insort
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from models.session import Session
+from services.phrase_matcher import normalize_token
+
+# Sessions kept in the index; the least recently (re)indexed are dropped past this.
+TRANSCRIPT_INDEX_MAX_SESSIONS = int(os.getenv("KAWKAI_TRANSCRIPT_INDEX_MAX_SESSIONS", "5000"))
+# Vocabulary terms a `prefix*` query may expand to.
+MAX_PREFIX_TERMS = 256
+
+
+@dataclass
+class _Doc:
+    """
+    One session's positional postings in CSR form: the sorted ids of its
+    distinct terms, `offsets` into `positions` (word positions grouped by
+    term, ascending within each), and the words' start/end times when known.
+    """
+
+    session_id: str
+    fingerprint: tuple
+    term_ids: np.ndarray
+    offsets: np.ndarray
+    positions: np.ndarray
+    start_ms: Optional[np.ndarray]
+    end_ms: Optional[np.ndarray]
+
+    def _present(self, term_ids: np.ndarray) -> np.ndarray:
+        if not len(self.term_ids):
+            return term_ids[:0]
+        i = np.minimum(np.searchsorted(self.term_ids, term_ids), len(self.term_ids) - 1)
+        return i[self.term_ids[i] == term_ids]
+
+    def count_of(self, term_ids: np.ndarray) -> int:
+        found = self._present(term_ids)
+        return int((self.offsets[found + 1] - self.offsets[found]).sum())
+
+    def positions_of(self, term_ids: np.ndarray) -> np.ndarray:
+        """Ascending positions of any of `term_ids` (several for a prefix)."""
+        found = self._present(term_ids).tolist()
+        if len(found) == 1:
+            return self.positions[self.offsets[found[0]] : self.offsets[found[0] + 1]]
+        slices = [self.positions[self.offsets[i] : self.offsets[i + 1]] for i in found]
+        return np.sort(np.concatenate(slices)) if slices else self.positions[:0]
+
+
+def _fingerprint(session: Session) -> tuple:
+    columns = session.word_timings
+    if columns:
+        return ("words", len(columns), columns.start_ms[0], columns.end_ms[-1], columns.words[-1])
+    segments = [s for s in session.metadata.transcript if s.speaker == "user"]
+    if segments:
+        return ("segments", len(segments), segments[-1].endTime, segments[-1].text)
+    return ("text", hash(session.transcript_text or ""))
+
+
+def _session_words(
+    session: Session,
+) -> tuple[list[str], Optional[np.ndarray], Optional[np.ndarray]]:
+    """
+    The spokesperson's words with their times in ms. Word timings come from
+    the mic recording; until transcription finishes, the live user segments
+    stand in (each word gets its segment's times); a plain transcript text
+    has no times.
+    """
+    columns = session.word_timings
+    if columns:
+        return (
+            columns.words,
+            np.frombuffer(columns.start_ms, dtype=np.int32),
+            np.frombuffer(columns.end_ms, dtype=np.int32),
+        )
+    segments = [s for s in session.metadata.transcript if s.speaker == "user"]
+    if segments:
+        words: list[str] = []
+        starts: list[float] = []
+        ends: list[float] = []
+        for segment in segments:
+            tokens = segment.text.split()
+            words.extend(tokens)
+            starts.extend([segment.startTime] * len(tokens))
+            ends.extend([segment.endTime] * len(tokens))
+        return words, np.array(starts, dtype=np.int32), np.array(ends, dtype=np.int32)
+    return (session.transcript_text or "").split(), None, None
+
+
+class TranscriptIndex:
+    """
+    Inverted index over stored sessions' transcripts for phrase and prefix
+    search. Each term maps to the sorted ids of the sessions containing it;
+    each session keeps its own positional postings, so a phrase query
+    intersects session lists first and checks positions only in sessions
+    that contain every term. `add` runs on every `SessionStore.save` and is
+    O(1) when the transcript did not change; a changed session is
+    re-indexed in O(words). Per process, like the memory session backend.
+    A term is forgotten, and its id reused, once no indexed session contains
+    it, so `max_sessions` bounds the vocabulary as well as the postings.
+    """
+
+    def __init__(self, max_sessions: int = TRANSCRIPT_INDEX_MAX_SESSIONS):
+        self.max_sessions = max_sessions
+        self._term_ids: dict[str, int] = {}
+        self._terms: list[str] = []
+        self._free_term_ids: list[int] = []  # ids of terms no session contains any more
+        self._postings: dict[str, array] = {}  # term -> ascending doc ids
+        self._vocab: list[str] = []  # sorted terms with postings, for prefix queries
+        self._docs: dict[int, _Doc] = {}  # insertion order is doc id order
+        self._doc_ids: dict[str, int] = {}
+        self._next_doc_id = 0
+        self._stats = {"indexed": 0, "unchanged": 0, "removed": 0, "evicted": 0, "queries": 0}
+
+    def __len__(self) -> int:
+        return len(self._doc_ids)
+
+    def add(self, session: Session) -> bool:
+        """Index (or re-index) a session; returns False when it was already up to date."""
+        fingerprint = _fingerprint(session)
+        doc_id = self._doc_ids.get(session.id)
+        if doc_id is not None and self._docs[doc_id].fingerprint == fingerprint:
+            self._stats["unchanged"] += 1
+            return False
+        if doc_id is not None:
+            self._remove_doc(doc_id)
+
+        words, start_ms, end_ms = _session_words(session)
+        word_ids = {}  # each distinct spelling is normalized once
+        for word in dict.fromkeys(words):
+            token = normalize_token(word)
+            word_ids[word] = self._term_id(token) if token else -1
+        ids = np.fromiter(map(word_ids.__getitem__, words), dtype=np.int32, count=len(words))
+        order = np.argsort(ids, kind="stable").astype(np.int32)
+        order = order[ids[order] >= 0]  # drop punctuation-only words, keep their positions
+        term_ids, first = np.unique(ids[order], return_index=True)
+        doc_id = self._next_doc_id
+        self._next_doc_id += 1
+        self._docs[doc_id] = _Doc(
+            session_id=session.id,
+            fingerprint=fingerprint,
+            term_ids=term_ids.astype(np.int32),
+            offsets=np.append(first, len(order)).astype(np.int32),
+            positions=order,
+            start_ms=start_ms,
+            end_ms=end_ms,
+        )
+        self._doc_ids[session.id] = doc_id
+        for term_id in term_ids.tolist():
+            term = self._terms[term_id]
+            docs = self._postings.get(term)
+            if docs is None:
+                docs = self._postings[term] = array("i")
+                insort(self._vocab, term)
+            docs.append(doc_id)  # doc ids only grow, so lists stay sorted
+        self._stats["indexed"] += 1
+
+        while self.max_sessions > 0 and len(self._doc_ids) > self.max_sessions:
+            self._remove_doc(next(iter(self._docs)))
+            self._stats["evicted"] += 1
+        return True
+
+    def remove(self, session_id: str) -> None:
+        doc_id = self._doc_ids.get(session_id)
+        if doc_id is not None:
+            self._remove_doc(doc_id)
+            self._stats["removed"] += 1
+
+    def _term_id(self, term: str) -> int:
+        term_id = self._term_ids.get(term)
+        if term_id is None:
+            if self._free_term_ids:
+                term_id = self._free_term_ids.pop()
+                self._terms[term_id] = term
+            else:
+                term_id = len(self._terms)
+                self._terms.append(term)
+            self._term_ids[term] = term_id
+        return term_id
+
+    def _remove_doc(self, doc_id: int) -> None:
+        doc = self._docs.pop(doc_id)
+        del self._doc_ids[doc.session_id]
+        for term_id in doc.term_ids.tolist():
+            term = self._terms[term_id]
+            docs = self._postings[term]
+            del docs[bisect_left(docs, doc_id)]
+            if not docs:
+                del self._postings[term]
+                del self._vocab[bisect_left(self._vocab, term)]
+                del self._term_ids[term]
+                self._terms[term_id] = ""
+                self._free_term_ids.append(term_id)
+
+    def _expand(self, token: str) -> list[str]:
+        """Terms one query token stands for: itself, or every term it prefixes if it ends in *."""
+        if token.endswith("*"):
+            prefix = normalize_token(token[:-1])
+            if not prefix:
+                return []
+            lo = bisect_left(self._vocab, prefix)
+            hi = bisect_left(self._vocab, prefix + "\U0010ffff", lo)
+            return self._vocab[lo : min(hi, lo + MAX_PREFIX_TERMS)]
+        term = normalize_token(token)
+        return [term] if term in self._postings else []
+
+    def _docs_with(self, terms: list[str]) -> np.ndarray:
+        docs = [np.frombuffer(self._postings[term], dtype=np.int32) for term in terms]
+        return docs[0] if len(docs) == 1 else np.unique(np.concatenate(docs))
+
+    def search(self, query: str, *, limit: int = 50, max_hits: int = 20) -> dict:
+        """
+        Sessions containing `query` as a phrase, most hits first. A token
+        ending in `*` matches any word it prefixes (`compet*`); quotes are
+        optional. Each session returns up to `max_hits` hits with word
+        positions and, when the session has word timings, times in ms.
+        """
+        started = time.perf_counter()
+        self._stats["queries"] += 1
+        tokens = [t for t in query.replace('"', " ").split() if normalize_token(t.rstrip("*"))]
+        slots = [self._expand(token) for token in tokens]
+        result: dict = {"query": query, "terms": slots, "total_sessions": 0, "sessions": []}
+        if not slots or not all(slots):
+            result["took_ms"] = round((time.perf_counter() - started) * 1000, 3)
+            return result
+
+        # Sessions containing some term of every slot, rarest slot first.
+        slot_docs = [self._docs_with(terms) for terms in slots]
+        candidates = slot_docs[int(np.argmin([len(d) for d in slot_docs]))]
+        for docs in slot_docs:
+            candidates = np.intersect1d(candidates, docs, assume_unique=True)
+            if not len(candidates):
+                break
+
+        slot_term_ids = [
+            np.array([self._term_ids[t] for t in terms], dtype=np.int32) for terms in slots
+        ]
+        matches = []  # (count, doc, phrase start positions if already known)
+        for doc_id in candidates.tolist():
+            doc = self._docs[doc_id]
+            if len(slots) == 1:
+                # Single word or prefix: every occurrence is a hit, so counting
+                # is enough here; positions are read for returned sessions only.
+                matches.append((doc.count_of(slot_term_ids[0]), doc, None))
+                continue
+            starts = doc.positions_of(slot_term_ids[0])
+            for k, term_ids in enumerate(slot_term_ids[1:], start=1):
+                starts = np.intersect1d(starts, doc.positions_of(term_ids) - k, assume_unique=True)
+                if not len(starts):
+                    break
+            if len(starts):
+                matches.append((len(starts), doc, starts))
+
+        matches.sort(key=lambda match: -match[0])
+        length = len(slots)
+        for count, doc, starts in matches[:limit]:
+            if starts is None:
+                starts = doc.positions_of(slot_term_ids[0])
+            hits = []
+            for position in starts[:max_hits].tolist():
+                hit = {"position": position}
+                if doc.start_ms is not None:
+                    hit["start_ms"] = int(doc.start_ms[position])
+                    hit["end_ms"] = int(doc.end_ms[position + length - 1])
+                hits.append(hit)
+            result["sessions"].append(
+                {"session_id": doc.session_id, "count": count, "hits": hits}
+            )
+        result["total_sessions"] = len(matches)
+        result["took_ms"] = round((time.perf_counter() - started) * 1000, 3)
+        return result
+
+    def stats(self) -> dict:
+        return {
+            **self._stats,
+            "sessions": len(self._doc_ids),
+            "terms": len(self._postings),
+            "max_sessions": self.max_sessions,
+        }
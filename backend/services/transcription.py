@@ -1,9 +1,47 @@
+import asyncio
+import logging
 import os
+import secrets
 import httpx
+import numpy as np
 from dataclasses import dataclass
+from typing import AsyncIterator
 import mimetypes
 
+from services.audio_chunking import (
+    AudioChunk,
+    can_decode,
+    chunk_wav,
+    decode_pcm,
+    find_split_points,
+    owns,
+    plan_chunks,
+    stitch_words,
+)
+from services import audio_processing
+from services.audio_spool import AudioSpool
+from services.response_cache import cache_key, transcription_cache
+from services.transcription_engine import estimate_duration_s, transcription_engine
+from services.turn_alignment import align_words
+
+logger = logging.getLogger("kawkai")
+
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+TRANSCRIPTION_URL = os.getenv(
+    "OPENAI_TRANSCRIPTION_URL", "https://api.openai.com/v1/audio/transcriptions"
+)
+# Recordings longer than CHUNK_MIN_S are split at pauses into ~CHUNK_TARGET_S
+# pieces, transcribed CHUNK_CONCURRENCY at a time and stitched back together.
+CHUNKING_ENABLED = os.getenv("KAWKAI_TRANSCRIPTION_CHUNKING", "true").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+CHUNK_MIN_S = float(os.getenv("KAWKAI_TRANSCRIPTION_CHUNK_MIN_S", "240"))
+CHUNK_TARGET_S = float(os.getenv("KAWKAI_TRANSCRIPTION_CHUNK_S", "120"))
+CHUNK_SEARCH_WINDOW_S = 20.0
+CHUNK_OVERLAP_S = float(os.getenv("KAWKAI_TRANSCRIPTION_CHUNK_OVERLAP_S", "1.0"))
+CHUNK_CONCURRENCY = int(os.getenv("KAWKAI_TRANSCRIPTION_CONCURRENCY", "4"))
 
 
 @dataclass
@@ -12,6 +50,43 @@ class TranscriptionResult:
     words: list[dict]  # [{word, start, end}, ...]
 
 
+def transcription_cache_key(audio_sha256: str) -> str:
+    """Content hash plus every option that changes the transcript."""
+    options = [",".join(transcription_engine.ladder), "verbose_json", "word"]
+    if CHUNKING_ENABLED:
+        options.append(f"chunked:{CHUNK_MIN_S}:{CHUNK_TARGET_S}:{CHUNK_OVERLAP_S}")
+    if audio_processing.NORMALIZE_ENABLED:
+        options.append(f"normalized:{audio_processing.MAX_SILENCE_S}")
+    return cache_key(audio_sha256, *options)
+
+
+async def cached_transcription(audio: AudioSpool) -> TranscriptionResult | None:
+    """Earlier result for byte-identical audio, if one is cached."""
+    if audio.sha256 is None:
+        return None
+    cached = await transcription_cache.get(transcription_cache_key(audio.sha256))
+    if cached is None:
+        return None
+    return TranscriptionResult(
+        text=cached["text"],
+        words=[{"word": w, "start": start, "end": end} for w, start, end in cached["words"]],
+    )
+
+
+async def cache_transcription(audio: AudioSpool, result: TranscriptionResult) -> None:
+    if audio.sha256 is None or (result.text.strip() and not result.words):
+        # Text without word timings came from a fallback model; don't pin it.
+        return
+    await transcription_cache.set(
+        transcription_cache_key(audio.sha256),
+        {
+            "text": result.text,
+            # Rows instead of dicts keep cached transcripts about half the size.
+            "words": [[w["word"], w["start"], w["end"]] for w in result.words],
+        },
+    )
+
+
 def _normalize_mime_type(mime_type: str | None) -> str | None:
     if not mime_type:
         return None
@@ -24,49 +99,219 @@ def _guess_mime_type(audio_path: str) -> str | None:
     return _normalize_mime_type(guessed)
 
 
+def _multipart_body(
+    audio: AudioSpool, fields: list[tuple[str, str]], filename: str, content_type: str
+) -> tuple[dict[str, str], AsyncIterator[bytes]]:
+    """
+    Stream a multipart/form-data body straight from the spool (one read pass)
+    with an exact Content-Length, so nothing is buffered or re-read.
+    """
+    boundary = secrets.token_hex(16)
+    head = b"".join(
+        (
+            f"--{boundary}\r\n"
+            f'Content-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'
+        ).encode()
+        for name, value in fields
+    )
+    quoted_name = filename.replace('"', "%22")
+    head += (
+        f"--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="file"; filename="{quoted_name}"\r\n'
+        f"Content-Type: {content_type}\r\n\r\n"
+    ).encode()
+    tail = f"\r\n--{boundary}--\r\n".encode()
+
+    async def body() -> AsyncIterator[bytes]:
+        yield head
+        async for chunk in audio.iter_bytes():
+            yield chunk
+        yield tail
+
+    headers = {
+        "Content-Type": f"multipart/form-data; boundary={boundary}",
+        "Content-Length": str(len(head) + audio.size + len(tail)),
+    }
+    return headers, body()
+
+
 async def transcribe_audio(
-    audio_path: str,
+    audio: AudioSpool | str,
     *,
     mime_type: str | None = None,
     filename: str | None = None,
 ) -> TranscriptionResult:
     """
-    Transcribe audio file using OpenAI Whisper API.
-    Returns text and word-level timestamps.
+    Transcribe audio through the transcription model ladder (whisper-1 first).
+    Accepts a spooled upload or a file path; returns text and word-level timestamps.
+    With KAWKAI_AUDIO_NORMALIZE the audio is first downmixed, resampled and
+    silence-trimmed; word timestamps are mapped back to the original audio.
     """
     if not OPENAI_API_KEY:
         raise ValueError("OPENAI_API_KEY environment variable is not set")
 
-    normalized_mime_type = _normalize_mime_type(mime_type) or _guess_mime_type(audio_path)
+    if isinstance(audio, str):
+        spool = await AudioSpool.from_path(audio)
+        try:
+            return await transcribe_audio(spool, mime_type=mime_type, filename=filename)
+        finally:
+            await spool.aclose()
+
+    upload_name = filename or audio.filename or "session.webm"
+    normalized_mime_type = (
+        _normalize_mime_type(mime_type)
+        or _normalize_mime_type(audio.content_type)
+        or _guess_mime_type(upload_name)
+    )
     content_type = normalized_mime_type or "application/octet-stream"
-    upload_name = filename or os.path.basename(audio_path)
+
+    normalized = None
+    if audio_processing.NORMALIZE_ENABLED:
+        normalized = await audio_processing.normalize_audio(audio)
 
     async with httpx.AsyncClient(timeout=120.0) as client:
-        with open(audio_path, "rb") as f:
-            response = await client.post(
-                "https://api.openai.com/v1/audio/transcriptions",
-                headers={"Authorization": f"Bearer {OPENAI_API_KEY}"},
-                files={"file": (upload_name, f, content_type)},
-                data={
-                    "model": "whisper-1",
-                    "response_format": "verbose_json",
-                    "timestamp_granularities[]": "word",
-                },
+        if normalized is None:
+            return await _transcribe_spool(client, audio, upload_name, content_type)
+        try:
+            result = await _transcribe_spool(
+                client,
+                normalized.audio,
+                normalized.audio.filename,
+                normalized.audio.content_type,
+            )
+        finally:
+            await normalized.audio.aclose()
+    return TranscriptionResult(
+        text=result.text, words=normalized.offsets.restore_words(result.words)
+    )
+
+
+async def _transcribe_spool(
+    client: httpx.AsyncClient, audio: AudioSpool, filename: str, content_type: str
+) -> TranscriptionResult:
+    if CHUNKING_ENABLED:
+        result = await _transcribe_chunked(client, audio)
+        if result is not None:
+            return result
+    data = await _post_transcription(
+        client, audio, filename, content_type, granularities=("word",)
+    )
+    return TranscriptionResult(text=data["text"], words=_parse_words(data))
+
+
+def _parse_words(data: dict) -> list[dict]:
+    return [
+        {"word": w["word"], "start": w["start"], "end": w["end"]}
+        for w in data.get("words") or []
+    ]
+
+
+async def _post_transcription(
+    client: httpx.AsyncClient,
+    audio: AudioSpool,
+    filename: str,
+    content_type: str,
+    *,
+    granularities: tuple[str, ...],
+    duration_s: float | None = None,
+) -> dict:
+    """POST the audio through the transcription model ladder."""
+    if duration_s is None:
+        duration_s = estimate_duration_s(audio.size, await audio.read_head(44))
+    # Raced attempts stream the body concurrently, so each gets its own copy.
+    shared = await audio.read_all() if transcription_engine.should_race(duration_s) else None
+
+    async def send(model: str, fields: list[tuple[str, str]], timeout_s: float) -> httpx.Response:
+        source = audio
+        if shared is not None:
+            source = AudioSpool(filename=audio.filename, memory_limit=len(shared))
+            await source.write(shared)
+        try:
+            headers, body = _multipart_body(source, fields, filename, content_type)
+            return await client.post(
+                TRANSCRIPTION_URL,
+                headers={"Authorization": f"Bearer {OPENAI_API_KEY}", **headers},
+                content=body,
+                timeout=timeout_s,
             )
+        finally:
+            if source is not audio:
+                await source.aclose()
 
-    if response.status_code != 200:
-        raise Exception(f"Transcription failed: {response.text}")
+    return await transcription_engine.transcribe(
+        send, duration_s=duration_s, granularities=granularities
+    )
 
-    data = response.json()
 
-    words = []
-    if "words" in data:
-        words = [
-            {"word": w["word"], "start": w["start"], "end": w["end"]}
-            for w in data["words"]
-        ]
+async def _transcribe_chunked(
+    client: httpx.AsyncClient, audio: AudioSpool
+) -> TranscriptionResult | None:
+    """
+    Split long recordings at pauses and transcribe the pieces concurrently.
+    Returns None (caller sends the file in one request) when the audio is
+    short or cannot be decoded here, e.g. WebM without ffmpeg installed.
+    """
+    if not can_decode(await audio.read_head(12)):
+        return None
+    data = await audio.read_all()
+    pcm = await asyncio.to_thread(decode_pcm, data)
+    del data
+    if pcm is None or pcm.duration_s < CHUNK_MIN_S:
+        return None
 
-    return TranscriptionResult(text=data["text"], words=words)
+    split_points = await asyncio.to_thread(
+        find_split_points,
+        pcm,
+        target_chunk_s=CHUNK_TARGET_S,
+        search_window_s=CHUNK_SEARCH_WINDOW_S,
+    )
+    chunks = plan_chunks(pcm.duration_s, split_points, CHUNK_OVERLAP_S)
+    semaphore = asyncio.Semaphore(max(1, CHUNK_CONCURRENCY))
+
+    async def _one(chunk: AudioChunk) -> tuple[AudioChunk, dict]:
+        async with semaphore:
+            wav = await asyncio.to_thread(chunk_wav, pcm, chunk)
+            spool = AudioSpool(
+                filename=f"chunk-{chunk.index}.wav",
+                content_type="audio/wav",
+                memory_limit=len(wav),
+            )
+            try:
+                await spool.write(wav)
+                # Segments give punctuated text per span; words give timings.
+                data = await _post_transcription(
+                    client,
+                    spool,
+                    spool.filename,
+                    "audio/wav",
+                    granularities=("word", "segment"),
+                    duration_s=chunk.end_s - chunk.start_s,
+                )
+                return chunk, data
+            finally:
+                await spool.aclose()
+
+    results = await asyncio.gather(*(_one(chunk) for chunk in chunks))
+    logger.info(
+        "Transcribed %.0f s of audio in %d chunks (concurrency %d)",
+        pcm.duration_s,
+        len(chunks),
+        CHUNK_CONCURRENCY,
+    )
+
+    text_parts = []
+    for chunk, data in results:
+        segments = data.get("segments") or []
+        if segments:
+            text_parts.extend(
+                seg["text"].strip()
+                for seg in segments
+                if owns(chunk, seg["start"], seg["end"]) and seg["text"].strip()
+            )
+        elif data.get("text"):
+            text_parts.append(data["text"].strip())
+    words = stitch_words([(chunk, _parse_words(data)) for chunk, data in results])
+    return TranscriptionResult(text=" ".join(text_parts), words=words)
 
 
 def segment_qa_turns(
@@ -74,31 +319,22 @@ def segment_qa_turns(
 ) -> list[dict]:
     """
     Segment transcription into Q/A turns based on speaker.
-    Uses existing transcript segments from real-time session.
+    Uses existing transcript segments from real-time session; each turn gets
+    the Whisper words aligned to it (see `services.turn_alignment`), and turn
+    times are shifted onto the audio timeline by the estimated clock skew.
     """
-    turns = []
-    current_turn = None
-
-    for segment in transcript_segments:
-        speaker = segment.get("speaker", "user")
-        text = segment.get("text", "")
-        start_time = segment.get("startTime", 0) / 1000  # Convert ms to seconds
-        end_time = segment.get("endTime", 0) / 1000
-
-        if current_turn is None or current_turn["speaker"] != speaker:
-            if current_turn:
-                turns.append(current_turn)
-            current_turn = {
-                "speaker": speaker,
-                "text": text,
-                "start_time": start_time,
-                "end_time": end_time,
-            }
-        else:
-            current_turn["text"] += " " + text
-            current_turn["end_time"] = end_time
-
-    if current_turn:
-        turns.append(current_turn)
-
-    return turns
+    ordered = sorted(words, key=lambda w: w["start"])
+    starts = np.array([w["start"] for w in ordered], dtype=np.float64)
+    ends = np.array([w["end"] for w in ordered], dtype=np.float64)
+    alignment = align_words(starts, ends, transcript_segments)
+
+    return [
+        {
+            "speaker": turn.speaker,
+            "text": turn.text,
+            "start_time": turn.start_time + alignment.skew_s,
+            "end_time": turn.end_time + alignment.skew_s,
+            "words": ordered[lo:hi],
+        }
+        for turn, (lo, hi) in zip(alignment.turns, alignment.word_ranges.tolist())
+    ]
@@ -0,0 +1,274 @@
+import asyncio
+import logging
+import os
+import struct
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+
+import httpx
+
+from services.model_router import (
+    RETRYABLE_STATUS_CODES,
+    ModelRouter,
+    model_router,
+    parse_ladder,
+)
+
+logger = logging.getLogger("kawkai")
+
+# Preferred first. Only WORD_TIMESTAMP_MODELS return word timings
+# (`verbose_json`); the others are text-only fallbacks.
+TRANSCRIPTION_LADDER = parse_ladder(
+    os.getenv("OPENAI_TRANSCRIPTION_MODEL_LADDER"), ["whisper-1", "gpt-4o-mini-transcribe"]
+)
+WORD_TIMESTAMP_MODELS = {"whisper-1"}
+# Target end-to-end latency per request. Models whose observed speed
+# (ms per second of audio) would miss it for this clip are tried last.
+_latency_target = os.getenv("KAWKAI_TRANSCRIPTION_LATENCY_TARGET_MS")
+TRANSCRIPTION_LATENCY_TARGET_MS = float(_latency_target) if _latency_target else None
+# Clips up to this long are sent to the first two models at once; 0 disables.
+RACE_MAX_S = float(os.getenv("KAWKAI_TRANSCRIPTION_RACE_MAX_S", "0"))
+# Per-attempt timeout grows with the audio so a stalled upstream on a short
+# clip falls back quickly: base + per-second allowance, capped.
+TIMEOUT_BASE_S = 15.0
+TIMEOUT_PER_AUDIO_S = 1.0
+TIMEOUT_MAX_S = float(os.getenv("KAWKAI_TRANSCRIPTION_TIMEOUT_S", "120"))
+
+# Browser WebM/Opus is roughly 32 kbps; used when the duration can't be read.
+_COMPRESSED_BYTES_PER_S = 4000
+_EWMA_ALPHA = 0.2
+
+Send = Callable[[str, list[tuple[str, str]], float], Awaitable[httpx.Response]]
+
+
+class TranscriptionUnavailable(Exception):
+    """Every model in the ladder timed out or failed with a retryable status."""
+
+
+def estimate_duration_s(size: int, head: bytes) -> float:
+    """Audio duration from the WAV header, else from size at a typical Opus bitrate."""
+    if len(head) >= 32 and head[:4] == b"RIFF" and head[8:12] == b"WAVE":
+        (byte_rate,) = struct.unpack_from("<I", head, 28)
+        if byte_rate:
+            return max(0.0, (size - 44) / byte_rate)
+    return size / _COMPRESSED_BYTES_PER_S
+
+
+@dataclass
+class TranscriptionModelStats:
+    calls: int = 0
+    errors: int = 0
+    timeouts: int = 0
+    with_words: int = 0
+    without_words: int = 0
+    race_wins: int = 0
+    ms_per_audio_s: float | None = None  # EWMA of latency / audio duration
+
+
+class TranscriptionEngine:
+    """
+    Sends one transcription request through a model ladder: candidates come
+    from the shared model router (unhealthy models last), reordered so models
+    expected to miss the latency target for this clip's duration go after
+    those that fit. Timeouts, connection errors and retryable statuses move
+    on to the next model; short clips can race the first two models.
+    """
+
+    def __init__(
+        self,
+        route: str = "transcription",
+        *,
+        router: ModelRouter = model_router,
+        ladder: list[str] = TRANSCRIPTION_LADDER,
+        word_models: set[str] = WORD_TIMESTAMP_MODELS,
+        latency_target_ms: float | None = TRANSCRIPTION_LATENCY_TARGET_MS,
+        race_max_s: float = RACE_MAX_S,
+    ):
+        self.route = route
+        self.router = router
+        self.word_models = word_models
+        self.latency_target_ms = latency_target_ms
+        self.race_max_s = race_max_s
+        self.router.register(route, ladder)
+        self._stats: dict[str, TranscriptionModelStats] = {}
+
+    @property
+    def ladder(self) -> list[str]:
+        return self.router.ladder(self.route)
+
+    def request_fields(self, model: str, granularities: tuple[str, ...]) -> list[tuple[str, str]]:
+        if model not in self.word_models:
+            return [("model", model), ("response_format", "json")]
+        return [
+            ("model", model),
+            ("response_format", "verbose_json"),
+            *(("timestamp_granularities[]", g) for g in granularities),
+        ]
+
+    def predicted_latency_ms(self, model: str, duration_s: float) -> float | None:
+        stats = self._stats.get(model)
+        if stats is None or stats.ms_per_audio_s is None:
+            return None
+        return stats.ms_per_audio_s * duration_s
+
+    def candidates(self, duration_s: float) -> list[str]:
+        ordered = self.router.candidates(self.route)
+        if self.latency_target_ms is None:
+            return ordered
+        fits = [
+            m
+            for m in ordered
+            if (predicted := self.predicted_latency_ms(m, duration_s)) is None
+            or predicted <= self.latency_target_ms
+        ]
+        return fits + [m for m in ordered if m not in fits]
+
+    def should_race(self, duration_s: float) -> bool:
+        return 0 < duration_s <= self.race_max_s and len(self.ladder) > 1
+
+    @staticmethod
+    def timeout_s(duration_s: float) -> float:
+        return min(TIMEOUT_MAX_S, TIMEOUT_BASE_S + TIMEOUT_PER_AUDIO_S * duration_s)
+
+    async def transcribe(
+        self,
+        send: Send,
+        *,
+        duration_s: float,
+        granularities: tuple[str, ...] = ("word",),
+    ) -> dict:
+        """
+        Run the ladder; returns the upstream JSON with a `model` key added.
+        `send(model, fields, timeout_s)` must be safe to call concurrently
+        when `should_race(duration_s)` is true.
+        """
+        models = self.candidates(duration_s)
+        if not models:
+            raise ValueError(f"No models configured for route {self.route!r}")
+        if self.should_race(duration_s):
+            data = await self._race(send, models[:2], duration_s, granularities)
+            if data is not None:
+                return data
+            models = models[2:]
+
+        last_error: Exception | None = None
+        for model in models:
+            try:
+                return await self._attempt(send, model, duration_s, granularities)
+            except TranscriptionUnavailable as exc:
+                last_error = exc
+        raise last_error or TranscriptionUnavailable("All transcription models failed")
+
+    async def _attempt(
+        self, send: Send, model: str, duration_s: float, granularities: tuple[str, ...]
+    ) -> dict:
+        stats = self._stats.setdefault(model, TranscriptionModelStats())
+        stats.calls += 1
+        started = time.perf_counter()
+        try:
+            response = await send(
+                model, self.request_fields(model, granularities), self.timeout_s(duration_s)
+            )
+        except httpx.RequestError as exc:
+            latency_ms = (time.perf_counter() - started) * 1000
+            stats.errors += 1
+            if isinstance(exc, httpx.TimeoutException):
+                stats.timeouts += 1
+            self.router.record(self.route, model, latency_ms, ok=False)
+            logger.warning("Transcription with %s failed (%s); trying next model", model, exc)
+            raise TranscriptionUnavailable(f"{model}: {exc!r}") from exc
+
+        latency_ms = (time.perf_counter() - started) * 1000
+        ok = response.status_code == 200
+        self.router.record(self.route, model, latency_ms, ok=ok)
+        if not ok:
+            stats.errors += 1
+            if response.status_code in RETRYABLE_STATUS_CODES:
+                logger.warning(
+                    "Transcription with %s returned %d; trying next model",
+                    model,
+                    response.status_code,
+                )
+                raise TranscriptionUnavailable(f"{model}: HTTP {response.status_code}")
+            raise Exception(f"Transcription failed: {response.text}")
+
+        data = response.json()
+        data["model"] = model
+        if data.get("words"):
+            stats.with_words += 1
+        else:
+            stats.without_words += 1
+        if duration_s > 0:
+            rate = latency_ms / duration_s
+            stats.ms_per_audio_s = (
+                rate
+                if stats.ms_per_audio_s is None
+                else stats.ms_per_audio_s + _EWMA_ALPHA * (rate - stats.ms_per_audio_s)
+            )
+        return data
+
+    async def _race(
+        self,
+        send: Send,
+        models: list[str],
+        duration_s: float,
+        granularities: tuple[str, ...],
+    ) -> dict | None:
+        """
+        First successful result wins, except that a text-only result waits
+        for a still-running word-timestamp model. Returns None if both fail.
+        """
+        pending = {
+            asyncio.create_task(self._attempt(send, m, duration_s, granularities)): m
+            for m in models
+        }
+        text_only: dict | None = None
+        try:
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    pending.pop(task)
+                    try:
+                        data = task.result()
+                    except TranscriptionUnavailable:
+                        continue
+                    if data.get("words") or not any(
+                        m in self.word_models for m in pending.values()
+                    ):
+                        self._stats[data["model"]].race_wins += 1
+                        return data
+                    text_only = data
+        finally:
+            for task in pending:
+                task.cancel()
+        if text_only is not None:
+            self._stats[text_only["model"]].race_wins += 1
+        return text_only
+
+    def stats(self) -> dict:
+        return {
+            "ladder": self.ladder,
+            "latency_target_ms": self.latency_target_ms,
+            "race_max_s": self.race_max_s,
+            "models": {
+                model: {
+                    "calls": s.calls,
+                    "errors": s.errors,
+                    "timeouts": s.timeouts,
+                    "word_timings_rate": (
+                        round(s.with_words / (s.with_words + s.without_words), 3)
+                        if s.with_words + s.without_words
+                        else None
+                    ),
+                    "ms_per_audio_s": (
+                        round(s.ms_per_audio_s, 1) if s.ms_per_audio_s is not None else None
+                    ),
+                    "race_wins": s.race_wins,
+                }
+                for model, s in self._stats.items()
+            },
+        }
+
+
+transcription_engine = TranscriptionEngine()
@@ -0,0 +1,157 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+
+from services.audio_spool import AudioSpool
+
+logger = logging.getLogger("kawkai")
+
+
+@dataclass
+class TranscriptionJob:
+    session_id: str
+    audio: AudioSpool
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+class TranscriptionJobQueue:
+    """
+    Bounded queue of transcription jobs served by a fixed pool of worker
+    tasks. `submit` never waits: when the queue is full it returns False so
+    the caller can shed load. Status watchers (SSE streams) are woken through
+    `notify` whenever a job changes a session's status.
+
+    `stop` cancels running jobs and drops queued ones; each is handed to
+    `abandon` (if given) and its audio spool is closed. Jobs lost to a crash
+    rather than a shutdown are not recovered.
+    """
+
+    def __init__(
+        self,
+        run: Callable[[TranscriptionJob], Awaitable[None]],
+        *,
+        abandon: Callable[[TranscriptionJob], Awaitable[None]] | None = None,
+        workers: int = 2,
+        max_pending: int = 32,
+    ):
+        self._run = run
+        self._abandon = abandon
+        self.workers = max(1, workers)
+        self.max_pending = max(1, max_pending)
+        self._queue: asyncio.Queue[TranscriptionJob] | None = None
+        self._tasks: list[asyncio.Task] = []
+        self._watchers: dict[str, set[asyncio.Event]] = {}
+        self._running = 0
+        self._wait_ms: deque[float] = deque(maxlen=200)
+        self._run_ms: deque[float] = deque(maxlen=200)
+        self._abandoned: list[TranscriptionJob] = []
+        self._stats = {
+            "submitted": 0,
+            "rejected": 0,
+            "completed": 0,
+            "failed": 0,
+            "abandoned": 0,
+        }
+
+    def start(self) -> None:
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_pending)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+        if self._queue is not None:
+            while not self._queue.empty():
+                self._abandoned.append(self._queue.get_nowait())
+        self._queue = None
+        abandoned, self._abandoned = self._abandoned, []
+        for job in abandoned:
+            self._stats["abandoned"] += 1
+            try:
+                if self._abandon is not None:
+                    await self._abandon(job)
+            except Exception:
+                logger.exception(
+                    "Abandoning transcription job for session %s failed", job.session_id
+                )
+            finally:
+                if job.audio is not None:
+                    await job.audio.aclose()
+                self.notify(job.session_id)
+
+    def submit(self, job: TranscriptionJob) -> bool:
+        if self._queue is None:
+            raise RuntimeError("Transcription job queue is not running")
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self._stats["rejected"] += 1
+            return False
+        self._stats["submitted"] += 1
+        return True
+
+    def notify(self, session_id: str) -> None:
+        for event in self._watchers.get(session_id, ()):
+            event.set()
+
+    async def wait_for_change(self, session_id: str, timeout_s: float) -> None:
+        """Return after the next `notify` for this session, or after `timeout_s`."""
+        event = asyncio.Event()
+        self._watchers.setdefault(session_id, set()).add(event)
+        try:
+            await asyncio.wait_for(event.wait(), timeout=timeout_s)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            watchers = self._watchers.get(session_id)
+            if watchers is not None:
+                watchers.discard(event)
+                if not watchers:
+                    del self._watchers[session_id]
+
+    async def _worker(self) -> None:
+        assert self._queue is not None
+        while True:
+            job = await self._queue.get()
+            started = time.monotonic()
+            self._wait_ms.append((started - job.enqueued_at) * 1000)
+            self._running += 1
+            try:
+                await self._run(job)
+                self._stats["completed"] += 1
+            except asyncio.CancelledError:
+                self._abandoned.append(job)
+                raise
+            except Exception:
+                self._stats["failed"] += 1
+                logger.exception("Transcription job for session %s failed", job.session_id)
+            finally:
+                self._running -= 1
+                self._run_ms.append((time.monotonic() - started) * 1000)
+                self._queue.task_done()
+                self.notify(job.session_id)
+
+    def stats(self) -> dict:
+        def _avg(values: deque) -> float | None:
+            return round(sum(values) / len(values), 1) if values else None
+
+        return {
+            **self._stats,
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "pending": self._queue.qsize() if self._queue is not None else 0,
+            "running": self._running,
+            "avg_wait_ms": _avg(self._wait_ms),
+            "avg_run_ms": _avg(self._run_ms),
+        }
@@ -0,0 +1,152 @@
+import os
+from dataclasses import dataclass
+
+import numpy as np
+
+# Realtime transcript timestamps come from the browser's session clock; the
+# uploaded recording can start a little earlier or later. The offset between
+# the two is searched within ±MAX_CLOCK_SKEW_S.
+MAX_CLOCK_SKEW_S = float(os.getenv("KAWKAI_ALIGN_MAX_SKEW_S", "5.0"))
+# Coarse pass over the whole range, then a fine pass around its best offset.
+_COARSE_STEP_S = 0.25
+# The coarse pass scores an evenly spaced sample of at most this many words.
+_COARSE_SAMPLE = 1500
+SKEW_STEP_S = 0.05
+
+
+@dataclass
+class Turn:
+    speaker: str
+    text: str
+    start_time: float  # seconds, realtime transcript clock
+    end_time: float
+
+
+@dataclass
+class TurnAlignment:
+    """
+    Words (sorted by start) assigned to turns. `word_ranges[i]` is the
+    half-open `[lo, hi)` slice of the sorted word arrays belonging to turn i;
+    `skew_s` is added to transcript times to land on the audio timeline.
+    """
+
+    turns: list[Turn]
+    turn_of_word: np.ndarray
+    word_ranges: np.ndarray
+    skew_s: float
+
+    def turn_bounds(self) -> np.ndarray:
+        """(start, end) of each turn on the audio timeline."""
+        if not self.turns:
+            return np.zeros((0, 2))
+        return np.array([(t.start_time, t.end_time) for t in self.turns]) + self.skew_s
+
+
+def merge_turns(transcript_segments: list[dict]) -> list[Turn]:
+    """Realtime transcript segments merged into turns by consecutive speaker."""
+    turns: list[Turn] = []
+    for segment in sorted(transcript_segments, key=lambda s: s.get("startTime", 0)):
+        speaker = segment.get("speaker", "user")
+        text = segment.get("text", "")
+        start_time = segment.get("startTime", 0) / 1000  # ms → s
+        end_time = segment.get("endTime", 0) / 1000
+        if turns and turns[-1].speaker == speaker:
+            turns[-1].text += " " + text
+            turns[-1].end_time = max(turns[-1].end_time, end_time)
+        else:
+            turns.append(Turn(speaker, text, start_time, end_time))
+    return turns
+
+
+def _inside_count(mids: np.ndarray, starts: np.ndarray, ends: np.ndarray, shifts: np.ndarray):
+    """For each shift, how many word midpoints fall inside some shifted interval."""
+    shifted = mids[None, :] - shifts[:, None]
+    idx = np.searchsorted(starts, shifted, side="right") - 1
+    inside = (idx >= 0) & (shifted < ends[np.maximum(idx, 0)])
+    return inside.sum(axis=1)
+
+
+def _best_shift(mids, starts, ends, shifts: np.ndarray) -> float:
+    """
+    Words rarely fill their turns, so the best score usually holds over a
+    run of shifts; take the middle of the run nearest zero (zero itself if
+    it is in the run).
+    """
+    scores = _inside_count(mids, starts, ends, shifts)
+    best = scores == scores.max()
+    nearest = int(np.argmin(np.where(best, np.abs(shifts), np.inf)))
+    if shifts[nearest] == 0:
+        return 0.0
+    lo = hi = nearest
+    while lo > 0 and best[lo - 1]:
+        lo -= 1
+    while hi < len(shifts) - 1 and best[hi + 1]:
+        hi += 1
+    return float((shifts[lo] + shifts[hi]) / 2)
+
+
+def estimate_skew(
+    mids: np.ndarray,
+    turns: list[Turn],
+    *,
+    max_skew_s: float = MAX_CLOCK_SKEW_S,
+) -> float:
+    """
+    Offset (seconds, added to transcript times) that puts the most word
+    midpoints inside the spokesperson's turns (the recording is their mic).
+    Well-aligned sessions stay at 0.
+    """
+    scored = [t for t in turns if t.speaker == "user"] or turns
+    if not scored or len(mids) == 0 or max_skew_s <= 0:
+        return 0.0
+    starts = np.array([t.start_time for t in scored])
+    ends = np.array([t.end_time for t in scored])
+    coarse_steps = int(np.ceil(max_skew_s / _COARSE_STEP_S))
+    coarse = np.arange(-coarse_steps, coarse_steps + 1) * _COARSE_STEP_S
+    sample = mids[:: max(1, -(-len(mids) // _COARSE_SAMPLE))]
+    center = _best_shift(sample, starts, ends, np.clip(coarse, -max_skew_s, max_skew_s))
+    fine_steps = int(round(_COARSE_STEP_S / SKEW_STEP_S))
+    fine = center + np.arange(-fine_steps, fine_steps + 1) * SKEW_STEP_S
+    return round(_best_shift(mids, starts, ends, np.clip(fine, -max_skew_s, max_skew_s)), 3)
+
+
+def align_words(
+    starts: np.ndarray,
+    ends: np.ndarray,
+    transcript_segments: list[dict],
+    *,
+    max_skew_s: float = MAX_CLOCK_SKEW_S,
+) -> TurnAlignment:
+    """
+    Assign words (arrays sorted by start, in seconds) to transcript turns.
+    Turn starts form a sorted interval index; each word midpoint is placed
+    by binary search (O(n log m)). Words in the gap between two turns go
+    to the nearer one. Assignments are kept monotonic so every turn owns a
+    contiguous slice of the words.
+    """
+    turns = merge_turns(transcript_segments)
+    m = len(turns)
+    if m == 0:
+        return TurnAlignment([], np.full(len(starts), -1), np.zeros((0, 2), dtype=np.int64), 0.0)
+
+    mids = (starts + ends) / 2
+    skew = estimate_skew(mids, turns, max_skew_s=max_skew_s)
+    bounds = np.array([(t.start_time, t.end_time) for t in turns]) + skew
+    turn_starts, turn_ends = bounds[:, 0], bounds[:, 1]
+
+    prev = np.clip(np.searchsorted(turn_starts, mids, side="right") - 1, 0, m - 1)
+    nxt = np.minimum(prev + 1, m - 1)
+    in_gap = mids > turn_ends[prev]
+    closer_to_next = (nxt != prev) & (turn_starts[nxt] - mids < mids - turn_ends[prev])
+    turn_of_word = np.where(in_gap & closer_to_next, nxt, prev)
+    turn_of_word = np.maximum.accumulate(turn_of_word)
+
+    turn_ids = np.arange(m)
+    word_ranges = np.stack(
+        (
+            np.searchsorted(turn_of_word, turn_ids, side="left"),
+            np.searchsorted(turn_of_word, turn_ids, side="right"),
+        ),
+        axis=1,
+    )
+    return TurnAlignment(turns, turn_of_word, word_ranges, skew)
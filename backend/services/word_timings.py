@@ -0,0 +1,46 @@
+import struct
+import sys
+from array import array
+
+from models.word_timings import WordColumns
+
+# Compact binary layout for word timings:
+#   magic | uint32 count | int32[count] start ms | int32[count] end ms | utf-8 words joined by NUL
+# Times are kept at millisecond precision, which is what the transcription
+# API effectively reports.
+_MAGIC = b"WT1"
+_HEADER = struct.Struct("<3sI")
+_SEPARATOR = "\x00"
+_BIG_ENDIAN = sys.byteorder == "big"
+
+
+def encode_word_timings(columns: WordColumns) -> bytes:
+    """Pack word timings into a blob several times smaller than the JSON form."""
+    starts, ends = columns.start_ms, columns.end_ms
+    # array() is native-endian; the blob is always little-endian.
+    if _BIG_ENDIAN:
+        starts, ends = array("i", starts), array("i", ends)
+        starts.byteswap()
+        ends.byteswap()
+    text = _SEPARATOR.join(word.replace(_SEPARATOR, "") for word in columns.words)
+    return b"".join(
+        (_HEADER.pack(_MAGIC, len(columns)), starts.tobytes(), ends.tobytes(), text.encode())
+    )
+
+
+def decode_word_timings(blob: bytes) -> WordColumns:
+    magic, count = _HEADER.unpack_from(blob)
+    if magic != _MAGIC:
+        raise ValueError("Unrecognized word timings blob")
+    offset = _HEADER.size
+    starts = array("i")
+    starts.frombytes(blob[offset : offset + 4 * count])
+    offset += 4 * count
+    ends = array("i")
+    ends.frombytes(blob[offset : offset + 4 * count])
+    offset += 4 * count
+    if _BIG_ENDIAN:
+        starts.byteswap()
+        ends.byteswap()
+    words = list(map(sys.intern, blob[offset:].decode().split(_SEPARATOR))) if count else []
+    return WordColumns(words, starts, ends)